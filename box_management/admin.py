@@ -1,21 +1,15 @@
-import csv
-
 from django import forms
 from django.contrib import admin, messages
-from django.db.models import Count
-from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
-from django.http import HttpResponse
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
 from django.urls import path, reverse
 from django.utils import timezone
 from import_export.admin import ImportExportModelAdmin
 
-from users.models import CustomUser
-
 from .models import (
     Article,
     Box,
+    BoxDailyStats,
     BoxSession,
     Client,
     ColorProfile,
@@ -33,8 +27,16 @@ from .models import (
     Reaction,
     Song,
     Sticker,
+    StickerExportJob,
     StickerTemplate,
 )
+from .services.analytics.deposit_exports import (
+    build_csv_streaming_response,
+    iter_active_users_rows,
+    iter_deposits_distribution_rows,
+    iter_deposits_global_rows,
+    iter_popular_songs_rows,
+)
 
 
 class StickerTemplateClientInline(admin.TabularInline):
@@ -434,163 +436,41 @@ class DepositAdmin(ImportExportModelAdmin, admin.ModelAdmin):
     )
 
     def export_deposits_global(self, request, queryset):
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="deposits_global.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow(["Box", "Period", "Number of Deposits"])
-
-        deposits_month = (
-            Deposit.objects.values("box__name")
-            .annotate(period=TruncMonth("deposited_at"))
-            .values("box__name", "period")
-            .annotate(count=Count("id"))
-        )
-        for deposit in deposits_month:
-            writer.writerow(
-                [
-                    deposit["box__name"],
-                    deposit["period"].strftime("%Y-%m"),
-                    deposit["count"],
-                ]
-            )
-
-        deposits_week = (
-            Deposit.objects.values("box__name")
-            .annotate(period=TruncWeek("deposited_at"))
-            .values("box__name", "period")
-            .annotate(count=Count("id"))
-        )
-        for deposit in deposits_week:
-            writer.writerow(
-                [
-                    deposit["box__name"],
-                    deposit["period"].strftime("%Y-%W"),
-                    deposit["count"],
-                ]
-            )
-
-        deposits_day = (
-            Deposit.objects.values("box__name")
-            .annotate(period=TruncDay("deposited_at"))
-            .values("box__name", "period")
-            .annotate(count=Count("id"))
+        return build_csv_streaming_response(
+            "deposits_global.csv",
+            ["Box", "Period", "Number of Deposits"],
+            iter_deposits_global_rows(queryset),
         )
-        for deposit in deposits_day:
-            writer.writerow(
-                [
-                    deposit["box__name"],
-                    deposit["period"].strftime("%Y-%m-%d"),
-                    deposit["count"],
-                ]
-            )
-
-        return response
 
     export_deposits_global.short_description = "Export deposits as CSV"
 
     def export_deposits_distribution(self, request, queryset):
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = (
-            'attachment; filename="deposits_distribution_by_box.csv"'
-        )
-
-        writer = csv.writer(response)
-        writer.writerow(["Box", "Week", "Day", "Number of Deposits"])
-
-        deposits = (
-            Deposit.objects.values("box__name")
-            .annotate(
-                week=TruncWeek("deposited_at"),
-                day=TruncDay("deposited_at"),
-            )
-            .values("box__name", "week", "day")
-            .annotate(count=Count("id"))
+        return build_csv_streaming_response(
+            "deposits_distribution_by_box.csv",
+            ["Box", "Week", "Day", "Number of Deposits"],
+            iter_deposits_distribution_rows(queryset),
         )
 
-        for deposit in deposits:
-            writer.writerow(
-                [
-                    deposit["box__name"],
-                    deposit["week"].strftime("%Y-%W"),
-                    deposit["day"].strftime("%Y-%m-%d"),
-                    deposit["count"],
-                ]
-            )
-
-        return response
-
     export_deposits_distribution.short_description = (
         "Export deposits distribution as CSV"
     )
 
     def export_active_users_csv(self, request, queryset):
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="active_users.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow(["User", "Box", "Month", "Week", "Number of Deposits"])
-
-        active_users = (
-            CustomUser.objects.values("username", "deposits__box__name")
-            .annotate(
-                month=TruncMonth("deposits__deposited_at"),
-                week=TruncWeek("deposits__deposited_at"),
-            )
-            .values("username", "deposits__box__name", "month", "week")
-            .annotate(count=Count("deposits__id"))
-            .filter(count__gt=0)
+        return build_csv_streaming_response(
+            "active_users.csv",
+            ["User", "Box", "Month", "Week", "Number of Deposits"],
+            iter_active_users_rows(queryset),
         )
 
-        for user in active_users:
-            month = user["month"].strftime("%Y-%m") if user["month"] is not None else ""
-            week = user["week"].strftime("%Y-%W") if user["week"] is not None else ""
-            writer.writerow(
-                [
-                    user["username"],
-                    user["deposits__box__name"],
-                    month,
-                    week,
-                    user["count"],
-                ]
-            )
-
-        return response
-
     export_active_users_csv.short_description = "Export active users as CSV"
 
     def export_popular_songs_csv(self, request, queryset):
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="popular_songs.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow(["Song", "Box", "Month", "Week", "Day", "Number of Deposits"])
-
-        popular_songs = (
-            Song.objects.values("title", "deposits__box__name")
-            .annotate(
-                month=TruncMonth("deposits__deposited_at"),
-                week=TruncWeek("deposits__deposited_at"),
-                day=TruncDay("deposits__deposited_at"),
-            )
-            .values("title", "deposits__box__name", "month", "week", "day")
-            .annotate(count=Count("deposits__id"))
+        return build_csv_streaming_response(
+            "popular_songs.csv",
+            ["Song", "Box", "Month", "Week", "Day", "Number of Deposits"],
+            iter_popular_songs_rows(queryset),
         )
 
-        for song in popular_songs:
-            writer.writerow(
-                [
-                    song["title"],
-                    song["deposits__box__name"],
-                    song["month"].strftime("%Y-%m"),
-                    song["week"].strftime("%Y-%W"),
-                    song["day"].strftime("%Y-%m-%d"),
-                    song["count"],
-                ]
-            )
-
-        return response
-
     export_popular_songs_csv.short_description = "Export popular songs as CSV"
 
     actions = [
@@ -1167,9 +1047,9 @@ class StickerBatchCreateForm(forms.Form):
     quantity = forms.IntegerField(
         label="Nombre de stickers",
         min_value=1,
-        max_value=500,
+        max_value=5000,
         initial=50,
-        help_text="Maximum 500 stickers par lot.",
+        help_text="Maximum 5000 stickers par lot.",
     )
 
 
@@ -1277,11 +1157,7 @@ class StickerAdmin(admin.ModelAdmin):
             if form.is_valid():
                 client = form.cleaned_data["client"]
                 quantity = form.cleaned_data["quantity"]
-                created_count = 0
-
-                for _ in range(quantity):
-                    Sticker.objects.create(client=client)
-                    created_count += 1
+                created_count = len(Sticker.bulk_create_for_client(client, quantity))
 
                 messages.success(
                     request,
@@ -1317,4 +1193,42 @@ class StickerAdmin(admin.ModelAdmin):
         return f"/flowbox/{box_url}"
 
 
+@admin.register(StickerExportJob)
+class StickerExportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "client", "template", "status", "progress_done", "progress_total", "error_code", "created_at", "finished_at")
+    list_filter = ("status", "client")
+    search_fields = ("fingerprint", "client__name", "error_code")
+    readonly_fields = (
+        "client",
+        "requested_by",
+        "template",
+        "sticker_ids",
+        "options",
+        "base_url",
+        "fingerprint",
+        "progress_done",
+        "progress_total",
+        "artifact",
+        "artifact_name",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+    ordering = ("-created_at",)
+
+
+@admin.register(BoxDailyStats)
+class BoxDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ("day", "box", "deposit_count", "depositor_count")
+    list_filter = ("box",)
+    date_hierarchy = "day"
+    ordering = ("-day", "box")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 admin.site.site_header = "Administration de la Boîte à Son"
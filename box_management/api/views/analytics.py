@@ -0,0 +1,26 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from box_management.services.analytics.client_stats import get_client_stats_payload
+from box_management.services.boxes.client_access import get_active_client_user_or_response
+from la_boite_a_son.api_errors import api_error
+
+
+class ClientAdminStatsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user, error_response = get_active_client_user_or_response(request)
+        if error_response:
+            return error_response
+
+        payload, error = get_client_stats_payload(
+            client_id=user.client_id,
+            raw_from=(request.query_params.get("from") or "").strip() or None,
+            raw_to=(request.query_params.get("to") or "").strip() or None,
+        )
+        if error:
+            return api_error(error["status"], error["code"], error["detail"])
+        return Response(payload, status=status.HTTP_200_OK)
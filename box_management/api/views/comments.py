@@ -35,6 +35,7 @@ from box_management.services.comments.delete_comment import delete_comment_by_au
 from box_management.services.comments.moderate_comment import moderate_comment
 from box_management.services.comments.report_comment import report_comment
 from box_management.services.reactions.add_reaction import add_or_remove_reaction
+from box_management.services.reactions.list_reactions import list_deposit_reactions
 from la_boite_a_son.api_errors import api_error
 from users.utils import get_current_app_user, touch_last_seen
 
@@ -115,6 +116,33 @@ class ReactionView(APIView):
         return Response({"my_reaction": rx["mine"], "reactions": rx["detail"]}, status=status.HTTP_200_OK)
 
 
+class DepositReactionsView(APIView):
+    """
+    GET : liste paginée des réactions d'un dépôt (qui a réagi), chargée
+    uniquement quand l'utilisateur ouvre le détail. Réservée à l'auteur du
+    dépôt et à ceux qui ont révélé la chanson, comme les réponses.
+    """
+
+    permission_classes = []
+
+    def get(self, request, dep_public_key: str):
+        current_user = get_current_app_user(request)
+        if not current_user:
+            return api_error(status.HTTP_401_UNAUTHORIZED, "AUTH_REQUIRED", "Identité requise.")
+        touch_last_seen(current_user)
+
+        payload, error = list_deposit_reactions(
+            viewer=current_user,
+            dep_public_key=dep_public_key,
+            emoji=request.query_params.get("emoji"),
+            limit=request.query_params.get("limit"),
+            offset=request.query_params.get("offset"),
+        )
+        if error:
+            return api_error(error["status"], error["code"], error["detail"])
+        return Response(payload, status=status.HTTP_200_OK)
+
+
 class CommentCreateView(APIView):
     permission_classes = []
 
@@ -4,7 +4,6 @@ import re
 from urllib.parse import quote
 
 # ===== Django =====
-from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.db.models import Prefetch
 from django.http import Http404, HttpResponseGone
@@ -86,7 +85,7 @@ from la_boite_a_son.api_errors import api_error
 from la_boite_a_son.economy import COST_REVEAL_BOX, build_economy_payload
 
 # ===== Project =====
-from users.models import CustomUser
+from users.models import CustomUser, get_user_by_username
 from users.utils import (
     apply_points_delta,
     attach_guest_cookie,
@@ -96,8 +95,6 @@ from users.utils import (
     touch_last_seen,
 )
 
-User = get_user_model()
-
 
 def sticker_redirect_view(request, sticker_slug):
     sticker_slug = (sticker_slug or "").strip()
@@ -333,7 +330,11 @@ class EconomyConfigView(APIView):
 
 class BoxContentView(APIView):
     def get(self, request, format=None):
-        data, error = get_box_content(request, request.query_params.get("boxSlug"))
+        data, error = get_box_content(
+            request,
+            request.query_params.get("boxSlug"),
+            reactions_mode=request.query_params.get("reactions"),
+        )
         if error:
             return api_error(error["status"], error["code"], error["detail"])
         return Response(data, status=status.HTTP_200_OK)
@@ -352,6 +353,7 @@ class BoxOlderDepositsView(APIView):
                 context["session"],
                 cursor=request.query_params.get("cursor"),
                 limit=request.query_params.get("limit"),
+                reactions_mode=request.query_params.get("reactions"),
             )
         except InvalidOlderDepositsCursor:
             return api_error(status.HTTP_400_BAD_REQUEST, "INVALID_CURSOR", "Cursor invalide.")
@@ -682,7 +684,7 @@ class UserDepositsView(APIView):
                 return api_error(status.HTTP_401_UNAUTHORIZED, "AUTH_REQUIRED", "Utilisateur non connecté")
             touch_last_seen(target_user)
         else:
-            target_user = User.objects.filter(username__iexact=raw_username, is_guest=False).first()
+            target_user = get_user_by_username(raw_username)
             if not target_user:
                 return api_error(status.HTTP_404_NOT_FOUND, "USER_NOT_FOUND", "Utilisateur inexistant")
 
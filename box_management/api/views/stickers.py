@@ -1,11 +1,11 @@
-from django.db.models import Q
+from django.http import FileResponse
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from box_management.builders.sticker_payloads import serialize_client_admin_sticker
-from box_management.models import Sticker, StickerTemplate
+from box_management.builders.sticker_payloads import serialize_client_admin_sticker, serialize_sticker_export_job
+from box_management.models import StickerTemplate
 from box_management.services.boxes.client_access import get_active_client_user_or_response
 from box_management.services.stickers.assignments import (
     assign_sticker_to_box,
@@ -13,13 +13,21 @@ from box_management.services.stickers.assignments import (
     unassign_sticker_from_box,
 )
 from box_management.services.stickers.export import (
+    STICKER_EXPORT_ERROR_DETAILS,
     build_stickers_pdf_response,
     build_stickers_zip_response,
+    get_export_base_url,
     mark_stickers_downloaded,
     mark_stickers_generated,
     resolve_client_sticker_template,
     validate_export_options,
 )
+from box_management.services.stickers.export_jobs import (
+    STICKER_EXPORT_JOB_ERROR_DETAILS,
+    get_client_export_job,
+    get_or_create_sticker_export_job,
+)
+from box_management.services.stickers.listing import list_client_stickers
 from box_management.services.stickers.selection import resolve_client_sticker_selection
 from la_boite_a_son.api_errors import api_error
 
@@ -32,43 +40,17 @@ class ClientAdminStickerListView(APIView):
         if error_response:
             return error_response
 
-        search = (request.query_params.get("search") or "").strip()
-        status_filter = (request.query_params.get("status") or "all").strip()
-
-        stickers_qs = Sticker.objects.select_related("client", "box").filter(client_id=user.client_id)
-        if search:
-            stickers_qs = stickers_qs.filter(
-                Q(slug__icontains=search) | Q(box__name__icontains=search) | Q(box__url__icontains=search)
-            )
-
-        if status_filter and status_filter != "all":
-            if status_filter == "never_generated":
-                stickers_qs = stickers_qs.filter(qr_generated_at__isnull=True)
-            elif status_filter == "never_downloaded":
-                stickers_qs = stickers_qs.filter(downloaded_at__isnull=True)
-            elif status_filter == "assigned":
-                stickers_qs = stickers_qs.filter(box__isnull=False)
-            elif status_filter == "unassigned":
-                stickers_qs = stickers_qs.filter(box__isnull=True)
-            elif status_filter == "inactive":
-                stickers_qs = stickers_qs.filter(is_active=False)
-            else:
-                stickers_qs = stickers_qs.filter(status=status_filter)
-
-        stickers = list(stickers_qs.order_by("-created_at", "-id"))
-        payload = [serialize_client_admin_sticker(sticker) for sticker in stickers]
-
-        counts_base = Sticker.objects.filter(client_id=user.client_id)
-        counts = {
-            "all": counts_base.count(),
-            "never_generated": counts_base.filter(qr_generated_at__isnull=True).count(),
-            "never_downloaded": counts_base.filter(downloaded_at__isnull=True).count(),
-            "assigned": counts_base.filter(box__isnull=False).count(),
-            "unassigned": counts_base.filter(box__isnull=True).count(),
-            "inactive": counts_base.filter(is_active=False).count(),
-        }
-
-        return Response({"results": payload, "counts": counts}, status=status.HTTP_200_OK)
+        payload, error = list_client_stickers(
+            client_id=user.client_id,
+            search=(request.query_params.get("search") or "").strip(),
+            status_filter=(request.query_params.get("status") or "all").strip(),
+            limit=request.query_params.get("limit"),
+            cursor=(request.query_params.get("cursor") or "").strip() or None,
+            fields=(request.query_params.get("fields") or "").strip() or None,
+        )
+        if error:
+            return api_error(error["status"], error["code"], error["detail"])
+        return Response(payload, status=status.HTTP_200_OK)
 
 
 class ClientAdminStickerGenerateView(APIView):
@@ -140,6 +122,7 @@ class ClientAdminStickerDownloadView(APIView):
                     paper_size=options["paper_size"],
                     orientation=options["orientation"],
                     color_mode=options["color_mode"],
+                    pdf_engine=options["pdf_engine"],
                 )
             return build_stickers_zip_response(
                 request,
@@ -150,20 +133,7 @@ class ClientAdminStickerDownloadView(APIView):
             )
         except RuntimeError as exc:
             error_code = str(exc)
-            details_by_code = {
-                "qrcode_missing": "L’export de stickers nécessite la dépendance Python qrcode côté serveur.",
-                "cairosvg_missing": "L’export de stickers nécessite la dépendance Python cairosvg côté serveur pour générer les PNG et JPEG.",
-                "cairosvg_system_missing": "L’export de stickers nécessite les bibliothèques système Cairo sur le serveur pour générer les PNG et JPEG.",
-                "inkscape_missing": "L’export PDF nécessite Inkscape côté serveur.",
-                "inkscape_failed": "La génération PDF via Inkscape a échoué.",
-                "inkscape_blank_pdf": "Inkscape a généré un PDF vide pour le sticker.",
-                "sticker_cmyk_profile_missing": "L’export CMYK nécessite un profil ICC CMYK configuré côté serveur.",
-                "sticker_cmyk_profile_unreadable": "Le profil ICC CMYK configuré est introuvable ou illisible.",
-                "ghostscript_missing": "L’export CMYK nécessite Ghostscript côté serveur.",
-                "ghostscript_failed": "La conversion CMYK a échoué.",
-                "pypdf_missing": "L’export PDF de stickers nécessite la dépendance Python pypdf côté serveur.",
-            }
-            detail = details_by_code.get(error_code)
+            detail = STICKER_EXPORT_ERROR_DETAILS.get(error_code)
             if not detail:
                 raise
             return api_error(status.HTTP_503_SERVICE_UNAVAILABLE, str(error_code).upper(), detail)
@@ -248,3 +218,75 @@ class ClientAdminStickerUnassignView(APIView):
         if error:
             return api_error(error["status"], error["code"], error["detail"])
         return Response({"ok": True, "sticker": result["sticker"]}, status=status.HTTP_200_OK)
+
+
+class ClientAdminStickerExportJobCreateView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        user, error_response = get_active_client_user_or_response(request)
+        if error_response:
+            return error_response
+
+        stickers, error = resolve_client_sticker_selection(client_id=user.client_id, payload=request.data)
+        if error:
+            return api_error(error["status"], error["code"], error["detail"])
+
+        options, error = validate_export_options(request.data)
+        if error:
+            return api_error(error["status"], error["code"], error["detail"])
+
+        template, error = resolve_client_sticker_template(user.client_id, request.data.get("template_id"))
+        if error:
+            return api_error(error["status"], error["code"], error["detail"])
+
+        mark_stickers_generated(stickers)
+        job, created = get_or_create_sticker_export_job(
+            client_id=user.client_id,
+            user=user,
+            stickers=stickers,
+            template=template,
+            options=options,
+            base_url=get_export_base_url(request),
+        )
+        payload = serialize_sticker_export_job(job, error_details=STICKER_EXPORT_JOB_ERROR_DETAILS)
+        payload["reused"] = not created
+        response_status = status.HTTP_200_OK if job.status == job.STATUS_DONE else status.HTTP_202_ACCEPTED
+        return Response(payload, status=response_status)
+
+
+class ClientAdminStickerExportJobDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        user, error_response = get_active_client_user_or_response(request)
+        if error_response:
+            return error_response
+
+        job, error = get_client_export_job(client_id=user.client_id, job_id=job_id)
+        if error:
+            return api_error(error["status"], error["code"], error["detail"])
+        return Response(serialize_sticker_export_job(job, error_details=STICKER_EXPORT_JOB_ERROR_DETAILS), status=status.HTTP_200_OK)
+
+
+class ClientAdminStickerExportJobDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        user, error_response = get_active_client_user_or_response(request)
+        if error_response:
+            return error_response
+
+        job, error = get_client_export_job(client_id=user.client_id, job_id=job_id)
+        if error:
+            return api_error(error["status"], error["code"], error["detail"])
+        if job.status != job.STATUS_DONE or not job.has_artifact():
+            return api_error(status.HTTP_409_CONFLICT, "STICKER_EXPORT_NOT_READY", "L’export n’est pas encore disponible.")
+
+        content_type = "application/pdf" if job.file_type == "pdf" else "application/zip"
+        return FileResponse(
+            job.artifact.open("rb"),
+            as_attachment=True,
+            filename=job.artifact_name or None,
+            content_type=content_type,
+        )
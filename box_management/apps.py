@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class BoxManagementConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "box_management"
+
+    def ready(self):
+        from box_management.services.pinned.pricing import PINNED_PRICE_STEPS_CONFIG
+        from la_boite_a_son.moderation import MODERATION_RULES_CONFIG
+
+        PINNED_PRICE_STEPS_CONFIG.validate()
+        MODERATION_RULES_CONFIG.validate()
@@ -1,13 +1,28 @@
 # ruff: noqa: UP017
+import copy
+import threading
+from collections import OrderedDict
 from collections.abc import Iterable, Sequence
 from datetime import timezone as dt_timezone
 from typing import Any
 
 from django.conf import settings
+from django.db.models import Prefetch, prefetch_related_objects
 
 from box_management.builders.comment_payloads import build_comments_context_for_deposits
-from box_management.models import Deposit, DiscoveredSong
+from box_management.domain.constants import (
+    REACTION_SUMMARY_REACTORS_LIMIT,
+    REACTIONS_MODE_FULL,
+    REACTIONS_MODE_SUMMARY,
+    REACTIONS_MODES,
+)
+from box_management.models import Deposit, DiscoveredSong, Reaction
 from box_management.provider_services import get_song_provider_links_map
+from box_management.selectors.reactions import (
+    get_first_reactions_by_deposit,
+    get_reaction_counts_by_deposit,
+    get_viewer_reactions_by_deposit,
+)
 from users.models import CustomUser
 
 
@@ -60,6 +75,19 @@ def build_song_payload_from_instance(song, hidden: bool) -> dict[str, Any]:
     }
 
 
+def _prefetch_reactions(deps: Sequence[Deposit]) -> None:
+    missing = [dep for dep in deps if getattr(dep, "prefetched_reactions", None) is None]
+    if missing:
+        prefetch_related_objects(
+            missing,
+            Prefetch(
+                "reactions",
+                queryset=Reaction.objects.select_related("emoji", "user").order_by("created_at", "id"),
+                to_attr="prefetched_reactions",
+            ),
+        )
+
+
 def _iter_reactions_from_instance(dep: Deposit):
     reacs = getattr(dep, "prefetched_reactions", None)
     if reacs is not None:
@@ -67,39 +95,88 @@ def _iter_reactions_from_instance(dep: Deposit):
     return dep.reactions.select_related("emoji", "user").order_by("created_at", "id").all()
 
 
+def build_reaction_item_from_instance(reaction) -> dict[str, Any]:
+    return {
+        "user": build_user_payload_from_instance(getattr(reaction, "user", None)),
+        "emoji": reaction.emoji.char,
+    }
+
+
+def build_reactions_detail_from_instance(dep: Deposit) -> list[dict[str, Any]]:
+    return [
+        build_reaction_item_from_instance(r)
+        for r in _iter_reactions_from_instance(dep)
+        if getattr(r.emoji, "active", True)
+    ]
+
+
+def _find_viewer_reaction(reactions_detail: list[dict[str, Any]], viewer_id: int | None) -> dict[str, Any] | None:
+    if viewer_id is None:
+        return None
+    mine = None
+    for item in reactions_detail:
+        if (item.get("user") or {}).get("id") == viewer_id:
+            mine = {"emoji": item["emoji"]}
+    return mine
+
+
 def build_reactions_payload_from_instance(dep: Deposit, current_user: CustomUser | None = None) -> dict[str, Any]:
     current_user_id = getattr(current_user, "id", None) if current_user else None
+    detail = build_reactions_detail_from_instance(dep)
+    return {"detail": detail, "mine": _find_viewer_reaction(detail, current_user_id)}
 
-    detail: list[dict[str, Any]] = []
-    mine: dict[str, Any] | None = None
 
-    for r in _iter_reactions_from_instance(dep):
-        if not getattr(r.emoji, "active", True):
-            continue
-        payload = {
-            "user": build_user_payload_from_instance(getattr(r, "user", None)),
-            "emoji": r.emoji.char,
-        }
-        if current_user_id is not None and r.user_id == current_user_id:
-            mine = {"emoji": r.emoji.char}
-        detail.append(payload)
+def normalize_reactions_mode(value: Any) -> str:
+    mode = str(value or "").strip().lower()
+    return mode if mode in REACTIONS_MODES else REACTIONS_MODE_FULL
 
-    return {"detail": detail, "mine": mine}
 
+def build_reaction_summaries_for_deposits(
+    deposit_ids: Iterable[int],
+    *,
+    viewer: CustomUser | None = None,
+    reactors_limit: int = REACTION_SUMMARY_REACTORS_LIMIT,
+) -> dict[int, dict[str, Any]]:
+    """
+    Résumé compact des réactions par dépôt (compte par emoji, premiers réacteurs,
+    réaction du viewer) en trois requêtes, quel que soit le nombre de réactions.
+    """
+    dep_ids = [dep_id for dep_id in deposit_ids if dep_id]
+    if not dep_ids:
+        return {}
+
+    counts_by_deposit = get_reaction_counts_by_deposit(dep_ids)
+    first_by_deposit = get_first_reactions_by_deposit(dep_ids, reactors_limit)
+    mine_by_deposit = get_viewer_reactions_by_deposit(getattr(viewer, "id", None) if viewer else None, dep_ids)
+
+    summaries = {}
+    for dep_id in dep_ids:
+        counts = counts_by_deposit.get(dep_id, [])
+        mine = mine_by_deposit.get(dep_id)
+        summaries[dep_id] = {
+            "total": sum(item["count"] for item in counts),
+            "counts": counts,
+            "reactors": [build_reaction_item_from_instance(r) for r in first_by_deposit.get(dep_id, [])],
+            "mine": {"emoji": mine} if mine else None,
+        }
+    return summaries
 
-def build_deposit_payload_from_instance(
+
+def build_deposit_base_payload(
     dep: Deposit,
     *,
     include_user: bool,
     include_deposit_time: bool,
-    hidden: bool,
-    current_user: CustomUser | None = None,
-    comments_context: dict[str, Any] | None = None,
+    include_reactions: bool = True,
 ) -> dict[str, Any]:
+    """
+    Partie du payload indépendante du viewer : chanson complète, couleur, épingle,
+    auteur et liste des réactions. Peut être mise en cache par (deposit id, version).
+    """
     payload: dict[str, Any] = {
         "public_key": dep.public_key,
         "deposit_type": getattr(dep, "deposit_type", Deposit.DEPOSIT_TYPE_BOX),
-        "song": build_song_payload_from_instance(dep.song, hidden),
+        "song": build_song_payload_from_instance(dep.song, hidden=False),
         "accent_color": (getattr(dep.song, "accent_color", "") or "") or None,
         "pin_expires_at": dep.pin_expires_at.isoformat() if getattr(dep, "pin_expires_at", None) else None,
         "pin_duration_minutes": int(getattr(dep, "pin_duration_minutes", 0) or 0),
@@ -112,32 +189,166 @@ def build_deposit_payload_from_instance(
     if include_user:
         payload["user"] = build_user_payload_from_instance(dep.user)
 
-    rx = build_reactions_payload_from_instance(dep, current_user=current_user)
-    payload["reactions"] = rx["detail"]
-    payload["my_reaction"] = rx["mine"]
-    payload["comments"] = comments_context or {"items": [], "count": 0, "viewer_state": {}}
-
+    if include_reactions:
+        payload["reactions"] = build_reactions_detail_from_instance(dep)
     return payload
 
 
-def build_deposits_payload(
-    deposits: Deposit | Iterable[Deposit] | Sequence[Deposit],
+def personalize_deposit_payload(
+    base: dict[str, Any],
     *,
-    viewer: CustomUser | None = None,
-    include_user: bool = True,
-    include_deposit_time: bool = True,
-    force_song_infos_for: Iterable[int] | None = None,
-) -> list[dict[str, Any]]:
-    if isinstance(deposits, Deposit):
-        deps: list[Deposit] = [deposits]
+    hidden: bool,
+    my_reaction: dict[str, Any] | None,
+    comments_context: dict[str, Any] | None = None,
+    reactions_summary: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Applique la partie dépendante du viewer sur une copie profonde du payload de base :
+    le payload de base est partagé entre viewers (mémo), l'appelant peut modifier le sien.
+    """
+    payload = copy.deepcopy(base)
+    if hidden:
+        song = payload["song"]
+        payload["song"] = {"image_url": song.get("image_url"), "image_url_small": song.get("image_url_small")}
+    if reactions_summary is not None:
+        payload["reactions"] = list(reactions_summary["reactors"])
+        payload["reactions_summary"] = {"total": reactions_summary["total"], "counts": reactions_summary["counts"]}
     else:
-        deps = list(deposits or [])
+        payload["reactions"] = payload.get("reactions") or []
+    payload["my_reaction"] = dict(my_reaction) if my_reaction else None
+    payload["comments"] = comments_context or {"items": [], "count": 0, "viewer_state": {}}
+    return payload
 
-    if not deps:
-        return []
 
-    force_ids = set(force_song_infos_for or [])
+def get_deposit_base_version(dep: Deposit, *, include_reactions: bool = True) -> tuple:
+    """
+    Empreinte des données chargées sur l'instance qui alimentent le payload de base,
+    calculée sans charger les réactions : elles sont représentées par
+    Deposit.reactions_changed_at, mis à jour à chaque réaction ajoutée, modifiée ou
+    supprimée. Un lien provider résolu ou un auteur renommé change aussi la version.
+    Le profil des auteurs de réactions n'en fait pas partie : il est rafraîchi à la
+    prochaine réaction sur le dépôt.
+    """
+    song = dep.song
+    user = getattr(dep, "user", None)
+    provider_links = getattr(song, "prefetched_provider_links", None)
+    return (
+        dep.public_key,
+        getattr(dep, "deposit_type", None),
+        dep.deposited_at,
+        getattr(dep, "pin_expires_at", None),
+        song.pk,
+        song.image_url,
+        song.image_url_small,
+        song.accent_color,
+        song.title,
+        tuple(song.artists_json or []),
+        (
+            tuple((link.provider_code, link.status, link.provider_url) for link in provider_links)
+            if provider_links is not None
+            else None
+        ),
+        _user_version(user),
+        getattr(dep, "reactions_changed_at", None) if include_reactions else None,
+    )
+
+
+def _user_version(user: CustomUser | None) -> tuple | None:
+    if not user:
+        return None
+    pic = getattr(user, "profile_picture", None)
+    return (user.pk, user.username, bool(getattr(user, "is_guest", False)), pic.name if pic else "")
+
+
+class DepositBasePayloadMemo:
+    """
+    Mémo LRU process-local des payloads de base : une entrée par (deposit id, include_user,
+    include_deposit_time, include_reactions), valable tant que get_deposit_base_version
+    ne change pas. Les réactions ne sont chargées que pour les dépôts absents ou périmés.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[tuple, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build_many(
+        self,
+        deps: Sequence[Deposit],
+        *,
+        include_user: bool,
+        include_deposit_time: bool,
+        include_reactions: bool = True,
+    ) -> dict[int, dict[str, Any]]:
+        options = (include_user, include_deposit_time, include_reactions)
+        versions = [(dep, get_deposit_base_version(dep, include_reactions=include_reactions)) for dep in deps]
+        bases: dict[int, dict[str, Any]] = {}
+        stale = []
+        with self._lock:
+            for dep, version in versions:
+                entry = self._entries.get((dep.pk, *options))
+                if entry is not None and entry[0] == version:
+                    self._entries.move_to_end((dep.pk, *options))
+                    self.hits += 1
+                    bases[dep.pk] = entry[1]
+                else:
+                    self.misses += 1
+                    stale.append((dep, version))
+        if not stale:
+            return bases
+
+        if include_reactions:
+            _prefetch_reactions([dep for dep, _version in stale])
+        built = []
+        for dep, version in stale:
+            base = build_deposit_base_payload(
+                dep,
+                include_user=include_user,
+                include_deposit_time=include_deposit_time,
+                include_reactions=include_reactions,
+            )
+            bases[dep.pk] = base
+            built.append(((dep.pk, *options), version, base))
+        with self._lock:
+            for key, version, base in built:
+                self._entries[key] = (version, base)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return bases
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
 
+
+DEPOSIT_BASE_PAYLOAD_MEMO = DepositBasePayloadMemo()
+
+
+def build_deposit_payload_from_instance(
+    dep: Deposit,
+    *,
+    include_user: bool,
+    include_deposit_time: bool,
+    hidden: bool,
+    current_user: CustomUser | None = None,
+    comments_context: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    base = build_deposit_base_payload(dep, include_user=include_user, include_deposit_time=include_deposit_time)
+    current_user_id = getattr(current_user, "id", None) if current_user else None
+    return personalize_deposit_payload(
+        base,
+        hidden=hidden,
+        my_reaction=_find_viewer_reaction(base["reactions"], current_user_id),
+        comments_context=comments_context,
+    )
+
+
+def get_revealed_deposit_ids(deps: Sequence[Deposit], viewer: CustomUser | None) -> set[int]:
     public_visible_ids = {
         d.pk
         for d in deps
@@ -149,24 +360,89 @@ def build_deposits_payload(
     }
 
     if viewer is None:
-        revealed_ids = public_visible_ids
-    else:
-        viewer_id = getattr(viewer, "id", None)
-        dep_ids = [d.pk for d in deps]
+        return public_visible_ids
+
+    viewer_id = getattr(viewer, "id", None)
+    dep_ids = [d.pk for d in deps]
 
-        own_dep_ids = {d.pk for d in deps if getattr(d, "user_id", None) == viewer_id} | public_visible_ids
+    own_dep_ids = {d.pk for d in deps if getattr(d, "user_id", None) == viewer_id} | public_visible_ids
 
-        remaining_ids = [i for i in dep_ids if i not in own_dep_ids]
+    remaining_ids = [i for i in dep_ids if i not in own_dep_ids]
 
-        discovered_ids = set()
-        if remaining_ids:
-            discovered_ids = set(
-                DiscoveredSong.objects.filter(user_id=viewer_id, deposit_id__in=remaining_ids).values_list(
-                    "deposit_id", flat=True
-                )
+    discovered_ids = set()
+    if remaining_ids:
+        discovered_ids = set(
+            DiscoveredSong.objects.filter(user_id=viewer_id, deposit_id__in=remaining_ids).values_list(
+                "deposit_id", flat=True
             )
+        )
+
+    return own_dep_ids | discovered_ids
+
+
+def build_viewer_reaction_map(
+    bases_by_deposit_id: dict[int, dict[str, Any]], viewer: CustomUser | None
+) -> dict[int, dict[str, Any]]:
+    viewer_id = getattr(viewer, "id", None) if viewer else None
+    if viewer_id is None:
+        return {}
+    reaction_map = {}
+    for dep_id, base in bases_by_deposit_id.items():
+        mine = _find_viewer_reaction(base.get("reactions") or [], viewer_id)
+        if mine:
+            reaction_map[dep_id] = mine
+    return reaction_map
+
 
-        revealed_ids = own_dep_ids | discovered_ids
+def _prefetch_song_provider_links(deps: Sequence[Deposit]) -> None:
+    songs = [dep.song for dep in deps if getattr(dep.song, "prefetched_provider_links", None) is None]
+    if songs:
+        prefetch_related_objects(songs, Prefetch("provider_links", to_attr="prefetched_provider_links"))
+
+
+def build_deposits_payload(
+    deposits: Deposit | Iterable[Deposit] | Sequence[Deposit],
+    *,
+    viewer: CustomUser | None = None,
+    include_user: bool = True,
+    include_deposit_time: bool = True,
+    force_song_infos_for: Iterable[int] | None = None,
+    base_memo: DepositBasePayloadMemo | None = DEPOSIT_BASE_PAYLOAD_MEMO,
+    reactions_mode: str = REACTIONS_MODE_FULL,
+) -> list[dict[str, Any]]:
+    if isinstance(deposits, Deposit):
+        deps: list[Deposit] = [deposits]
+    else:
+        deps = list(deposits or [])
+
+    if not deps:
+        return []
+
+    force_ids = set(force_song_infos_for or [])
+    revealed_ids = get_revealed_deposit_ids(deps, viewer)
+    summary_mode = normalize_reactions_mode(reactions_mode) == REACTIONS_MODE_SUMMARY
+
+    _prefetch_song_provider_links(deps)
+    bases_by_deposit_id: dict[int, dict[str, Any]] = {}
+    base_options = {
+        "include_user": include_user,
+        "include_deposit_time": include_deposit_time,
+        "include_reactions": not summary_mode,
+    }
+    if base_memo is not None:
+        bases_by_deposit_id = base_memo.get_or_build_many(deps, **base_options)
+    else:
+        if base_options["include_reactions"]:
+            _prefetch_reactions(deps)
+        for dep in deps:
+            bases_by_deposit_id[dep.pk] = build_deposit_base_payload(dep, **base_options)
+
+    if summary_mode:
+        summaries = build_reaction_summaries_for_deposits([dep.pk for dep in deps], viewer=viewer)
+        reaction_map = {dep_id: summary["mine"] for dep_id, summary in summaries.items() if summary["mine"]}
+    else:
+        summaries = {}
+        reaction_map = build_viewer_reaction_map(bases_by_deposit_id, viewer)
 
     comments_by_deposit = build_comments_context_for_deposits(deps, viewer=viewer, include_items=False)
 
@@ -174,13 +450,12 @@ def build_deposits_payload(
     for dep in deps:
         hidden = (dep.pk not in revealed_ids) and (dep.pk not in force_ids)
 
-        payload = build_deposit_payload_from_instance(
-            dep,
-            include_user=include_user,
-            include_deposit_time=include_deposit_time,
+        payload = personalize_deposit_payload(
+            bases_by_deposit_id[dep.pk],
             hidden=hidden,
-            current_user=viewer,
+            my_reaction=reaction_map.get(dep.pk),
             comments_context=comments_by_deposit.get(dep.pk) or {"items": [], "viewer_state": {}},
+            reactions_summary=summaries.get(dep.pk),
         )
         out.append(payload)
 
@@ -188,10 +463,21 @@ def build_deposits_payload(
 
 
 __all__ = [
+    "DEPOSIT_BASE_PAYLOAD_MEMO",
+    "DepositBasePayloadMemo",
     "build_comments_context_for_deposits",
+    "build_deposit_base_payload",
     "build_deposit_payload_from_instance",
     "build_deposits_payload",
+    "build_reaction_item_from_instance",
+    "build_reaction_summaries_for_deposits",
+    "build_reactions_detail_from_instance",
     "build_reactions_payload_from_instance",
     "build_song_payload_from_instance",
     "build_user_payload_from_instance",
+    "build_viewer_reaction_map",
+    "get_deposit_base_version",
+    "get_revealed_deposit_ids",
+    "normalize_reactions_mode",
+    "personalize_deposit_payload",
 ]
@@ -1,3 +1,6 @@
+from django.urls import reverse
+
+
 def serialize_client_admin_sticker(sticker):
     box = getattr(sticker, "box", None)
     return {
@@ -33,6 +36,25 @@ def serialize_client_admin_sticker(sticker):
     }
 
 
+def serialize_client_admin_sticker_row(row, status_labels):
+    """Projection légère du tableau admin, construite depuis un dict .values() sans instancier de modèle."""
+    box_id = row["box_id"]
+    return {
+        "id": row["id"],
+        "slug": row["slug"],
+        "status": row["status"],
+        "status_label": status_labels.get(row["status"], row["status"]),
+        "is_active": bool(row["is_active"]),
+        "box": {"id": box_id, "name": row["box__name"], "slug": row["box__url"]} if box_id else None,
+        "qr_generated_at": row["qr_generated_at"].isoformat() if row["qr_generated_at"] else None,
+        "downloaded_at": row["downloaded_at"].isoformat() if row["downloaded_at"] else None,
+        "assigned_at": row["assigned_at"].isoformat() if row["assigned_at"] else None,
+        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+        "sticker_url": f"/s/{row['slug']}",
+        "is_assigned": bool(box_id),
+    }
+
+
 def serialize_client_box_assignment(box, assigned_sticker_count=0):
     return {
         "id": box.id,
@@ -41,3 +63,27 @@ def serialize_client_box_assignment(box, assigned_sticker_count=0):
         "assigned_sticker_count": int(assigned_sticker_count or 0),
         "has_assigned_sticker": bool(assigned_sticker_count),
     }
+
+
+def serialize_sticker_export_job(job, *, error_details=None):
+    is_ready = job.status == job.STATUS_DONE
+    error_code = job.error_code or None
+    return {
+        "id": job.id,
+        "status": job.status,
+        "status_label": job.get_status_display(),
+        "options": dict(job.options or {}),
+        "template_id": job.template_id,
+        "sticker_count": len(job.sticker_ids or []),
+        "progress": {
+            "done": int(job.progress_done or 0),
+            "total": int(job.progress_total or 0),
+        },
+        "error_code": error_code.upper() if error_code else None,
+        "error_detail": (error_details or {}).get(error_code) if error_code else None,
+        "is_ready": is_ready,
+        "download_url": reverse("client-admin-sticker-export-jobs-download", args=[job.id]) if is_ready else None,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
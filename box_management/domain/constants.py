@@ -22,3 +22,34 @@ COMMENT_REPORT_REASON_CHOICES = {
     COMMENT_REASON_HARASSMENT,
     COMMENT_REASON_DOXXING,
 }
+
+REACTIONS_MODE_FULL = "full"
+REACTIONS_MODE_SUMMARY = "summary"
+REACTIONS_MODES = {REACTIONS_MODE_FULL, REACTIONS_MODE_SUMMARY}
+REACTION_SUMMARY_REACTORS_LIMIT = 3
+REACTIONS_PAGE_SIZE = 20
+REACTIONS_MAX_PAGE_SIZE = 50
+
+STICKERS_PAGE_SIZE = 100
+STICKERS_MAX_PAGE_SIZE = 500
+STICKERS_FIELDS_FULL = "full"
+STICKERS_FIELDS_LIGHT = "light"
+STICKER_EXPORT_JOB_STALE_SECONDS = 600
+STICKER_EXPORT_PRUNE_INTERVAL_SECONDS = 3600
+
+DEPOSIT_ROLLUP_WATERMARK = "deposit_daily_rollups"
+CLIENT_STATS_DEFAULT_DAYS = 30
+CLIENT_STATS_MAX_DAYS = 366
+CLIENT_STATS_CACHE_TTL_SECONDS = 300
+
+BOX_PREVIEW_CACHE_NAMESPACE = "box-preview"
+BOX_PREVIEW_CACHE_TTL_SECONDS = 60
+CURRENT_INCITATION_CACHE_NAMESPACE = "current-incitation"
+
+VISIBLE_ARTICLES_CACHE_NAMESPACE = "visible-articles"
+VISIBLE_ARTICLES_CACHE_MAX_TTL_SECONDS = 3600
+
+COMMENT_DAILY_TARGET_CACHE_NAMESPACE = "comment-daily-target"
+COMMENT_LAST_AT_CACHE_NAMESPACE = "comment-last-at"
+COMMENT_RESTRICTION_CACHE_NAMESPACE = "comment-restriction"
+COMMENT_ANTI_ABUSE_CACHE_MAX_TTL_SECONDS = 3600
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from box_management.services.analytics.rollups import run_incremental_deposit_rollup
+
+
+class Command(BaseCommand):
+    help = "Met à jour les statistiques quotidiennes de dépôts (box, chanson, utilisateur) après le dernier watermark."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--include-today", action="store_true", help="Recalcule aussi la journée en cours.")
+        parser.add_argument("--rebuild", action="store_true", help="Recalcule tout depuis le premier dépôt.")
+
+    def handle(self, *args, **options):
+        summary = run_incremental_deposit_rollup(include_today=options["include_today"], rebuild=options["rebuild"])
+        if summary["start_day"]:
+            self.stdout.write(self.style.SUCCESS(f"[OK] Jours {summary['start_day']} → {summary['end_day']} agrégés"))
+        else:
+            self.stdout.write("[INFO] Aucun jour complet à agréger.")
+        self.stdout.write(f"Lignes écrites — box : {summary['boxes']}, chansons : {summary['songs']}, utilisateurs : {summary['users']}")
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from box_management.domain.constants import STICKER_EXPORT_PRUNE_INTERVAL_SECONDS
+from box_management.services.stickers.export_jobs import prune_expired_export_jobs, run_next_sticker_export_job
+
+
+class Command(BaseCommand):
+    help = "Worker local des exports de stickers : traite les jobs en attente et écrit les artefacts dans MEDIA_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Traite les jobs en attente puis s'arrête.")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Délai (secondes) entre deux vérifications de la file.")
+
+    def handle(self, *args, **options):
+        once = options["once"]
+        poll_interval = max(0.1, float(options["poll_interval"]))
+        processed = 0
+        last_pruned = None
+        while True:
+            if last_pruned is None or time.monotonic() - last_pruned >= STICKER_EXPORT_PRUNE_INTERVAL_SECONDS:
+                pruned = prune_expired_export_jobs()
+                last_pruned = time.monotonic()
+                if pruned:
+                    self.stdout.write(f"{pruned} export(s) expiré(s) supprimé(s).")
+            job = run_next_sticker_export_job()
+            if job is None:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+            processed += 1
+            if job.status == job.STATUS_DONE:
+                self.stdout.write(self.style.SUCCESS(f"[OK] export #{job.pk} — {job.progress_done} stickers"))
+            else:
+                self.stdout.write(self.style.ERROR(f"[ERROR] export #{job.pk} — {job.error_code}"))
+        self.stdout.write(f"{processed} export(s) traité(s).")
@@ -0,0 +1,43 @@
+# Generated by Django 6.0.6 on 2026-10-19 01:02
+
+import box_management.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("box_management", "0032_add_box_require_loc"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StickerExportJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("sticker_ids", models.JSONField(default=list)),
+                ("options", models.JSONField(default=dict)),
+                ("base_url", models.CharField(max_length=255)),
+                ("fingerprint", models.CharField(db_index=True, max_length=64)),
+                ("status", models.CharField(choices=[("pending", "En attente"), ("running", "En cours"), ("done", "Terminé"), ("failed", "Échec")], db_index=True, default="pending", max_length=16)),
+                ("progress_done", models.PositiveIntegerField(default=0)),
+                ("progress_total", models.PositiveIntegerField(default=0)),
+                ("error_code", models.CharField(blank=True, default="", max_length=64)),
+                ("artifact", models.FileField(blank=True, upload_to=box_management.models.sticker_export_upload_to)),
+                ("artifact_name", models.CharField(blank=True, default="", max_length=120)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("client", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="sticker_export_jobs", to="box_management.client")),
+                ("requested_by", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="sticker_export_jobs", to=settings.AUTH_USER_MODEL)),
+                ("template", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="export_jobs", to="box_management.stickertemplate")),
+            ],
+            options={
+                "ordering": ["-created_at", "-id"],
+                "indexes": [models.Index(fields=["fingerprint", "status"], name="box_managem_fingerp_4765df_idx"), models.Index(fields=["status", "created_at"], name="box_managem_status_2ca6b0_idx"), models.Index(fields=["client", "created_at"], name="box_managem_client__910c0d_idx")],
+            },
+        ),
+    ]
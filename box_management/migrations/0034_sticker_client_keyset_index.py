@@ -0,0 +1,17 @@
+# Generated by Django 6.0.6 on 2026-10-19 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("box_management", "0033_stickerexportjob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="sticker",
+            index=models.Index(fields=["client", "created_at", "id"], name="box_managem_client__290c67_idx"),
+        ),
+    ]
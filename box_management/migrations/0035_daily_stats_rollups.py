@@ -0,0 +1,69 @@
+# Generated by Django 6.0.6 on 2026-10-19 02:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("box_management", "0034_sticker_client_keyset_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnalyticsWatermark",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=64, unique=True)),
+                ("last_day", models.DateField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="BoxDailyStats",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField(db_index=True)),
+                ("deposit_count", models.PositiveIntegerField(default=0)),
+                ("depositor_count", models.PositiveIntegerField(default=0)),
+                ("box", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="daily_stats", to="box_management.box")),
+            ],
+            options={
+                "ordering": ["-day", "box"],
+                "constraints": [models.UniqueConstraint(fields=("box", "day"), name="uniq_box_daily_stats")],
+            },
+        ),
+        migrations.CreateModel(
+            name="SongDailyStats",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField(db_index=True)),
+                ("deposit_count", models.PositiveIntegerField(default=0)),
+                ("box", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name="song_daily_stats", to="box_management.box")),
+                ("song", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="daily_stats", to="box_management.song")),
+            ],
+            options={
+                "ordering": ["-day", "song"],
+                "indexes": [models.Index(fields=["box", "day"], name="box_managem_box_id_e09742_idx")],
+                "constraints": [models.UniqueConstraint(fields=("song", "box", "day"), name="uniq_song_daily_stats")],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserDailyStats",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField(db_index=True)),
+                ("deposit_count", models.PositiveIntegerField(default=0)),
+                ("box", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name="user_daily_stats", to="box_management.box")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="daily_stats", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "ordering": ["-day", "user"],
+                "indexes": [models.Index(fields=["box", "day"], name="box_managem_box_id_f1a8e2_idx")],
+                "constraints": [models.UniqueConstraint(fields=("user", "box", "day"), name="uniq_user_daily_stats")],
+            },
+        ),
+    ]
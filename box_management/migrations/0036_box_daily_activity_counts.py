@@ -0,0 +1,28 @@
+# Generated by Django 6.0.6 on 2026-10-19 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("box_management", "0035_daily_stats_rollups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="boxdailystats",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="boxdailystats",
+            name="reaction_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="boxdailystats",
+            name="reveal_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 6.0.6 on 2026-10-19 01:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def backfill_deposit_presence(apps, schema_editor):
+    Deposit = apps.get_model("box_management", "Deposit")
+    SongBoxPresence = apps.get_model("box_management", "SongBoxPresence")
+    UserBoxStats = apps.get_model("box_management", "UserBoxStats")
+
+    presences = (
+        Deposit.objects.order_by()
+        .values("song_id", "box_id")
+        .annotate(first_deposit_at=models.Min("deposited_at"), deposit_count=models.Count("id"))
+    )
+    SongBoxPresence.objects.bulk_create((SongBoxPresence(**row) for row in presences.iterator()), batch_size=1000)
+
+    days = (
+        Deposit.objects.filter(user__isnull=False, box__isnull=False)
+        .annotate(day=TruncDate("deposited_at"))
+        .values("user_id", "box_id", "day")
+        .annotate(first_deposit_at=models.Min("deposited_at"), deposit_count=models.Count("id"))
+        .order_by("user_id", "box_id", "day")
+    )
+    stats = {}
+    for row in days.iterator():
+        key = (row["user_id"], row["box_id"])
+        current = stats.get(key)
+        if current is None:
+            stats[key] = UserBoxStats(
+                user_id=row["user_id"],
+                box_id=row["box_id"],
+                first_deposit_at=row["first_deposit_at"],
+                last_deposit_day=row["day"],
+                current_streak=1,
+                deposit_count=row["deposit_count"],
+            )
+            continue
+        consecutive = (row["day"] - current.last_deposit_day).days == 1
+        current.current_streak = current.current_streak + 1 if consecutive else 1
+        current.last_deposit_day = row["day"]
+        current.deposit_count += row["deposit_count"]
+    UserBoxStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("box_management", "0036_box_daily_activity_counts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SongBoxPresence",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("first_deposit_at", models.DateTimeField()),
+                ("deposit_count", models.PositiveIntegerField(default=1)),
+                ("box", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name="song_presences", to="box_management.box")),
+                ("song", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="box_presences", to="box_management.song")),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("song", "box"), name="uniq_song_box_presence")],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserBoxStats",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("first_deposit_at", models.DateTimeField()),
+                ("last_deposit_day", models.DateField()),
+                ("current_streak", models.PositiveIntegerField(default=1)),
+                ("deposit_count", models.PositiveIntegerField(default=1)),
+                ("box", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="user_stats", to="box_management.box")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="box_stats", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("user", "box"), name="uniq_user_box_stats")],
+            },
+        ),
+        migrations.RunPython(backfill_deposit_presence, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0.6 on 2026-10-19 01:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_box_stats(apps, schema_editor):
+    Deposit = apps.get_model("box_management", "Deposit")
+    BoxStats = apps.get_model("box_management", "BoxStats")
+
+    box_deposits = Deposit.objects.filter(box__isnull=False, deposit_type="box").order_by()
+    rows = box_deposits.values("box_id").annotate(deposit_count=models.Count("id"), last_deposit_at=models.Max("deposited_at"))
+    stats = []
+    for row in rows.iterator():
+        last_deposit = (
+            box_deposits.filter(box_id=row["box_id"], deposited_at=row["last_deposit_at"]).select_related("song").order_by("-id").first()
+        )
+        stats.append(
+            BoxStats(
+                box_id=row["box_id"],
+                deposit_count=row["deposit_count"],
+                last_deposit_at=row["last_deposit_at"],
+                last_deposit_song_image_url=(last_deposit.song.image_url or "") if last_deposit else "",
+            )
+        )
+    BoxStats.objects.bulk_create(stats, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("box_management", "0037_user_box_stats_song_presence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BoxStats",
+            fields=[
+                ("box", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="stats", serialize=False, to="box_management.box")),
+                ("deposit_count", models.PositiveIntegerField(default=0)),
+                ("last_deposit_at", models.DateTimeField(blank=True, null=True)),
+                ("last_deposit_song_image_url", models.URLField(blank=True, default="", max_length=255)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_box_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.6 on 2026-10-19 02:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("box_management", "0038_box_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stickerexportjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
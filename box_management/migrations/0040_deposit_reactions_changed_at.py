@@ -0,0 +1,18 @@
+# Generated by Django 6.0.6 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("box_management", "0039_stickerexportjob_heartbeat_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deposit",
+            name="reactions_changed_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
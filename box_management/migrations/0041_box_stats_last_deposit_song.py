@@ -0,0 +1,39 @@
+# Generated by Django 6.0.6 on 2026-10-19 03:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_last_deposit_song(apps, schema_editor):
+    Deposit = apps.get_model("box_management", "Deposit")
+    BoxStats = apps.get_model("box_management", "BoxStats")
+
+    stats = list(BoxStats.objects.filter(last_deposit_at__isnull=False).only("box_id"))
+    for row in stats:
+        row.last_deposit_song_id = (
+            Deposit.objects.filter(box_id=row.box_id, deposit_type="box")
+            .order_by("-deposited_at", "-id")
+            .values_list("song_id", flat=True)
+            .first()
+        )
+    BoxStats.objects.bulk_update(stats, ["last_deposit_song"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("box_management", "0040_deposit_reactions_changed_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="boxstats",
+            name="last_deposit_song",
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="+", to="box_management.song"),
+        ),
+        migrations.RunPython(backfill_last_deposit_song, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="boxstats",
+            name="last_deposit_song_image_url",
+        ),
+    ]
@@ -7,10 +7,21 @@ from typing import Union
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Coalesce, TruncDate
 from django.dispatch import receiver
 from django.utils import timezone
 
+from box_management.domain.constants import (
+    BOX_PREVIEW_CACHE_NAMESPACE,
+    COMMENT_DAILY_TARGET_CACHE_NAMESPACE,
+    COMMENT_LAST_AT_CACHE_NAMESPACE,
+    COMMENT_RESTRICTION_CACHE_NAMESPACE,
+    CURRENT_INCITATION_CACHE_NAMESPACE,
+    VISIBLE_ARTICLES_CACHE_NAMESPACE,
+)
+from la_boite_a_son.cache import bump_namespace_version, delete_cached
+from la_boite_a_son.write_buffer import buffered_increment
 from users.models import CustomUser
 from utils import generate_unique_filename
 
@@ -31,6 +42,11 @@ def sticker_template_upload_to(instance, filename):
     return f"sticker_templates/{filename}"
 
 
+def sticker_export_upload_to(instance, filename):
+    filename = generate_unique_filename(instance, filename)
+    return f"sticker_exports/{filename}"
+
+
 def validate_sticker_template_svg_file(uploaded_file):
     name = str(getattr(uploaded_file, "name", "") or "")
     if not name.lower().endswith(".svg"):
@@ -745,6 +761,10 @@ class DepositQuerySet(models.QuerySet):
         """Retourne l'id si on passe un objet, sinon la valeur telle quelle."""
         return getattr(obj_or_id, "pk", obj_or_id)
 
+    def mark_reactions_changed(self):
+        """Change la version des réactions, donc la clé du mémo des payloads de base."""
+        return self.update(reactions_changed_at=timezone.now())
+
     def latest_for_box(self, box_or_id: Union[int, "Box"], limit: int | None = None):
         """
         Derniers dépôts d'une box, triés du plus récent au plus ancien.
@@ -809,6 +829,10 @@ class Deposit(models.Model):
     pin_expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
     pin_duration_minutes = models.PositiveIntegerField(null=True, blank=True)
     pin_points_spent = models.PositiveIntegerField(default=0)
+    # Version stockée des réactions, lue sans charger les réactions (voir builders.deposit_payloads).
+    # Un horodatage plutôt qu'un compteur : un save() d'une instance périmée ne peut pas ramener
+    # une version déjà vue.
+    reactions_changed_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     objects = DepositQuerySet.as_manager()
 
@@ -1311,6 +1335,42 @@ class StickerTemplate(models.Model):
         return super().save(*args, **kwargs)
 
 
+class StickerQuerySet(models.QuerySet):
+    def _status_expression(self, *, downloaded_default=False):
+        # Même priorité que Sticker.get_status_from_fields, évaluée par la base pendant l'UPDATE.
+        whens = [models.When(box__isnull=False, then=models.Value(Sticker.STATUS_ASSIGNED))]
+        if not downloaded_default:
+            whens.append(models.When(downloaded_at__isnull=False, then=models.Value(Sticker.STATUS_DOWNLOADED)))
+        default = Sticker.STATUS_DOWNLOADED if downloaded_default else Sticker.STATUS_GENERATED
+        return models.Case(*whens, default=models.Value(default), output_field=models.CharField())
+
+    def _assigned_at_expression(self, at):
+        return models.Case(
+            models.When(box__isnull=True, then=models.Value(None)),
+            default=Coalesce("assigned_at", models.Value(at)),
+            output_field=models.DateTimeField(),
+        )
+
+    def mark_generated(self, at=None):
+        at = at or timezone.now()
+        return self.update(
+            qr_generated_at=Coalesce("qr_generated_at", models.Value(at)),
+            status=self._status_expression(),
+            assigned_at=self._assigned_at_expression(at),
+            updated_at=at,
+        )
+
+    def mark_downloaded(self, at=None):
+        at = at or timezone.now()
+        return self.update(
+            qr_generated_at=Coalesce("qr_generated_at", models.Value(at)),
+            downloaded_at=at,
+            status=self._status_expression(downloaded_default=True),
+            assigned_at=self._assigned_at_expression(at),
+            updated_at=at,
+        )
+
+
 class Sticker(models.Model):
     STATUS_CREATED = "created"
     STATUS_GENERATED = "generated"
@@ -1371,11 +1431,14 @@ class Sticker(models.Model):
             models.Index(fields=["slug"]),
             models.Index(fields=["client", "status"]),
             models.Index(fields=["client", "is_active", "created_at"]),
+            models.Index(fields=["client", "created_at", "id"]),
             models.Index(fields=["client", "qr_generated_at"]),
             models.Index(fields=["client", "downloaded_at"]),
             models.Index(fields=["client", "assigned_at"]),
         ]
 
+    objects = StickerQuerySet.as_manager()
+
     def __str__(self):
         target = getattr(self.box, "url", None) or "non assigné"
         return f"{self.slug} → {target}"
@@ -1384,6 +1447,22 @@ class Sticker(models.Model):
     def generate_slug():
         return "".join(secrets.choice("0123456789") for _ in range(11))
 
+    @classmethod
+    def allocate_slugs(cls, count):
+        """Réserve `count` slugs libres : une requête d'existence par tirage de candidats."""
+        slugs = set()
+        while len(slugs) < count:
+            missing = count - len(slugs)
+            candidates = {cls.generate_slug() for _ in range(missing + max(8, missing // 50))} - slugs
+            taken = set(cls.objects.filter(slug__in=candidates).values_list("slug", flat=True))
+            slugs.update(candidates - taken)
+        return list(slugs)[:count]
+
+    @classmethod
+    def bulk_create_for_client(cls, client, quantity, batch_size=500):
+        stickers = [cls(client=client, slug=slug, status=cls.STATUS_CREATED) for slug in cls.allocate_slugs(quantity)]
+        return cls.objects.bulk_create(stickers, batch_size=batch_size)
+
     def get_status_from_fields(self):
         if self.box_id:
             return self.STATUS_ASSIGNED
@@ -1460,6 +1539,62 @@ class Sticker(models.Model):
         return super().save(*args, **kwargs)
 
 
+class StickerExportJob(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "En attente"),
+        (STATUS_RUNNING, "En cours"),
+        (STATUS_DONE, "Terminé"),
+        (STATUS_FAILED, "Échec"),
+    ]
+
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="sticker_export_jobs")
+    requested_by = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        related_name="sticker_export_jobs",
+        null=True,
+        blank=True,
+    )
+    template = models.ForeignKey(StickerTemplate, on_delete=models.CASCADE, related_name="export_jobs")
+    sticker_ids = models.JSONField(default=list)
+    options = models.JSONField(default=dict)
+    base_url = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    error_code = models.CharField(max_length=64, blank=True, default="")
+    artifact = models.FileField(upload_to=sticker_export_upload_to, blank=True)
+    artifact_name = models.CharField(max_length=120, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["fingerprint", "status"]),
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["client", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Export stickers #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def file_type(self):
+        return (self.options or {}).get("file_type")
+
+    def has_artifact(self):
+        return bool(self.artifact) and self.artifact.storage.exists(self.artifact.name)
+
+
 class Link(models.Model):
     ALPHABET = "abcdefghjkmnpqrstuvwxyz23456789"
 
@@ -1525,6 +1660,13 @@ class Link(models.Model):
         self.expires_at = self.default_expires_at()
         return self.expires_at
 
+    def increment_open_counters(self, viewer=None):
+        # Les ouvertures connectées sont déjà tracées par opened_by_users.
+        if viewer is not None:
+            return
+        self.anonymous_view_count = int(self.anonymous_view_count or 0) + 1
+        buffered_increment(Link, self.pk, "anonymous_view_count")
+
     def save(self, *args, **kwargs):
         if not self.slug:
             slug = self.generate_slug()
@@ -1539,6 +1681,346 @@ class Link(models.Model):
         return super().save(*args, **kwargs)
 
 
+class BoxDailyStats(models.Model):
+    box = models.ForeignKey(Box, on_delete=models.CASCADE, related_name="daily_stats")
+    day = models.DateField(db_index=True)
+    deposit_count = models.PositiveIntegerField(default=0)
+    depositor_count = models.PositiveIntegerField(default=0)
+    reveal_count = models.PositiveIntegerField(default=0)
+    reaction_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day", "box"]
+        constraints = [models.UniqueConstraint(fields=["box", "day"], name="uniq_box_daily_stats")]
+
+    def __str__(self):
+        return f"{self.box_id} @ {self.day}: {self.deposit_count}"
+
+
+class SongDailyStats(models.Model):
+    song = models.ForeignKey(Song, on_delete=models.CASCADE, related_name="daily_stats")
+    box = models.ForeignKey(Box, on_delete=models.CASCADE, related_name="song_daily_stats", null=True, blank=True)
+    day = models.DateField(db_index=True)
+    deposit_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day", "song"]
+        constraints = [
+            models.UniqueConstraint(fields=["song", "box", "day"], name="uniq_song_daily_stats"),
+        ]
+        indexes = [models.Index(fields=["box", "day"])]
+
+    def __str__(self):
+        return f"{self.song_id}/{self.box_id} @ {self.day}: {self.deposit_count}"
+
+
+class UserDailyStats(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="daily_stats")
+    box = models.ForeignKey(Box, on_delete=models.CASCADE, related_name="user_daily_stats", null=True, blank=True)
+    day = models.DateField(db_index=True)
+    deposit_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day", "user"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "box", "day"], name="uniq_user_daily_stats"),
+        ]
+        indexes = [models.Index(fields=["box", "day"])]
+
+    def __str__(self):
+        return f"{self.user_id}/{self.box_id} @ {self.day}: {self.deposit_count}"
+
+
+class AnalyticsWatermark(models.Model):
+    name = models.CharField(max_length=64, unique=True)
+    last_day = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} → {self.last_day or '—'}"
+
+
+class UserBoxStats(models.Model):
+    """
+    Résumé de l'historique d'un utilisateur dans une boîte, tenu à jour à chaque dépôt.
+    `current_streak` = nombre de jours consécutifs de dépôt se terminant à `last_deposit_day`.
+    """
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="box_stats")
+    box = models.ForeignKey(Box, on_delete=models.CASCADE, related_name="user_stats")
+    first_deposit_at = models.DateTimeField()
+    last_deposit_day = models.DateField()
+    current_streak = models.PositiveIntegerField(default=1)
+    deposit_count = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "box"], name="uniq_user_box_stats")]
+
+    def __str__(self):
+        return f"{self.user_id}/{self.box_id}: {self.deposit_count} ({self.current_streak} j)"
+
+    @classmethod
+    def record_deposit(cls, *, user_id, box_id, deposited_at):
+        day = timezone.localtime(deposited_at).date()
+        updated = cls.objects.filter(user_id=user_id, box_id=box_id, last_deposit_day__lte=day).update(
+            current_streak=models.Case(
+                models.When(last_deposit_day=day, then=models.F("current_streak")),
+                models.When(last_deposit_day=day - timedelta(days=1), then=models.F("current_streak") + 1),
+                default=models.Value(1),
+            ),
+            last_deposit_day=day,
+            first_deposit_at=models.Case(
+                models.When(first_deposit_at__gt=deposited_at, then=models.Value(deposited_at)),
+                default=models.F("first_deposit_at"),
+            ),
+            deposit_count=models.F("deposit_count") + 1,
+        )
+        if updated:
+            return
+        if cls.objects.filter(user_id=user_id, box_id=box_id).exists():
+            # Dépôt antidaté (import, seed) : la série ne peut plus se déduire de la ligne seule.
+            cls.rebuild(user_id=user_id, box_id=box_id)
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(user_id=user_id, box_id=box_id, first_deposit_at=deposited_at, last_deposit_day=day)
+        except IntegrityError:
+            # Ligne créée entre-temps par un dépôt concurrent : on repasse par l'UPDATE.
+            cls.record_deposit(user_id=user_id, box_id=box_id, deposited_at=deposited_at)
+
+    @classmethod
+    def rebuild(cls, *, user_id, box_id):
+        deposits = Deposit.objects.filter(user_id=user_id, box_id=box_id).order_by()
+        summary = deposits.aggregate(first_deposit_at=models.Min("deposited_at"), deposit_count=models.Count("id"))
+        if not summary["deposit_count"]:
+            cls.objects.filter(user_id=user_id, box_id=box_id).delete()
+            return
+        days = deposits.annotate(day=TruncDate("deposited_at")).values_list("day", flat=True).distinct().order_by("-day")
+        last_deposit_day, current_streak = None, 0
+        for day in days.iterator():
+            if last_deposit_day is None:
+                last_deposit_day = day
+            elif day != last_deposit_day - timedelta(days=current_streak):
+                break
+            current_streak += 1
+        cls.objects.update_or_create(
+            user_id=user_id,
+            box_id=box_id,
+            defaults={**summary, "last_deposit_day": last_deposit_day, "current_streak": current_streak},
+        )
+
+    def streak_before(self, day):
+        """Série de jours consécutifs se terminant la veille de `day` (le jour même ne compte pas)."""
+        if self.last_deposit_day == day:
+            return self.current_streak - 1
+        if self.last_deposit_day == day - timedelta(days=1):
+            return self.current_streak
+        return 0
+
+
+class SongBoxPresence(models.Model):
+    """Index (chanson, boîte) des dépôts ; `box` vide pour les dépôts hors boîte (favoris)."""
+
+    song = models.ForeignKey(Song, on_delete=models.CASCADE, related_name="box_presences")
+    box = models.ForeignKey(Box, on_delete=models.CASCADE, related_name="song_presences", null=True, blank=True)
+    first_deposit_at = models.DateTimeField()
+    deposit_count = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["song", "box"], name="uniq_song_box_presence")]
+
+    def __str__(self):
+        return f"{self.song_id} @ {self.box_id or '—'}: {self.deposit_count}"
+
+    @classmethod
+    def record_deposit(cls, *, song_id, box_id, deposited_at):
+        updated = cls.objects.filter(song_id=song_id, box_id=box_id).update(deposit_count=models.F("deposit_count") + 1)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    cls.objects.create(song_id=song_id, box_id=box_id, first_deposit_at=deposited_at)
+            except IntegrityError:
+                cls.record_deposit(song_id=song_id, box_id=box_id, deposited_at=deposited_at)
+
+    @classmethod
+    def rebuild(cls, *, song_id, box_id):
+        summary = Deposit.objects.filter(song_id=song_id, box_id=box_id).order_by().aggregate(
+            first_deposit_at=models.Min("deposited_at"), deposit_count=models.Count("id")
+        )
+        if not summary["deposit_count"]:
+            cls.objects.filter(song_id=song_id, box_id=box_id).delete()
+            return
+        cls.objects.update_or_create(song_id=song_id, box_id=box_id, defaults=summary)
+
+
+class BoxStats(models.Model):
+    """Compteurs dénormalisés de la prévisualisation d'une boîte (dépôts de type box uniquement)."""
+
+    box = models.OneToOneField(Box, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    deposit_count = models.PositiveIntegerField(default=0)
+    last_deposit_at = models.DateTimeField(null=True, blank=True)
+    # La chanson plutôt que son image : la prévisualisation lit Song.image_url par jointure,
+    # une pochette mise à jour après le dépôt y apparaît donc (au TTL du cache de preview près).
+    last_deposit_song = models.ForeignKey(Song, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.box_id}: {self.deposit_count}"
+
+    @classmethod
+    def record_deposit(cls, *, box_id, deposited_at, song_id):
+        is_latest = models.Q(last_deposit_at__isnull=True) | models.Q(last_deposit_at__lte=deposited_at)
+        updated = cls.objects.filter(box_id=box_id).update(
+            deposit_count=models.F("deposit_count") + 1,
+            last_deposit_at=models.Case(models.When(is_latest, then=models.Value(deposited_at)), default=models.F("last_deposit_at")),
+            last_deposit_song=models.Case(
+                models.When(is_latest, then=models.Value(song_id)),
+                default=models.F("last_deposit_song"),
+                output_field=models.BigIntegerField(),
+            ),
+            updated_at=timezone.now(),
+        )
+        if updated:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(box_id=box_id, deposit_count=1, last_deposit_at=deposited_at, last_deposit_song_id=song_id)
+        except IntegrityError:
+            cls.record_deposit(box_id=box_id, deposited_at=deposited_at, song_id=song_id)
+
+    @classmethod
+    def rebuild(cls, box_id):
+        deposits = Deposit.objects.filter(box_id=box_id, deposit_type=Deposit.DEPOSIT_TYPE_BOX)
+        last_deposit = deposits.order_by("-deposited_at", "-id").first()
+        cls.objects.update_or_create(
+            box_id=box_id,
+            defaults={
+                "deposit_count": deposits.count(),
+                "last_deposit_at": getattr(last_deposit, "deposited_at", None),
+                "last_deposit_song_id": last_deposit.song_id if last_deposit else None,
+            },
+        )
+
+
+def invalidate_box_preview(box):
+    delete_cached(BOX_PREVIEW_CACHE_NAMESPACE, box.url)
+
+
+def invalidate_box_preview_by_id(box_id):
+    # Chemin des signaux de suppression : ne jamais charger instance.box, la boîte peut déjà être supprimée.
+    box_url = Box.objects.filter(pk=box_id).values_list("url", flat=True).first()
+    if box_url:
+        delete_cached(BOX_PREVIEW_CACHE_NAMESPACE, box_url)
+
+
+@receiver(models.signals.post_save, sender=Box)
+def invalidate_preview_on_box_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_box_preview(instance)
+
+
+@receiver(models.signals.post_delete, sender=Box)
+def invalidate_preview_on_box_delete(sender, instance, **kwargs):
+    invalidate_box_preview(instance)
+
+
+@receiver([models.signals.post_save, models.signals.post_delete], sender=IncitationPhrase)
+def invalidate_previews_on_incitation_change(sender, instance, raw=False, **kwargs):
+    # Changements rares : on invalide les deux namespaces en entier. Une phrase déplacée vers un autre
+    # client doit aussi disparaître du cache de l'ancien client, que l'instance ne connaît plus.
+    if not raw:
+        bump_namespace_version(CURRENT_INCITATION_CACHE_NAMESPACE)
+        bump_namespace_version(BOX_PREVIEW_CACHE_NAMESPACE)
+
+
+@receiver([models.signals.post_save, models.signals.post_delete], sender=Article)
+def invalidate_visible_articles_on_article_change(sender, instance, raw=False, **kwargs):
+    if not raw and instance.client_id:
+        delete_cached(VISIBLE_ARTICLES_CACHE_NAMESPACE, instance.client_id)
+
+
+@receiver([models.signals.post_save, models.signals.post_delete], sender=CommentUserRestriction)
+def invalidate_comment_restriction_cache(sender, instance, raw=False, **kwargs):
+    if not raw and instance.user_id:
+        delete_cached(COMMENT_RESTRICTION_CACHE_NAMESPACE, instance.user_id, instance.client_id)
+
+
+@receiver(models.signals.post_delete, sender=Comment)
+def invalidate_comment_anti_abuse_counters(sender, instance, **kwargs):
+    # Mêmes clés que services.comments.anti_abuse : recomptées en base au prochain contrôle,
+    # un commentaire supprimé ne compte plus dans la limite quotidienne ni dans le cooldown.
+    if not instance.user_id:
+        return
+    delete_cached(COMMENT_LAST_AT_CACHE_NAMESPACE, instance.user_id)
+    if instance.deposit_owner_user_id and instance.created_at:
+        delete_cached(
+            COMMENT_DAILY_TARGET_CACHE_NAMESPACE,
+            instance.user_id,
+            instance.client_id,
+            instance.deposit_owner_user_id,
+            timezone.localdate(instance.created_at).isoformat(),
+        )
+
+
+@receiver(models.signals.post_save, sender=Deposit)
+def record_deposit_presence(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    SongBoxPresence.record_deposit(song_id=instance.song_id, box_id=instance.box_id, deposited_at=instance.deposited_at)
+    if instance.user_id and instance.box_id:
+        UserBoxStats.record_deposit(user_id=instance.user_id, box_id=instance.box_id, deposited_at=instance.deposited_at)
+    if instance.box_id and instance.deposit_type == Deposit.DEPOSIT_TYPE_BOX:
+        BoxStats.record_deposit(box_id=instance.box_id, deposited_at=instance.deposited_at, song_id=instance.song_id)
+        # Après commit : invalidée avant, une preview concurrente remettrait l'ancien état en cache.
+        box_url = instance.box.url
+        transaction.on_commit(lambda: delete_cached(BOX_PREVIEW_CACHE_NAMESPACE, box_url))
+
+
+def _deleted_with(origin, model):
+    """Vrai si la suppression part d'une instance (ou d'un queryset) de `model` : ses lignes liées partent en cascade."""
+    if isinstance(origin, models.QuerySet):
+        return origin.model is model
+    return isinstance(origin, model)
+
+
+@receiver(models.signals.post_delete, sender=Deposit)
+def forget_deposit_presence(sender, instance, origin=None, **kwargs):
+    # Suppression rare (modération, compte supprimé) : les lignes sont recalculées depuis les dépôts restants.
+    if _deleted_with(origin, Box):
+        return
+    if not _deleted_with(origin, Song):
+        SongBoxPresence.rebuild(song_id=instance.song_id, box_id=instance.box_id)
+    if instance.user_id and instance.box_id:
+        UserBoxStats.rebuild(user_id=instance.user_id, box_id=instance.box_id)
+
+
+@receiver(models.signals.post_delete, sender=Deposit)
+def refresh_box_stats_after_deposit_delete(sender, instance, origin=None, **kwargs):
+    # Boîte supprimée : BoxStats part en cascade, inutile de recalculer pour chacun de ses dépôts.
+    if not instance.box_id or instance.deposit_type != Deposit.DEPOSIT_TYPE_BOX or _deleted_with(origin, Box):
+        return
+    # Suppression rare (modération, compte supprimé) : on recalcule la ligne depuis l'historique.
+    BoxStats.rebuild(instance.box_id)
+    box_id = instance.box_id
+    transaction.on_commit(lambda: invalidate_box_preview_by_id(box_id))
+
+
+@receiver([models.signals.post_save, models.signals.post_delete], sender=Reaction)
+def mark_deposit_reactions_changed(sender, instance, raw=False, origin=None, **kwargs):
+    # Dépôt supprimé avec ses réactions : plus rien à versionner.
+    if raw or _deleted_with(origin, Deposit) or _deleted_with(origin, Box) or _deleted_with(origin, Song):
+        return
+    Deposit.objects.filter(pk=instance.deposit_id).mark_reactions_changed()
+
+
+@receiver(models.signals.post_save, sender=Emoji)
+def mark_emoji_deposits_reactions_changed(sender, instance, created=False, raw=False, **kwargs):
+    # Un emoji renommé ou désactivé change les réactions affichées de tous les dépôts qui l'utilisent.
+    if not created and not raw:
+        Deposit.objects.filter(reactions__emoji=instance).mark_reactions_changed()
+
+
 @receiver(models.signals.pre_delete, sender=Deposit)
 def mark_comments_when_deposit_deleted(sender, instance, **kwargs):
     Comment.objects.filter(deposit=instance).update(deposit_deleted=True)
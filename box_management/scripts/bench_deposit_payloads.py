@@ -0,0 +1,96 @@
+import statistics
+import time
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from box_management.builders.deposit_payloads import DepositBasePayloadMemo, build_deposits_payload
+from box_management.models import Box, Deposit, DiscoveredSong, Emoji, Reaction, Song
+from users.models import CustomUser
+
+PAGE_SIZE = 25
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _parse_int_arg(raw_args, name, default):
+    for arg in raw_args:
+        if isinstance(arg, str) and arg.startswith(f"{name}="):
+            try:
+                return max(1, int(arg.split("=", 1)[1]))
+            except (TypeError, ValueError):
+                return default
+    return default
+
+
+def _load_page(box):
+    # Comme box_content : les réactions ne sont chargées par le builder que pour les dépôts absents du mémo.
+    return list(
+        Deposit.objects.filter(box=box, deposit_type=Deposit.DEPOSIT_TYPE_BOX)
+        .select_related("song", "box", "user")
+        .order_by("-deposited_at", "-id")[:PAGE_SIZE]
+    )
+
+
+def _seed(reactions_per_deposit):
+    stamp = timezone.now().strftime("%H%M%S%f")
+    box = Box.objects.create(name=f"bench-{stamp}", url=f"bench-{stamp}")
+    emojis = [Emoji.objects.get_or_create(char=char)[0] for char in ("🔥", "🎧", "💃")]
+    users = CustomUser.objects.bulk_create(
+        [CustomUser(username=f"bench_{stamp}_{i}") for i in range(max(reactions_per_deposit, 2))]
+    )
+    viewer = users[0]
+    for i in range(PAGE_SIZE):
+        song = Song.objects.create(public_key=f"b{stamp}{i}"[:25], title=f"Bench {i}", artists_json=["Bench"])
+        deposit = Deposit.objects.create(box=box, song=song, user=users[1])
+        Reaction.objects.bulk_create(
+            [
+                Reaction(user=user, deposit=deposit, emoji=emojis[j % len(emojis)])
+                for j, user in enumerate(users[:reactions_per_deposit])
+            ]
+        )
+        if i % 2:
+            DiscoveredSong.objects.create(user=viewer, deposit=deposit)
+    return box, viewer
+
+
+def _measure(box, viewer, iterations, base_memo):
+    durations = []
+    queries = 0
+    for _ in range(iterations):
+        deps = _load_page(box)
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            build_deposits_payload(deps, viewer=viewer, base_memo=base_memo)
+            durations.append((time.perf_counter() - started) * 1000)
+        queries = len(ctx.captured_queries)
+    return statistics.median(durations), queries
+
+
+def run(*args):
+    raw_args = list(args or [])
+    iterations = _parse_int_arg(raw_args, "iterations", 20)
+    reactions = _parse_int_arg(raw_args, "reactions", 50)
+
+    print("=== Bench deposit payloads ===")
+    print(f"[INFO] Page : {PAGE_SIZE} dépôts, {reactions} réactions par dépôt, {iterations} itérations")
+
+    try:
+        with transaction.atomic():
+            box, viewer = _seed(reactions)
+
+            cold_ms, cold_queries = _measure(box, viewer, iterations, base_memo=None)
+
+            memo = DepositBasePayloadMemo()
+            build_deposits_payload(_load_page(box), viewer=viewer, base_memo=memo)
+            warm_ms, warm_queries = _measure(box, viewer, iterations, base_memo=memo)
+
+            print(f"[OK] Sans cache     : {cold_ms:.2f} ms (médiane), {cold_queries} requêtes")
+            print(f"[OK] Cache de base chaud : {warm_ms:.2f} ms (médiane), {warm_queries} requêtes")
+            print(f"[INFO] Mémo : {memo.hits} hits / {memo.misses} misses")
+            raise _Rollback
+    except _Rollback:
+        print("[INFO] Données de bench annulées (rollback).")
@@ -0,0 +1,86 @@
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from box_management.models import Box, Comment, Deposit, DiscoveredSong, Emoji, EmojiRight, Reaction, Song
+from users.models import CustomUser
+from users.utils import merge_guest_into_user
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _parse_int_arg(raw_args, name, default):
+    for arg in raw_args:
+        if isinstance(arg, str) and arg.startswith(f"{name}="):
+            try:
+                return max(1, int(arg.split("=", 1)[1]))
+            except (TypeError, ValueError):
+                return default
+    return default
+
+
+def _seed(discoveries, deposits):
+    stamp = timezone.now().strftime("%H%M%S%f")
+    box = Box.objects.create(name=f"bench-merge-{stamp}", url=f"bench-merge-{stamp}")
+    owner, account = CustomUser.objects.bulk_create(
+        [CustomUser(username=f"bench_owner_{stamp}"), CustomUser(username=f"bench_account_{stamp}")]
+    )
+    guest = CustomUser.objects.create(username=f"guest_bench_{stamp}", is_guest=True)
+    emojis = [Emoji.objects.get_or_create(char=char)[0] for char in ("🔥", "🎧", "💃")]
+
+    songs = Song.objects.bulk_create(
+        [Song(public_key=f"m{stamp}{i}"[:25], title=f"Bench {i}", artists_json=["Bench"]) for i in range(discoveries)]
+    )
+    owner_deposits = Deposit.objects.bulk_create(
+        [Deposit(box=box, song=song, user=owner, public_key=f"o{stamp[-8:]}{i}") for i, song in enumerate(songs)]
+    )
+    Deposit.objects.bulk_create(
+        [
+            Deposit(box=box, song=songs[i % len(songs)], user=guest, public_key=f"g{stamp[-8:]}{i}")
+            for i in range(deposits)
+        ]
+    )
+
+    # Le compte cible a déjà vu/réagi à un dépôt sur quatre : ce sont les collisions à fusionner.
+    overlap = owner_deposits[::4]
+    DiscoveredSong.objects.bulk_create([DiscoveredSong(user=guest, deposit=deposit) for deposit in owner_deposits])
+    DiscoveredSong.objects.bulk_create([DiscoveredSong(user=account, deposit=deposit) for deposit in overlap])
+    Reaction.objects.bulk_create(
+        [Reaction(user=guest, deposit=deposit, emoji=emojis[i % 3]) for i, deposit in enumerate(owner_deposits)]
+    )
+    Reaction.objects.bulk_create([Reaction(user=account, deposit=deposit, emoji=emojis[0]) for deposit in overlap])
+    Comment.objects.bulk_create(
+        [Comment(user=guest, deposit=deposit, text=f"Bench {i}") for i, deposit in enumerate(owner_deposits[::2])]
+    )
+    EmojiRight.objects.bulk_create([EmojiRight(user=guest, emoji=emoji) for emoji in emojis])
+    return guest, account
+
+
+def run(*args):
+    raw_args = list(args or [])
+    discoveries = _parse_int_arg(raw_args, "discoveries", 5000)
+    deposits = _parse_int_arg(raw_args, "deposits", 200)
+
+    print("=== Bench fusion guest -> compte ===")
+    print(f"[INFO] Guest : {discoveries} découvertes et réactions, {deposits} dépôts, 25 % de collisions")
+
+    try:
+        with transaction.atomic():
+            guest, account = _seed(discoveries, deposits)
+            with CaptureQueriesContext(connection) as ctx:
+                result = merge_guest_into_user(guest, account)
+
+            timings = result["timings_ms"]
+            print(f"[OK] Fusion : {timings['total']:.1f} ms, {len(ctx.captured_queries)} requêtes")
+            for step, elapsed_ms in timings.items():
+                if step != "total":
+                    print(f"[INFO]   {step:<14} {elapsed_ms:.1f} ms")
+            print(
+                f"[INFO] Découvertes {result['discoveries_moved']} déplacées / {result['discoveries_merged']} fusionnées, "
+                f"réactions {result['reactions_moved']} déplacées / {result['reactions_updated']} mises à jour"
+            )
+            raise _Rollback
+    except _Rollback:
+        print("[INFO] Données de bench annulées (rollback).")
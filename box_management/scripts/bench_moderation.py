@@ -0,0 +1,89 @@
+import random
+import re
+import time
+
+from la_boite_a_son.moderation import (
+    MODERATION_RULES_CONFIG,
+    get_moderation_engine,
+    normalize_moderation_text,
+)
+
+CLEAN_WORDS = [
+    "super", "morceau", "merci", "pour", "la", "reco", "trop", "bien", "ce", "son", "me", "rappelle",
+    "l'été", "grosse", "claque", "j'adore", "refrain", "basse", "écoute", "encore", "une", "fois",
+]
+NOISY_FRAGMENTS = [
+    "www.site.fr", "écris moi a.b@mail.com", "06 12 34 56 78", "connard", "ta gueule",
+    "on sait où tu habites", "aaaaaaaa", "!!!???***%%%", "sale con",
+]
+
+
+def _parse_int_arg(raw_args, name, default):
+    for arg in raw_args:
+        if isinstance(arg, str) and arg.startswith(f"{name}="):
+            try:
+                return max(1, int(arg.split("=", 1)[1]))
+            except (TypeError, ValueError):
+                return default
+    return default
+
+
+def _build_corpus(size, seed=42):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        words = rng.choices(CLEAN_WORDS, k=rng.randint(3, 12))
+        if rng.random() < 0.2:
+            words.insert(rng.randint(0, len(words)), rng.choice(NOISY_FRAGMENTS))
+        corpus.append(" ".join(words)[:100])
+    return corpus
+
+
+def _sequential_flags(compiled_rules, normalized):
+    # Référence : une regex par motif, évaluées l'une après l'autre (ancien fonctionnement).
+    flags = set()
+    digits = None
+    for flag, min_digits, patterns in compiled_rules:
+        if any(pattern.search(normalized) for pattern in patterns):
+            if min_digits:
+                digits = len(re.findall(r"\d", normalized)) if digits is None else digits
+                if digits < min_digits:
+                    continue
+            flags.add(flag)
+    return flags
+
+
+def run(*args):
+    raw_args = list(args or [])
+    size = _parse_int_arg(raw_args, "comments", 100000)
+    corpus = _build_corpus(size)
+    normalized_corpus = [normalize_moderation_text(text) for text in corpus]
+
+    engine = get_moderation_engine()
+    compiled_rules = [
+        (rule["flag"], rule["min_digits"], [re.compile(pattern, re.IGNORECASE) for pattern in rule["patterns"]])
+        for rule in MODERATION_RULES_CONFIG.get()["rules"]
+    ]
+
+    print("=== Bench moteur de modération ===")
+    print(f"[INFO] {size} commentaires synthétiques (~20 % avec un fragment à signaler)")
+
+    started = time.perf_counter()
+    sequential = [_sequential_flags(compiled_rules, text) for text in normalized_corpus]
+    sequential_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scans = [engine.scan(text, normalized_text=normalized) for text, normalized in zip(corpus, normalized_corpus)]
+    engine_s = time.perf_counter() - started
+
+    rule_flags = {rule[0] for rule in compiled_rules}
+    mismatches = sum(
+        1
+        for expected, scan in zip(sequential, scans)
+        if expected != {flag for flag in scan.flags if flag in rule_flags}
+    )
+    flagged = sum(1 for scan in scans if scan.flags)
+
+    print(f"[OK] Regex séquentielles : {size / sequential_s:,.0f} commentaires/s (motifs seuls)")
+    print(f"[OK] Moteur une passe    : {size / engine_s:,.0f} commentaires/s (motifs + signaux)")
+    print(f"[INFO] {flagged} commentaires signalés, {mismatches} divergences de flags avec la référence")
@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from la_boite_a_son.sqlite import build_sqlite_options, build_sqlite_pragmas
+
+SCHEMA = """
+CREATE TABLE user (id INTEGER PRIMARY KEY, points INTEGER NOT NULL DEFAULT 0, last_seen_at REAL);
+CREATE TABLE deposit (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, box_id INTEGER NOT NULL, deposited_at REAL NOT NULL);
+CREATE INDEX deposit_box ON deposit (box_id, deposited_at);
+CREATE TABLE user_box_stats (user_id INTEGER NOT NULL, box_id INTEGER NOT NULL, deposit_count INTEGER NOT NULL, PRIMARY KEY (user_id, box_id));
+CREATE TABLE discovered (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, deposit_id INTEGER NOT NULL, discovered_at REAL NOT NULL);
+"""
+
+# Profils comparés : SQLite par défaut (ce que fait Django sans OPTIONS) vs réglages de production.
+PROFILES = {
+    "default": {"pragmas": [], "timeout": 5.0, "transaction_mode": "DEFERRED"},
+    "tuned": {
+        "pragmas": build_sqlite_pragmas(),
+        "timeout": build_sqlite_options()["timeout"],
+        "transaction_mode": build_sqlite_options()["transaction_mode"],
+    },
+}
+
+
+def _parse_int_arg(raw_args, name, default):
+    for arg in raw_args:
+        if isinstance(arg, str) and arg.startswith(f"{name}="):
+            try:
+                return max(1, int(arg.split("=", 1)[1]))
+            except (TypeError, ValueError):
+                return default
+    return default
+
+
+def _connect(path, profile):
+    conn = sqlite3.connect(path, timeout=profile["timeout"], isolation_level=None)
+    for name, value in profile["pragmas"]:
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def _seed(path, users, boxes):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript(SCHEMA)
+    conn.execute("BEGIN")
+    conn.executemany("INSERT INTO user (id) VALUES (?)", [(i,) for i in range(1, users + 1)])
+    conn.executemany(
+        "INSERT INTO deposit (user_id, box_id, deposited_at) VALUES (?, ?, ?)",
+        [(random.randint(1, users), random.randint(1, boxes), time.time()) for _ in range(users * 5)],
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def _deposit_flow(conn, mode, user_id, box_id):
+    # Même forme que create_session_box_deposit : verrou user, insertion, stats, points.
+    conn.execute(f"BEGIN {mode}")
+    conn.execute("SELECT points FROM user WHERE id = ?", (user_id,)).fetchone()
+    conn.execute("INSERT INTO deposit (user_id, box_id, deposited_at) VALUES (?, ?, ?)", (user_id, box_id, time.time()))
+    conn.execute(
+        "INSERT INTO user_box_stats (user_id, box_id, deposit_count) VALUES (?, ?, 1) "
+        "ON CONFLICT (user_id, box_id) DO UPDATE SET deposit_count = deposit_count + 1",
+        (user_id, box_id),
+    )
+    conn.execute("UPDATE user SET points = points + 10 WHERE id = ?", (user_id,))
+    conn.execute("COMMIT")
+
+
+def _reveal_flow(conn, mode, user_id, box_id):
+    conn.execute(f"BEGIN {mode}")
+    row = conn.execute("SELECT id FROM deposit WHERE box_id = ? ORDER BY deposited_at DESC LIMIT 1", (box_id,)).fetchone()
+    if row:
+        conn.execute("UPDATE user SET points = points - 5 WHERE id = ?", (user_id,))
+        conn.execute(
+            "INSERT INTO discovered (user_id, deposit_id, discovered_at) VALUES (?, ?, ?)", (user_id, row[0], time.time())
+        )
+    conn.execute("UPDATE user SET last_seen_at = ? WHERE id = ?", (time.time(), user_id))
+    conn.execute("COMMIT")
+
+
+def _worker(args):
+    path, profile_name, operations, users, boxes, seed = args
+    profile = PROFILES[profile_name]
+    rng = random.Random(seed)
+    conn = _connect(path, profile)
+    latencies, errors = [], 0
+    for _ in range(operations):
+        flow = _deposit_flow if rng.random() < 0.4 else _reveal_flow
+        started = time.perf_counter()
+        try:
+            flow(conn, profile["transaction_mode"], rng.randint(1, users), rng.randint(1, boxes))
+        except sqlite3.OperationalError:
+            errors += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+    conn.close()
+    return latencies, errors
+
+
+def _measure(profile_name, workers, operations, users, boxes):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "bench.sqlite3")
+        _seed(path, users, boxes)
+        jobs = [(path, profile_name, operations, users, boxes, index) for index in range(workers)]
+        started = time.perf_counter()
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(_worker, jobs)
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    errors = sum(result[1] for result in results)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(
+        f"[OK] {profile_name:<8} — {len(latencies) / elapsed:.0f} tx/s, p95 {p95:.1f} ms, "
+        f"{errors} « database is locked » sur {workers * operations} transactions"
+    )
+
+
+def run(*args):
+    raw_args = list(args or [])
+    workers = _parse_int_arg(raw_args, "workers", 4)
+    operations = _parse_int_arg(raw_args, "operations", 500)
+    users = _parse_int_arg(raw_args, "users", 200)
+    boxes = _parse_int_arg(raw_args, "boxes", 10)
+
+    print("=== Bench concurrence SQLite (dépôts / révélations) ===")
+    print(f"[INFO] {workers} processus × {operations} transactions, {users} users, {boxes} boîtes (base temporaire)")
+    for profile_name in PROFILES:
+        _measure(profile_name, workers, operations, users, boxes)
@@ -0,0 +1,101 @@
+import time
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from box_management.models import Client, Sticker, StickerTemplate
+from box_management.services.stickers.export import PDF_ENGINES, render_stickers_pdf_bytes
+
+BASE_URL = "https://bench.invalid/"
+BENCH_TEMPLATE_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 150">'
+    '<rect x="0" y="0" width="100" height="150" fill="#ffd400" />'
+    '<text x="50" y="130" font-size="12" text-anchor="middle">La Boîte à Son</text>'
+    '<rect id="qr-zone" x="20" y="20" width="60" height="60" />'
+    "</svg>"
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _parse_int_arg(raw_args, name, default):
+    for arg in raw_args:
+        if isinstance(arg, str) and arg.startswith(f"{name}="):
+            try:
+                return max(1, int(arg.split("=", 1)[1]))
+            except (TypeError, ValueError):
+                return default
+    return default
+
+
+def _parse_engines_arg(raw_args):
+    for arg in raw_args:
+        if isinstance(arg, str) and arg.startswith("engines="):
+            engines = [engine.strip() for engine in arg.split("=", 1)[1].split(",")]
+            return [engine for engine in engines if engine in PDF_ENGINES]
+    return sorted(PDF_ENGINES)
+
+
+def _templates_or_seed(stamp, seeded_files):
+    templates = list(StickerTemplate.objects.filter(is_active=True).order_by("name", "id"))
+    if templates:
+        return templates
+    template = StickerTemplate(name=f"bench-{stamp}", slug=f"bench-{stamp}")
+    template.svg_file.save(f"bench-{stamp}.svg", ContentFile(BENCH_TEMPLATE_SVG.encode("utf-8")), save=False)
+    template.save()
+    seeded_files.append(template.svg_file.name)
+    return [template]
+
+
+def _measure(engine, stickers, template):
+    timings = []
+    started = time.perf_counter()
+    try:
+        pdf_bytes = render_stickers_pdf_bytes(
+            BASE_URL,
+            stickers,
+            template=template,
+            paper_size="A6",
+            orientation="portrait",
+            engine=engine,
+            timings=timings,
+        )
+    except RuntimeError as exc:
+        print(f"[WARNING] {engine} / {template.slug} — indisponible ({exc})")
+        return
+    total_ms = (time.perf_counter() - started) * 1000
+    sessions = {timing["export_session"]: timing["export_session_ms"] for timing in timings}
+    slowest_ms = max(sessions.values(), default=0)
+    print(
+        f"[OK] {engine:<8} / {template.slug} — {total_ms:.0f} ms au total, "
+        f"{total_ms / len(stickers):.1f} ms/page, {len(pdf_bytes) // 1024} Ko"
+    )
+    print(f"[INFO]   {len(sessions)} sessions d'export, la plus lente : {slowest_ms:.0f} ms")
+
+
+def run(*args):
+    raw_args = list(args or [])
+    count = _parse_int_arg(raw_args, "stickers", 20)
+    engines = _parse_engines_arg(raw_args)
+
+    print("=== Bench moteurs PDF stickers ===")
+    print(f"[INFO] {count} stickers par export, moteurs : {', '.join(engines)}")
+
+    seeded_files = []
+    try:
+        with transaction.atomic():
+            stamp = time.strftime("%H%M%S")
+            client = Client.objects.create(name=f"bench-{stamp}", slug=f"bench-{stamp}")
+            stickers = [Sticker.objects.create(client=client) for _ in range(count)]
+            for template in _templates_or_seed(stamp, seeded_files):
+                for engine in engines:
+                    _measure(engine, stickers, template)
+            raise _Rollback
+    except _Rollback:
+        print("[INFO] Données de bench annulées (rollback).")
+    finally:
+        for name in seeded_files:
+            default_storage.delete(name)
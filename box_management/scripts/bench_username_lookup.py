@@ -0,0 +1,76 @@
+import random
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import CustomUser, get_user_by_username, username_ci_match
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _parse_int_arg(raw_args, name, default):
+    for arg in raw_args:
+        if isinstance(arg, str) and arg.startswith(f"{name}="):
+            try:
+                return max(1, int(arg.split("=", 1)[1]))
+            except (TypeError, ValueError):
+                return default
+    return default
+
+
+def _seed(users, batch_size=5000):
+    stamp = timezone.now().strftime("%H%M%S")
+    usernames = [f"Bench{stamp}_User{i}" for i in range(users)]
+    for start in range(0, users, batch_size):
+        CustomUser.objects.bulk_create(
+            [CustomUser(username=username, password="") for username in usernames[start : start + batch_size]],
+            batch_size=batch_size,
+        )
+    return usernames
+
+
+def _time_lookups(lookup, names):
+    started = time.perf_counter()
+    found = sum(1 for name in names if lookup(name) is not None)
+    return (time.perf_counter() - started) * 1000 / len(names), found
+
+
+def _plan(queryset):
+    return " | ".join(line.strip() for line in queryset.explain().splitlines() if line.strip())
+
+
+def run(*args):
+    raw_args = list(args or [])
+    users = _parse_int_arg(raw_args, "users", 1000000)
+    lookups = _parse_int_arg(raw_args, "lookups", 500)
+
+    print("=== Bench recherche de profil par nom d'utilisateur ===")
+    print(f"[INFO] {users} comptes, {lookups} recherches avec une casse aléatoire")
+
+    try:
+        with transaction.atomic():
+            started = time.perf_counter()
+            usernames = _seed(users)
+            print(f"[INFO] Seed : {time.perf_counter() - started:.1f} s")
+
+            rng = random.Random(42)
+            names = [
+                "".join(char.upper() if rng.random() < 0.5 else char.lower() for char in rng.choice(usernames))
+                for _ in range(lookups)
+            ]
+
+            iexact_ms, iexact_found = _time_lookups(
+                lambda name: CustomUser.objects.filter(is_guest=False, username__iexact=name).first(), names
+            )
+            helper_ms, helper_found = _time_lookups(get_user_by_username, names)
+
+            print(f"[OK] username__iexact      : {iexact_ms:.3f} ms/recherche ({iexact_found} trouvés)")
+            print(f"[OK] get_user_by_username : {helper_ms:.3f} ms/recherche ({helper_found} trouvés)")
+            print(f"[INFO] Plan iexact : {_plan(CustomUser.objects.filter(username__iexact=names[0]))}")
+            print(f"[INFO] Plan helper : {_plan(CustomUser.objects.filter(username_ci_match(names[0])))}")
+            raise _Rollback
+    except _Rollback:
+        print("[INFO] Données de bench annulées (rollback).")
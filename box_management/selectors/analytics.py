@@ -0,0 +1,20 @@
+from box_management.domain.constants import DEPOSIT_ROLLUP_WATERMARK
+from box_management.models import AnalyticsWatermark, Box, BoxDailyStats
+
+BOX_DAILY_STATS_FIELDS = ("box_id", "day", "deposit_count", "depositor_count", "reveal_count", "reaction_count", "comment_count")
+
+
+def get_client_boxes_for_stats(*, client_id):
+    return list(Box.objects.filter(client_id=client_id).order_by("name", "id").values("id", "name", "url"))
+
+
+def get_client_box_daily_stats(*, client_id, date_from, date_to):
+    return (
+        BoxDailyStats.objects.filter(box__client_id=client_id, day__gte=date_from, day__lte=date_to)
+        .order_by("box_id", "day")
+        .values(*BOX_DAILY_STATS_FIELDS)
+    )
+
+
+def get_deposit_rollup_watermark():
+    return AnalyticsWatermark.objects.filter(name=DEPOSIT_ROLLUP_WATERMARK).values("last_day", "updated_at").first()
@@ -1,14 +1,7 @@
 from box_management.models import Article
 
 
-def get_visible_articles_for_client(*, client_id, limit):
-    return (
-        Article.objects.with_related()
-        .for_client(client_id)
-        .currently_visible()
-        .order_by("-published_at", "-created_at")[:limit]
-    )
-
-
-def get_visible_article_by_id(*, client_id, article_id):
-    return Article.objects.with_related().for_client(client_id).currently_visible().filter(id=article_id).first()
+def get_articles_by_ids(*, client_id, article_ids):
+    """Articles publiés du client, dans l'ordre de article_ids."""
+    articles = Article.objects.with_related().for_client(client_id).published().in_bulk(article_ids)
+    return [articles[article_id] for article_id in article_ids if article_id in articles]
@@ -1,7 +1,6 @@
-from django.db.models import Count, Max, Q
 from django.utils import timezone
 
-from box_management.models import Box, BoxSession, Deposit, LocationPoint
+from box_management.models import Box, BoxSession, LocationPoint
 
 
 def get_box_by_slug(box_slug):
@@ -21,15 +20,21 @@ def get_active_box_session(user, box):
     )
 
 
-def get_box_with_stats(slug):
+def get_box_for_preview(slug):
+    """Une lecture indexée (url unique) avec client et BoxStats joints."""
     return (
-        Box.objects.select_related("client")
+        Box.objects.select_related("client", "stats__last_deposit_song")
         .filter(url=slug)
-        .annotate(
-            deposit_count=Count("deposits", filter=Q(deposits__deposit_type=Deposit.DEPOSIT_TYPE_BOX)),
-            last_deposit_at=Max("deposits__deposited_at", filter=Q(deposits__deposit_type=Deposit.DEPOSIT_TYPE_BOX)),
+        .only(
+            "name",
+            "url",
+            "require_loc",
+            "client_id",
+            "client__slug",
+            "stats__deposit_count",
+            "stats__last_deposit_at",
+            "stats__last_deposit_song__image_url",
         )
-        .only("name", "url", "require_loc", "client__slug")
         .first()
     )
 
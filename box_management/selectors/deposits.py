@@ -1,6 +1,6 @@
 from django.db.models import Prefetch
 
-from box_management.models import Deposit, Reaction
+from box_management.models import Deposit, DiscoveredSong, Reaction
 
 
 def get_deposit_for_reveal(public_key):
@@ -15,6 +15,17 @@ def get_deposit_for_comment(public_key):
     return Deposit.objects.select_related("user", "box__client").filter(public_key=public_key).first()
 
 
+def is_revealed_for_user(deposit, user):
+    """Chanson visible pour user : son propre dépôt, favori/épinglé (toujours visible) ou déjà découverte."""
+    user_id = getattr(user, "id", None)
+    return bool(
+        getattr(deposit, "user_id", None) == user_id
+        or getattr(deposit, "deposit_type", Deposit.DEPOSIT_TYPE_BOX)
+        in (Deposit.DEPOSIT_TYPE_FAVORITE, Deposit.DEPOSIT_TYPE_PINNED)
+        or DiscoveredSong.objects.filter(user_id=user_id, deposit_id=deposit.id).exists()
+    )
+
+
 def get_deposit_with_reactions(deposit_id):
     return (
         Deposit.objects.filter(pk=deposit_id)
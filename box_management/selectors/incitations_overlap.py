@@ -1,3 +1,6 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
 from box_management.models import IncitationPhrase
 
 
@@ -15,10 +18,32 @@ def get_incitation_overlap_queryset(*, client_id, start_date, end_date, exclude_
 
 
 def build_incitation_overlap_counts(phrases):
+    """
+    Nombre d'autres phrases du même client chevauchant chaque phrase, sans requête.
+    Pour chaque client, les débuts et fins triés donnent en O(n log n) le nombre de phrases qui
+    commencent avant la fin de la phrase, moins celles déjà terminées avant son début.
+    `phrases` doit contenir toutes les phrases des clients concernés.
+    """
     phrases = list(phrases or [])
+    by_client = defaultdict(list)
     counts = {}
     for phrase in phrases:
-        counts[getattr(phrase, "id", None)] = phrase.get_overlap_count() if getattr(phrase, "id", None) else 0
+        phrase_id = getattr(phrase, "id", None)
+        if not phrase_id:
+            counts[phrase_id] = 0
+        elif phrase.client_id and phrase.start_date and phrase.end_date:
+            by_client[phrase.client_id].append(phrase)
+        else:
+            counts[phrase_id] = 0
+
+    for client_phrases in by_client.values():
+        starts = sorted(phrase.start_date for phrase in client_phrases)
+        ends = sorted(phrase.end_date for phrase in client_phrases)
+        for phrase in client_phrases:
+            started_before_end = bisect_right(starts, phrase.end_date)
+            ended_before_start = bisect_left(ends, phrase.start_date)
+            # La phrase elle-même est comptée dans started_before_end (start ≤ end).
+            counts[phrase.id] = started_before_end - ended_before_start - 1
     return counts
 
 
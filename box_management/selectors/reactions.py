@@ -0,0 +1,58 @@
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from box_management.models import Reaction
+
+
+def _active_reactions_for_deposits(deposit_ids):
+    return Reaction.objects.filter(deposit_id__in=list(deposit_ids), emoji__active=True)
+
+
+def get_reaction_counts_by_deposit(deposit_ids):
+    rows = (
+        _active_reactions_for_deposits(deposit_ids)
+        .values("deposit_id", "emoji__char")
+        .annotate(count=Count("id"))
+        .order_by("deposit_id", "-count", "emoji__char")
+    )
+    counts_by_deposit = {}
+    for row in rows:
+        counts_by_deposit.setdefault(row["deposit_id"], []).append({"emoji": row["emoji__char"], "count": row["count"]})
+    return counts_by_deposit
+
+
+def get_first_reactions_by_deposit(deposit_ids, limit):
+    ranked = (
+        _active_reactions_for_deposits(deposit_ids)
+        .select_related("emoji", "user")
+        .annotate(
+            rank=Window(
+                expression=RowNumber(),
+                partition_by=[F("deposit_id")],
+                order_by=[F("created_at").asc(), F("id").asc()],
+            )
+        )
+        .filter(rank__lte=int(limit))
+        .order_by("deposit_id", "created_at", "id")
+    )
+    reactions_by_deposit = {}
+    for reaction in ranked:
+        reactions_by_deposit.setdefault(reaction.deposit_id, []).append(reaction)
+    return reactions_by_deposit
+
+
+def get_viewer_reactions_by_deposit(viewer_id, deposit_ids):
+    if not viewer_id:
+        return {}
+    return dict(
+        _active_reactions_for_deposits(deposit_ids).filter(user_id=viewer_id).values_list("deposit_id", "emoji__char")
+    )
+
+
+def get_deposit_reactions_page(deposit_id, *, emoji_char=None, limit, offset):
+    qs = _active_reactions_for_deposits([deposit_id]).select_related("emoji", "user")
+    if emoji_char:
+        qs = qs.filter(emoji__char=emoji_char)
+    total = qs.count()
+    items = list(qs.order_by("created_at", "id")[offset : offset + limit])
+    return items, total
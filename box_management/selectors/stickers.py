@@ -1,5 +1,21 @@
+from django.db.models import Count, Q
+
 from box_management.models import Sticker
 
+STICKER_LIGHT_FIELDS = (
+    "id",
+    "slug",
+    "status",
+    "is_active",
+    "qr_generated_at",
+    "downloaded_at",
+    "assigned_at",
+    "created_at",
+    "box_id",
+    "box__name",
+    "box__url",
+)
+
 
 def get_client_sticker_by_slug(*, client_id, slug):
     return Sticker.objects.select_related("client", "box").filter(client_id=client_id, slug=slug).first()
@@ -17,3 +33,49 @@ def get_client_stickers_by_ids(*, client_id, sticker_ids):
     )
     by_id = {s.id: s for s in stickers}
     return [by_id[sid] for sid in sticker_ids if sid in by_id]
+
+
+def filter_client_stickers(*, client_id, search="", status_filter="all"):
+    stickers_qs = Sticker.objects.filter(client_id=client_id)
+    if search:
+        stickers_qs = stickers_qs.filter(
+            Q(slug__icontains=search) | Q(box__name__icontains=search) | Q(box__url__icontains=search)
+        )
+
+    if status_filter and status_filter != "all":
+        if status_filter == "never_generated":
+            stickers_qs = stickers_qs.filter(qr_generated_at__isnull=True)
+        elif status_filter == "never_downloaded":
+            stickers_qs = stickers_qs.filter(downloaded_at__isnull=True)
+        elif status_filter == "assigned":
+            stickers_qs = stickers_qs.filter(box__isnull=False)
+        elif status_filter == "unassigned":
+            stickers_qs = stickers_qs.filter(box__isnull=True)
+        elif status_filter == "inactive":
+            stickers_qs = stickers_qs.filter(is_active=False)
+        else:
+            stickers_qs = stickers_qs.filter(status=status_filter)
+    return stickers_qs.order_by("-created_at", "-id")
+
+
+def get_client_sticker_counts(*, client_id):
+    return Sticker.objects.filter(client_id=client_id).aggregate(
+        all=Count("id"),
+        never_generated=Count("id", filter=Q(qr_generated_at__isnull=True)),
+        never_downloaded=Count("id", filter=Q(downloaded_at__isnull=True)),
+        assigned=Count("id", filter=Q(box__isnull=False)),
+        unassigned=Count("id", filter=Q(box__isnull=True)),
+        inactive=Count("id", filter=Q(is_active=False)),
+    )
+
+
+def get_client_stickers_keyset_page(stickers_qs, *, limit, after=None, light=False):
+    """Page triée (-created_at, -id) à partir du dernier élément vu : coût constant quelle que soit la profondeur."""
+    if after:
+        created_at, sticker_id = after
+        stickers_qs = stickers_qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=sticker_id))
+    if light:
+        rows = list(stickers_qs.values(*STICKER_LIGHT_FIELDS)[: limit + 1])
+    else:
+        rows = list(stickers_qs.select_related("client", "box")[: limit + 1])
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+
+from django.utils import timezone
+from rest_framework import status
+
+from box_management.domain.constants import (
+    CLIENT_STATS_CACHE_TTL_SECONDS,
+    CLIENT_STATS_DEFAULT_DAYS,
+    CLIENT_STATS_MAX_DAYS,
+)
+from box_management.selectors.analytics import (
+    get_client_box_daily_stats,
+    get_client_boxes_for_stats,
+    get_deposit_rollup_watermark,
+)
+from la_boite_a_son.cache import get_or_compute
+
+CLIENT_STATS_CACHE_NAMESPACE = "client-admin-stats"
+
+STATS_METRICS = (
+    ("deposits", "deposit_count"),
+    ("depositors", "depositor_count"),
+    ("reveals", "reveal_count"),
+    ("reactions", "reaction_count"),
+    ("comments", "comment_count"),
+)
+# Les déposants uniques ne s'additionnent pas d'un jour à l'autre : pas de total.
+STATS_SUMMED_METRICS = tuple(key for key, _field in STATS_METRICS if key != "depositors")
+
+
+def _range_error(detail):
+    return {"status": status.HTTP_400_BAD_REQUEST, "code": "STATS_RANGE_INVALID", "detail": detail}
+
+
+def resolve_stats_range(raw_from, raw_to, *, today=None):
+    today = today or timezone.localdate()
+    try:
+        date_to = date.fromisoformat(raw_to) if raw_to else today
+        date_from = date.fromisoformat(raw_from) if raw_from else date_to - timedelta(days=CLIENT_STATS_DEFAULT_DAYS - 1)
+    except ValueError:
+        return None, _range_error("Dates attendues au format AAAA-MM-JJ.")
+    if date_from > date_to:
+        return None, _range_error("La date de début doit précéder la date de fin.")
+    if (date_to - date_from).days + 1 > CLIENT_STATS_MAX_DAYS:
+        return None, _range_error(f"Période limitée à {CLIENT_STATS_MAX_DAYS} jours.")
+    return (date_from, date_to), None
+
+
+def build_client_stats_cache_parts(client_id, date_from, date_to, watermark):
+    # updated_at avance à chaque rollup, y compris --include-today qui réécrit la journée en cours
+    # sans déplacer last_day : pleine précision pour distinguer deux passages dans la même seconde.
+    version = f"{watermark['last_day']}:{watermark['updated_at'].isoformat()}" if watermark else "none"
+    return (client_id, date_from.isoformat(), date_to.isoformat(), version)
+
+
+def _empty_totals():
+    return {key: 0 for key in STATS_SUMMED_METRICS}
+
+
+def compute_client_stats(*, client_id, date_from, date_to):
+    boxes = {}
+    for box in get_client_boxes_for_stats(client_id=client_id):
+        boxes[box["id"]] = {"id": box["id"], "name": box["name"], "slug": box["url"], "days": [], "totals": _empty_totals()}
+
+    totals = _empty_totals()
+    for row in get_client_box_daily_stats(client_id=client_id, date_from=date_from, date_to=date_to):
+        box = boxes.get(row["box_id"])
+        if box is None:
+            continue
+        day = {"day": row["day"].isoformat()}
+        day.update({key: row[field] for key, field in STATS_METRICS})
+        box["days"].append(day)
+        for key in STATS_SUMMED_METRICS:
+            box["totals"][key] += day[key]
+            totals[key] += day[key]
+    return {"boxes": list(boxes.values()), "totals": totals}
+
+
+def get_client_stats_payload(*, client_id, raw_from=None, raw_to=None):
+    """
+    Lit uniquement les agrégats quotidiens (BoxDailyStats), jamais les tables sources.
+    Le cache est indexé sur (client, période, watermark) : tout rollup, y compris celui de
+    la journée en cours, change la clé.
+    """
+    date_range, error = resolve_stats_range(raw_from, raw_to)
+    if error:
+        return None, error
+    date_from, date_to = date_range
+
+    watermark = get_deposit_rollup_watermark()
+
+    def compute():
+        return {
+            "from": date_from.isoformat(),
+            "to": date_to.isoformat(),
+            "rolled_up_through": watermark["last_day"].isoformat() if watermark and watermark["last_day"] else None,
+            **compute_client_stats(client_id=client_id, date_from=date_from, date_to=date_to),
+        }
+
+    payload = get_or_compute(
+        CLIENT_STATS_CACHE_NAMESPACE,
+        build_client_stats_cache_parts(client_id, date_from, date_to, watermark),
+        compute,
+        CLIENT_STATS_CACHE_TTL_SECONDS,
+    )
+    return payload, None
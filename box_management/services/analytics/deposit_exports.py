@@ -0,0 +1,93 @@
+import csv
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Count
+from django.db.models.functions import TruncDay
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _EchoBuffer:
+    """Pseudo-fichier pour csv.writer : writerow renvoie directement la ligne encodée."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv_lines(header, rows):
+    writer = csv.writer(_EchoBuffer())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def build_csv_streaming_response(filename, header, rows):
+    response = StreamingHttpResponse(iter_csv_lines(header, rows), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def month_label(day):
+    return day.strftime("%Y-%m")
+
+
+def week_label(day):
+    return (day - timedelta(days=day.weekday())).strftime("%Y-%W")
+
+
+def day_label(day):
+    return day.strftime("%Y-%m-%d")
+
+
+def iter_daily_deposit_counts(queryset, *group_fields):
+    """
+    Unique passe groupée sur les dépôts sélectionnés : (champs..., jour, nombre) triés, lus par paquets.
+    Les granularités mois/semaine se déduisent des jours sans relire la table.
+    """
+    rows = (
+        queryset.order_by()
+        .annotate(day=TruncDay("deposited_at"))
+        .values(*group_fields, "day")
+        .annotate(count=Count("id"))
+        .order_by(*group_fields, "day")
+    )
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield tuple(row[field] for field in group_fields), row["day"], row["count"]
+
+
+def iter_deposits_global_rows(queryset):
+    by_day = []
+    by_month = defaultdict(int)
+    by_week = defaultdict(int)
+    for (box_name,), day, count in iter_daily_deposit_counts(queryset, "box__name"):
+        by_day.append((box_name, day_label(day), count))
+        by_month[(box_name, month_label(day))] += count
+        by_week[(box_name, week_label(day))] += count
+    for (box_name, period), count in by_month.items():
+        yield [box_name, period, count]
+    for (box_name, period), count in by_week.items():
+        yield [box_name, period, count]
+    for box_name, period, count in by_day:
+        yield [box_name, period, count]
+
+
+def iter_deposits_distribution_rows(queryset):
+    for (box_name,), day, count in iter_daily_deposit_counts(queryset, "box__name"):
+        yield [box_name, week_label(day), day_label(day), count]
+
+
+def iter_active_users_rows(queryset):
+    by_week = defaultdict(int)
+    for (username, box_name), day, count in iter_daily_deposit_counts(
+        queryset.filter(user__isnull=False), "user__username", "box__name"
+    ):
+        by_week[(username, box_name, month_label(day), week_label(day))] += count
+    for (username, box_name, month, week), count in by_week.items():
+        yield [username, box_name, month, week, count]
+
+
+def iter_popular_songs_rows(queryset):
+    for (title, box_name), day, count in iter_daily_deposit_counts(queryset, "song__title", "box__name"):
+        yield [title, box_name, month_label(day), week_label(day), day_label(day), count]
@@ -0,0 +1,131 @@
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Count, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from box_management.domain.constants import DEPOSIT_ROLLUP_WATERMARK
+from box_management.models import (
+    AnalyticsWatermark,
+    BoxDailyStats,
+    Comment,
+    Deposit,
+    DiscoveredSong,
+    Reaction,
+    SongDailyStats,
+    UserDailyStats,
+)
+
+ROLLUP_BATCH_SIZE = 1000
+
+
+def local_day_bounds(start_day, end_day):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def _bulk_insert(model, rows):
+    inserted = 0
+    rows = iter(rows)
+    while True:
+        batch = [model(**row) for row in islice(rows, ROLLUP_BATCH_SIZE)]
+        if not batch:
+            return inserted
+        model.objects.bulk_create(batch)
+        inserted += len(batch)
+
+
+def _box_activity_counts(queryset, timestamp_field, start, end):
+    rows = (
+        queryset.filter(**{f"{timestamp_field}__gte": start, f"{timestamp_field}__lt": end}, deposit__box__isnull=False)
+        .order_by()
+        .annotate(day=TruncDate(timestamp_field))
+        .values("deposit__box_id", "day")
+        .annotate(count=Count("id"))
+    )
+    return {(row["deposit__box_id"], row["day"]): row["count"] for row in rows.iterator(chunk_size=ROLLUP_BATCH_SIZE)}
+
+
+def build_box_daily_rows(deposits, start, end):
+    """Fusionne dépôts, révélations, réactions et commentaires publiés par (box, jour) ; un dict par groupe, pas par ligne source."""
+    rows = {}
+    box_deposits = (
+        deposits.filter(box__isnull=False)
+        .values("box_id", "day")
+        .annotate(deposit_count=Count("id"), depositor_count=Count("user_id", distinct=True))
+    )
+    for row in box_deposits.iterator(chunk_size=ROLLUP_BATCH_SIZE):
+        rows[(row["box_id"], row["day"])] = {**row, "reveal_count": 0, "reaction_count": 0, "comment_count": 0}
+
+    activities = (
+        ("reveal_count", DiscoveredSong.objects.all(), "discovered_at"),
+        ("reaction_count", Reaction.objects.all(), "created_at"),
+        ("comment_count", Comment.objects.filter(status=Comment.STATUS_PUBLISHED), "created_at"),
+    )
+    for field, queryset, timestamp_field in activities:
+        for (box_id, day), count in _box_activity_counts(queryset, timestamp_field, start, end).items():
+            row = rows.setdefault(
+                (box_id, day),
+                {"box_id": box_id, "day": day, "deposit_count": 0, "depositor_count": 0, "reveal_count": 0, "reaction_count": 0, "comment_count": 0},
+            )
+            row[field] = count
+    return rows.values()
+
+
+def rollup_deposit_days(start_day, end_day):
+    """
+    Recalcule les rollups quotidiens (jours locaux) de start_day à end_day inclus.
+    Idempotent : les lignes des jours traités sont remplacées, une requête groupée par source.
+    """
+    start, end = local_day_bounds(start_day, end_day)
+    deposits = Deposit.objects.filter(deposited_at__gte=start, deposited_at__lt=end).order_by().annotate(day=TruncDate("deposited_at"))
+
+    with transaction.atomic():
+        for model in (BoxDailyStats, SongDailyStats, UserDailyStats):
+            model.objects.filter(day__gte=start_day, day__lte=end_day).delete()
+
+        song_rows = deposits.values("song_id", "box_id", "day").annotate(deposit_count=Count("id"))
+        user_rows = deposits.filter(user__isnull=False).values("user_id", "box_id", "day").annotate(deposit_count=Count("id"))
+
+        return {
+            "boxes": _bulk_insert(BoxDailyStats, build_box_daily_rows(deposits, start, end)),
+            "songs": _bulk_insert(SongDailyStats, song_rows.iterator(chunk_size=ROLLUP_BATCH_SIZE)),
+            "users": _bulk_insert(UserDailyStats, user_rows.iterator(chunk_size=ROLLUP_BATCH_SIZE)),
+        }
+
+
+def get_first_deposit_day():
+    first = Deposit.objects.aggregate(first=Min("deposited_at"))["first"]
+    return timezone.localdate(first) if first else None
+
+
+def run_incremental_deposit_rollup(*, today=None, include_today=False, rebuild=False):
+    """
+    Traite uniquement les jours complets postérieurs au watermark, puis l'avance à hier.
+    `include_today` recalcule aussi la journée en cours sans déplacer le watermark, mais
+    en rafraîchit updated_at : les statistiques en cache qui incluent aujourd'hui changent de clé.
+    """
+    today = today or timezone.localdate()
+    yesterday = today - timedelta(days=1)
+    watermark, _created = AnalyticsWatermark.objects.get_or_create(name=DEPOSIT_ROLLUP_WATERMARK)
+
+    start_day = None if rebuild or not watermark.last_day else watermark.last_day + timedelta(days=1)
+    if start_day is None:
+        start_day = get_first_deposit_day()
+
+    summary = {"start_day": None, "end_day": None, "boxes": 0, "songs": 0, "users": 0}
+    if start_day and start_day <= yesterday:
+        summary.update(rollup_deposit_days(start_day, yesterday), start_day=start_day, end_day=yesterday)
+        watermark.last_day = yesterday
+        watermark.save(update_fields=["last_day", "updated_at"])
+
+    if include_today:
+        today_counts = rollup_deposit_days(today, today)
+        for key, value in today_counts.items():
+            summary[key] += value
+        watermark.save(update_fields=["updated_at"])
+    return summary
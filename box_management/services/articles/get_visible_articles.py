@@ -1,7 +1,8 @@
 from rest_framework import status
 
-from box_management.selectors.articles import get_visible_article_by_id, get_visible_articles_for_client
+from box_management.selectors.articles import get_articles_by_ids
 from box_management.selectors.boxes import get_box_by_slug
+from box_management.services.articles.visibility import get_visible_article_ids_for_client
 
 
 def resolve_box_for_articles(box_slug):
@@ -25,7 +26,8 @@ def get_visible_articles(*, box_slug, limit):
         return {"box": None, "items": []}, None
 
     limit = max(1, min(limit, 20))
-    return {"box": box, "items": list(get_visible_articles_for_client(client_id=box.client_id, limit=limit))}, None
+    article_ids = get_visible_article_ids_for_client(box.client_id)[:limit]
+    return {"box": box, "items": get_articles_by_ids(client_id=box.client_id, article_ids=article_ids)}, None
 
 
 def get_visible_article_detail(*, box_slug, article_id):
@@ -39,7 +41,9 @@ def get_visible_article_detail(*, box_slug, article_id):
             "detail": "Article introuvable.",
         }
 
-    article = get_visible_article_by_id(client_id=box.client_id, article_id=article_id)
+    article = None
+    if article_id in get_visible_article_ids_for_client(box.client_id):
+        article = next(iter(get_articles_by_ids(client_id=box.client_id, article_ids=[article_id])), None)
     if not article:
         return None, {
             "status": status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,96 @@
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from box_management.domain.constants import (
+    VISIBLE_ARTICLES_CACHE_MAX_TTL_SECONDS,
+    VISIBLE_ARTICLES_CACHE_NAMESPACE,
+)
+from box_management.models import Article
+from la_boite_a_son.cache import make_cache_key
+
+ARTICLE_SCHEDULE_FIELDS = (
+    "id",
+    "status",
+    "published_at",
+    "created_at",
+    "display_start_date",
+    "display_end_date",
+    "display_start_time",
+    "display_end_time",
+)
+
+
+def _local_datetime(day, at_time):
+    return timezone.make_aware(datetime.combine(day, at_time), timezone.get_current_timezone())
+
+
+def _next_daily_occurrence(local_now, at_time, offset):
+    minute = at_time.replace(second=0, microsecond=0)
+    for day in (local_now.date(), local_now.date() + timedelta(days=1)):
+        candidate = _local_datetime(day, minute) + offset
+        if candidate > local_now:
+            return candidate
+    return None
+
+
+def get_article_visibility_changes(article, local_now):
+    """
+    Prochains instants où is_visible_now peut basculer. La fenêtre horaire est comparée à la minute
+    (heure courante tronquée) : un début à 10:00:30 ouvre à 10:01, une fin à 18:00:30 ferme à 18:01.
+    """
+    today = local_now.date()
+    changes = []
+    if article.display_start_date and article.display_start_date > today:
+        changes.append(_local_datetime(article.display_start_date, time.min))
+    if article.display_end_date and article.display_end_date >= today:
+        changes.append(_local_datetime(article.display_end_date + timedelta(days=1), time.min))
+
+    start_time, end_time = article.display_start_time, article.display_end_time
+    if start_time:
+        opens_late = bool(start_time.second or start_time.microsecond)
+        changes.append(_next_daily_occurrence(local_now, start_time, timedelta(minutes=1 if opens_late else 0)))
+    if end_time:
+        changes.append(_next_daily_occurrence(local_now, end_time, timedelta(minutes=1)))
+    return [change for change in changes if change and change > local_now]
+
+
+def build_visible_article_schedule(articles, at=None):
+    """Renvoie (ids visibles, dans l'ordre de la liste publique ; prochain changement de visibilité ou None)."""
+    local_now = Article.normalize_local_datetime(at)
+    visible = [article for article in articles if article.is_visible_now(at=local_now)]
+    # Même ordre que order_by("-published_at", "-created_at") : published_at NULL en dernier.
+    visible.sort(
+        key=lambda article: (article.published_at is not None, article.published_at or article.created_at, article.created_at),
+        reverse=True,
+    )
+
+    changes = [change for article in articles for change in get_article_visibility_changes(article, local_now)]
+    return [article.id for article in visible], min(changes, default=None)
+
+
+def get_visible_article_ids_for_client(client_id, at=None):
+    """
+    Ids des articles visibles d'un client. La liste est mise en cache jusqu'au prochain instant où
+    un article publié change de visibilité (plafonné) ; tout save/delete d'article l'invalide.
+    """
+    local_now = Article.normalize_local_datetime(at)
+    now_ts = local_now.timestamp()
+    key = make_cache_key(VISIBLE_ARTICLES_CACHE_NAMESPACE, client_id)
+
+    entry = cache.get(key)
+    if entry and entry["computed_at"] <= now_ts < entry["valid_until"]:
+        return entry["ids"]
+
+    articles = list(Article.objects.for_client(client_id).published().only(*ARTICLE_SCHEDULE_FIELDS))
+    ids, next_change = build_visible_article_schedule(articles, at=local_now)
+    valid_until = now_ts + VISIBLE_ARTICLES_CACHE_MAX_TTL_SECONDS
+    if next_change is not None:
+        valid_until = min(valid_until, next_change.timestamp())
+    cache.set(
+        key,
+        {"ids": ids, "computed_at": now_ts, "valid_until": valid_until},
+        max(1, int(valid_until - now_ts) + 1),
+    )
+    return ids
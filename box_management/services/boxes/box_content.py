@@ -1,8 +1,9 @@
-from django.db.models import Prefetch, Q
+from django.db.models import Q
 from django.utils.dateparse import parse_datetime
 
-from box_management.builders.deposit_payloads import build_deposits_payload
-from box_management.models import Deposit, DiscoveredSong, Reaction
+from box_management.builders.deposit_payloads import build_deposits_payload, normalize_reactions_mode
+from box_management.domain.constants import REACTIONS_MODE_FULL
+from box_management.models import Deposit, DiscoveredSong
 from box_management.services.boxes.session_helpers import get_active_box_session_context
 from box_management.services.pinned.pricing import get_active_pinned_deposit_for_box
 
@@ -15,20 +16,11 @@ class InvalidOlderDepositsCursor(ValueError):
 
 
 def _box_deposits_queryset(box):
-    return (
-        Deposit.objects.filter(box=box, deposit_type=Deposit.DEPOSIT_TYPE_BOX)
-        .select_related("song", "box", "user")
-        .prefetch_related(
-            Prefetch(
-                "reactions",
-                queryset=Reaction.objects.select_related("emoji", "user").order_by("created_at", "id"),
-                to_attr="prefetched_reactions",
-            )
-        )
-    )
+    # Réactions non préchargées : build_deposits_payload ne les charge que pour les dépôts absents du mémo.
+    return Deposit.objects.filter(box=box, deposit_type=Deposit.DEPOSIT_TYPE_BOX).select_related("song", "box", "user")
 
 
-def _serialize_one_deposit(deposit, *, viewer, force_revealed=False):
+def _serialize_one_deposit(deposit, *, viewer, force_revealed=False, reactions_mode=REACTIONS_MODE_FULL):
     if not deposit:
         return None
     force_song_infos_for = [deposit.pk] if force_revealed else None
@@ -37,13 +29,14 @@ def _serialize_one_deposit(deposit, *, viewer, force_revealed=False):
         viewer=viewer,
         include_user=True,
         force_song_infos_for=force_song_infos_for,
+        reactions_mode=reactions_mode,
     )
     return payloads[0] if payloads else None
 
 
-def serialize_active_pinned_deposit_for_box(box, *, viewer):
+def serialize_active_pinned_deposit_for_box(box, *, viewer, reactions_mode=REACTIONS_MODE_FULL):
     active_pinned = get_active_pinned_deposit_for_box(box)
-    return _serialize_one_deposit(active_pinned, viewer=viewer, force_revealed=True)
+    return _serialize_one_deposit(active_pinned, viewer=viewer, force_revealed=True, reactions_mode=reactions_mode)
 
 
 def build_older_deposits_cursor(deposit):
@@ -96,9 +89,12 @@ def _older_than_filter(deposited_at, deposit_id):
     )
 
 
-def get_older_deposits_page(box, user, session, cursor=None, limit=OLDER_DEPOSITS_PAGE_SIZE):
+def get_older_deposits_page(
+    box, user, session, cursor=None, limit=OLDER_DEPOSITS_PAGE_SIZE, reactions_mode=REACTIONS_MODE_FULL
+):
     page_limit = _coerce_older_deposits_limit(limit)
     cursor_value = parse_older_deposits_cursor(cursor)
+    reactions_mode = normalize_reactions_mode(reactions_mode)
 
     if cursor_value:
         cursor_deposited_at, cursor_id = cursor_value
@@ -128,13 +124,14 @@ def get_older_deposits_page(box, user, session, cursor=None, limit=OLDER_DEPOSIT
             page_deposits,
             viewer=user,
             include_user=True,
+            reactions_mode=reactions_mode,
         ),
         "next_cursor": next_cursor,
         "has_more": has_more,
     }
 
 
-def get_box_content(request, box_slug):
+def get_box_content(request, box_slug, reactions_mode=REACTIONS_MODE_FULL):
     context, error = get_active_box_session_context(request, box_slug)
     if error:
         return None, error
@@ -142,9 +139,12 @@ def get_box_content(request, box_slug):
     user = context["user"]
     box = context["box"]
     session = context["session"]
+    reactions_mode = normalize_reactions_mode(reactions_mode)
 
     main_deposit = _get_main_deposit_for_session(box, session)
-    older_page = get_older_deposits_page(box, user, session, limit=OLDER_DEPOSITS_PAGE_SIZE)
+    older_page = get_older_deposits_page(
+        box, user, session, limit=OLDER_DEPOSITS_PAGE_SIZE, reactions_mode=reactions_mode
+    )
 
     if main_deposit:
         DiscoveredSong.objects.get_or_create(
@@ -155,12 +155,16 @@ def get_box_content(request, box_slug):
 
     return {
         "boxSlug": box.slug,
-        "main": _serialize_one_deposit(main_deposit, viewer=user, force_revealed=True),
+        "main": _serialize_one_deposit(main_deposit, viewer=user, force_revealed=True, reactions_mode=reactions_mode),
         "older_deposits": older_page["older_deposits"],
         "older_deposits_next_cursor": older_page["next_cursor"],
         "older_deposits_has_more": older_page["has_more"],
-        "active_pinned_deposit": serialize_active_pinned_deposit_for_box(box, viewer=user),
-        "my_deposit": _serialize_one_deposit(session.deposit, viewer=user, force_revealed=True),
+        "active_pinned_deposit": serialize_active_pinned_deposit_for_box(
+            box, viewer=user, reactions_mode=reactions_mode
+        ),
+        "my_deposit": _serialize_one_deposit(
+            session.deposit, viewer=user, force_revealed=True, reactions_mode=reactions_mode
+        ),
         "successes": (
             session.deposit_successes
             if session.deposit_id and isinstance(session.deposit_successes, list)
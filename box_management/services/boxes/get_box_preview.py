@@ -1,10 +1,35 @@
 from django.contrib.humanize.templatetags.humanize import naturaltime
+from django.core.exceptions import ObjectDoesNotExist
 from django.utils.timezone import localtime
 from rest_framework import status
 
-from box_management.models import Deposit
-from box_management.selectors.boxes import get_box_with_stats
+from box_management.domain.constants import BOX_PREVIEW_CACHE_NAMESPACE, BOX_PREVIEW_CACHE_TTL_SECONDS
+from box_management.selectors.boxes import get_box_for_preview
 from box_management.services.boxes.incitations import get_current_incitation_for_box
+from la_boite_a_son.cache import get_or_compute
+
+
+def _load_box_preview(box_slug):
+    box = get_box_for_preview(box_slug)
+    if not box:
+        return None
+
+    try:
+        stats = box.stats
+    except ObjectDoesNotExist:
+        stats = None
+    current_incitation = get_current_incitation_for_box(box)
+    last_song = stats.last_deposit_song if stats and stats.last_deposit_at else None
+    return {
+        "slug": box.slug,
+        "name": box.name,
+        "client_slug": box.client.slug if box.client else None,
+        "require_loc": bool(getattr(box, "require_loc", True)),
+        "deposit_count": stats.deposit_count if stats else 0,
+        "last_deposit_at": stats.last_deposit_at if stats else None,
+        "last_deposit_song_image_url": last_song.image_url if last_song else None,
+        "search_incitation_text": current_incitation.text if current_incitation else None,
+    }
 
 
 def get_box_preview(box_slug):
@@ -16,29 +41,22 @@ def get_box_preview(box_slug):
             "detail": "boxSlug manquant.",
         }
 
-    box = get_box_with_stats(box_slug)
-    if not box:
+    # Mis en cache brut (TTL court, invalidé au dépôt et aux changements d'incitation) ;
+    # la date relative est recalculée à chaque réponse.
+    cached = get_or_compute(
+        BOX_PREVIEW_CACHE_NAMESPACE,
+        (box_slug,),
+        lambda: _load_box_preview(box_slug),
+        BOX_PREVIEW_CACHE_TTL_SECONDS,
+    )
+    if not cached:
         return None, {
             "status": status.HTTP_404_NOT_FOUND,
             "code": "BOX_NOT_FOUND",
             "detail": "Désolé. Cette boîte n'existe pas.",
         }
 
-    last_deposit = (
-        box.deposits.filter(deposit_type=Deposit.DEPOSIT_TYPE_BOX)
-        .select_related("song")
-        .order_by("-deposited_at")
-        .first()
-    )
-
-    current_incitation = get_current_incitation_for_box(box)
-    return {
-        "slug": box.slug,
-        "name": box.name,
-        "client_slug": box.client.slug if box.client else None,
-        "require_loc": bool(getattr(box, "require_loc", True)),
-        "deposit_count": box.deposit_count,
-        "last_deposit_date": naturaltime(localtime(box.last_deposit_at)) if box.last_deposit_at else None,
-        "last_deposit_song_image_url": last_deposit.song.image_url if last_deposit and last_deposit.song else None,
-        "search_incitation_text": current_incitation.text if current_incitation else None,
-    }, None
+    preview = dict(cached)
+    last_deposit_at = preview.pop("last_deposit_at")
+    preview["last_deposit_date"] = naturaltime(localtime(last_deposit_at)) if last_deposit_at else None
+    return preview, None
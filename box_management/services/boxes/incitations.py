@@ -1,14 +1,11 @@
 from django.utils.timezone import localdate
 
+from box_management.domain.constants import CURRENT_INCITATION_CACHE_NAMESPACE
 from box_management.models import IncitationPhrase
+from la_boite_a_son.cache import get_or_compute, seconds_until_local_midnight
 
 
-def get_current_incitation_for_box(box, at_date=None):
-    client_id = getattr(box, "client_id", None)
-    if not client_id:
-        return None
-
-    current_date = at_date or localdate()
+def _load_current_incitation(client_id, current_date):
     return (
         IncitationPhrase.objects.for_client(client_id)
         .active_on_date(current_date)
@@ -17,4 +14,23 @@ def get_current_incitation_for_box(box, at_date=None):
     )
 
 
+def get_current_incitation_for_box(box, at_date=None):
+    client_id = getattr(box, "client_id", None)
+    if not client_id:
+        return None
+
+    today = localdate()
+    current_date = at_date or today
+    if current_date != today:
+        return _load_current_incitation(client_id, current_date)
+
+    # La réponse ne change qu'à minuit (heure locale) ou à l'édition d'une phrase (invalidation au save/delete).
+    return get_or_compute(
+        CURRENT_INCITATION_CACHE_NAMESPACE,
+        (client_id, current_date.isoformat()),
+        lambda: _load_current_incitation(client_id, current_date),
+        seconds_until_local_midnight(),
+    )
+
+
 __all__ = ["get_current_incitation_for_box"]
@@ -0,0 +1,94 @@
+"""
+Compteurs anti-abus des commentaires (limite quotidienne par cible, cooldown).
+
+Les valeurs vivent dans le cache partagé et ne sont recalculées en base qu'en cas d'absence
+(premier commentaire du jour, éviction, redémarrage) ; record_comment_created les tient à jour
+après chaque création, sans requête supplémentaire.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from box_management.domain.constants import (
+    COMMENT_ANTI_ABUSE_CACHE_MAX_TTL_SECONDS,
+    COMMENT_COOLDOWN_SECONDS,
+    COMMENT_DAILY_TARGET_CACHE_NAMESPACE,
+    COMMENT_LAST_AT_CACHE_NAMESPACE,
+)
+from box_management.models import Comment
+from la_boite_a_son.cache import make_cache_key, seconds_until_local_midnight
+
+
+def _local_day_bounds(day):
+    current_tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, time.min), current_tz)
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min), current_tz)
+    return start, end
+
+
+def _daily_target_key(user_id, client_id, target_user_id, day):
+    return make_cache_key(COMMENT_DAILY_TARGET_CACHE_NAMESPACE, user_id, client_id, target_user_id, day.isoformat())
+
+
+def _last_comment_key(user_id):
+    return make_cache_key(COMMENT_LAST_AT_CACHE_NAMESPACE, user_id)
+
+
+def get_daily_target_comment_count(*, user_id, client_id, target_user_id, now=None):
+    """Commentaires de l'utilisateur sur les dépôts de target_user_id aujourd'hui (heure locale)."""
+    now = now or timezone.now()
+    day = timezone.localdate(now)
+    key = _daily_target_key(user_id, client_id, target_user_id, day)
+    count = cache.get(key)
+    if count is not None:
+        return int(count)
+
+    # Plage [minuit, minuit suivant[ plutôt que created_at__date : l'index sur created_at reste utilisable.
+    start, end = _local_day_bounds(day)
+    count = Comment.objects.filter(
+        user_id=user_id,
+        client_id=client_id,
+        deposit_owner_user_id=target_user_id,
+        created_at__gte=start,
+        created_at__lt=end,
+    ).count()
+    cache.add(key, count, seconds_until_local_midnight(now))
+    return int(cache.get(key, count))
+
+
+def get_last_comment_at(user_id):
+    key = _last_comment_key(user_id)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached or None
+
+    last_at = (
+        Comment.objects.filter(user_id=user_id).order_by("-created_at").values_list("created_at", flat=True).first()
+    )
+    # "" mémorise l'absence de commentaire : l'utilisateur sans historique ne repasse pas par la base.
+    cache.add(key, last_at or "", COMMENT_ANTI_ABUSE_CACHE_MAX_TTL_SECONDS)
+    return last_at
+
+
+def is_comment_cooldown_active(user_id, now=None):
+    last_at = get_last_comment_at(user_id)
+    if not last_at:
+        return False
+    return last_at >= (now or timezone.now()) - timedelta(seconds=COMMENT_COOLDOWN_SECONDS)
+
+
+def record_comment_created(comment):
+    """Met à jour les compteurs après création, sans relire la base."""
+    cache.set(_last_comment_key(comment.user_id), comment.created_at, COMMENT_ANTI_ABUSE_CACHE_MAX_TTL_SECONDS)
+
+    target_user_id = comment.deposit_owner_user_id
+    if not target_user_id or target_user_id == comment.user_id:
+        return
+    day = timezone.localdate(comment.created_at)
+    try:
+        cache.incr(_daily_target_key(comment.user_id, comment.client_id, target_user_id, day))
+    except ValueError:
+        # Compteur absent (jamais lu ou évincé) : il sera recompté en base au prochain contrôle.
+        pass
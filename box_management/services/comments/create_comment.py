@@ -1,12 +1,7 @@
-from datetime import timedelta
-
 from django.db import transaction
-from django.utils import timezone
-from django.utils.timezone import localdate
 from rest_framework import status
 
 from box_management.domain.constants import (
-    COMMENT_COOLDOWN_SECONDS,
     COMMENT_REASON_EMPTY,
     COMMENT_REASON_RATE_LIMIT,
     COMMENT_REASON_RESTRICTED,
@@ -16,12 +11,18 @@ from box_management.domain.constants import (
 )
 from box_management.models import Comment, CommentModerationDecision, Deposit
 from box_management.selectors.deposits import get_deposit_for_comment
+from box_management.services.comments.anti_abuse import (
+    get_daily_target_comment_count,
+    is_comment_cooldown_active,
+    record_comment_created,
+)
 from box_management.services.comments.moderation_rules import (
     _detect_comment_pre_creation_error,
     get_active_comment_restrictions_for_clients,
     get_profile_picture_url,
     _log_blocked_comment_attempt,
     normalize_comment_text,
+    scan_comment_text,
     _score_comment_risk,
 )
 from box_management.services.deposits.song_creation import create_song_deposit
@@ -63,7 +64,8 @@ def create_comment(*, user, dep_public_key, text_value, song_option, author_ip,
         )
         return None, {"reason_code": COMMENT_REASON_RESTRICTED, "status": status.HTTP_403_FORBIDDEN}
 
-    pre_creation_error = _detect_comment_pre_creation_error(text_value) if has_text else None
+    scan = scan_comment_text(text_value, normalized_text=normalized_text) if has_text else None
+    pre_creation_error = _detect_comment_pre_creation_error(text_value, scan=scan) if has_text else None
     if pre_creation_error:
         _log_blocked_comment_attempt(
             client=client,
@@ -78,9 +80,9 @@ def create_comment(*, user, dep_public_key, text_value, song_option, author_ip,
         return None, {"reason_code": pre_creation_error, "status": status.HTTP_400_BAD_REQUEST}
 
     if deposit.user_id and deposit.user_id != user.id:
-        daily_target_count = Comment.objects.filter(
-            user=user, client=client, deposit_owner_user_id=deposit.user_id, created_at__date=localdate()
-        ).count()
+        daily_target_count = get_daily_target_comment_count(
+            user_id=user.id, client_id=getattr(client, "id", None), target_user_id=deposit.user_id
+        )
         if daily_target_count >= COMMENT_TARGET_USER_DAILY_LIMIT:
             _log_blocked_comment_attempt(
                 client=client,
@@ -98,8 +100,7 @@ def create_comment(*, user, dep_public_key, text_value, song_option, author_ip,
                 "status": status.HTTP_403_FORBIDDEN,
             }
 
-    recent_cutoff = timezone.now() - timedelta(seconds=COMMENT_COOLDOWN_SECONDS)
-    if Comment.objects.filter(user=user, created_at__gte=recent_cutoff).exists():
+    if is_comment_cooldown_active(user.id):
         _log_blocked_comment_attempt(
             client=client,
             deposit=deposit,
@@ -112,7 +113,7 @@ def create_comment(*, user, dep_public_key, text_value, song_option, author_ip,
         )
         return None, {"reason_code": COMMENT_REASON_RATE_LIMIT, "status": status.HTTP_429_TOO_MANY_REQUESTS}
 
-    risk_score, risk_flags = _score_comment_risk(text=text_value, normalized_text=normalized_text)
+    risk_score, risk_flags = _score_comment_risk(text=text_value, normalized_text=normalized_text, scan=scan)
     comment_status = Comment.STATUS_PUBLISHED
     reason_code = ""
     if risk_score >= 70:
@@ -163,6 +164,8 @@ def create_comment(*, user, dep_public_key, text_value, song_option, author_ip,
             "detail": "Chanson invalide.",
         }
 
+    record_comment_created(comment)
+
     if comment_status == Comment.STATUS_QUARANTINED:
         CommentModerationDecision.objects.create(
             comment=comment,
@@ -1,57 +1,25 @@
-import re
 from collections.abc import Iterable
+from datetime import timedelta
 from typing import Any
 
+from django.core.cache import cache
 from django.db.models import Q
 from django.utils import timezone
 
 from box_management.domain.constants import (
-    COMMENT_REASON_DOXXING,
-    COMMENT_REASON_EMAIL_FORBIDDEN,
+    COMMENT_ANTI_ABUSE_CACHE_MAX_TTL_SECONDS,
     COMMENT_REASON_EMPTY,
-    COMMENT_REASON_HARASSMENT,
-    COMMENT_REASON_LINK_FORBIDDEN,
-    COMMENT_REASON_PHONE_FORBIDDEN,
-    COMMENT_REASON_SPAM,
     COMMENT_REASON_TOO_LONG,
+    COMMENT_RESTRICTION_CACHE_NAMESPACE,
 )
 from box_management.models import Client, CommentAttemptLog, CommentUserRestriction, Deposit
+from la_boite_a_son.cache import make_cache_key
+from la_boite_a_son.moderation import ModerationScan, normalize_moderation_text, scan_text
+from la_boite_a_son.write_buffer import buffered_create
 from users.models import CustomUser
 
 COMMENT_MAX_LENGTH = 100
 
-_COMMENT_URL_RE = re.compile(
-    r"(?:https?://|www\.|\b[a-z0-9.-]+\.(?:fr|com|net|org|io|gg|be|de|es|co|app|ly)\b)",
-    re.IGNORECASE,
-)
-_COMMENT_EMAIL_RE = re.compile(r"\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b")
-_COMMENT_PHONE_RE = re.compile(r"(?:\+?\d[\d\s().-]{7,}\d)")
-_COMMENT_SPAM_REPEAT_RE = re.compile(r"(.)\1{5,}")
-_COMMENT_SYMBOL_RE = re.compile(r"[^\w\sÀ-ÿ]")
-_COMMENT_INSULT_PATTERNS = [
-    re.compile(pattern, re.IGNORECASE)
-    for pattern in [
-        r"\bconnard(?:e)?s?\b",
-        r"\bfdp\b",
-        r"\bencul[ée]s?\b",
-        r"\bta gueule\b",
-        r"\bnique ta m[èe]re\b",
-        r"\bsale con(?:ne)?\b",
-        r"\bsalope\b",
-        r"\bb[âa]tard\b",
-    ]
-]
-_COMMENT_DOXX_PATTERNS = [
-    re.compile(pattern, re.IGNORECASE)
-    for pattern in [
-        r"\bon sait o[uù] tu habites\b",
-        r"\bton adresse\b",
-        r"\bton num[ée]ro\b",
-        r"\bje vais venir chez toi\b",
-        r"\bon va venir chez toi\b",
-    ]
-]
-
 
 def is_full_comment_user(user: CustomUser | None) -> bool:
     return bool(user and getattr(user, "id", None) and not getattr(user, "is_guest", False))
@@ -67,67 +35,25 @@ def get_profile_picture_url(user: CustomUser | None) -> str | None:
 
 
 def normalize_comment_text(value: str | None) -> str:
-    value = str(value or "")
-    value = value.replace("​", "").replace("‌", "").replace("‍", "")
-    value = re.sub(r"\s+", " ", value).strip()
-    value = value.lower()
-    return value
+    return normalize_moderation_text(value)
 
 
-def _extract_digits_count(value: str | None) -> int:
-    return len(re.sub(r"\D", "", str(value or "")))
+def scan_comment_text(text: str | None, normalized_text: str | None = None) -> ModerationScan:
+    """Un seul passage du moteur de modération ; le résultat sert au blocage et au score de risque."""
+    return scan_text(text, normalized_text=normalized_text)
 
 
-def _contains_forbidden_phone(value: str | None) -> bool:
-    text = str(value or "")
-    if not _COMMENT_PHONE_RE.search(text):
-        return False
-    return _extract_digits_count(text) >= 8
-
-
-def _detect_comment_pre_creation_error(text: str):
+def _detect_comment_pre_creation_error(text: str, scan: ModerationScan | None = None):
     if not text:
         return COMMENT_REASON_EMPTY
     if len(text) > COMMENT_MAX_LENGTH:
         return COMMENT_REASON_TOO_LONG
-    if _COMMENT_URL_RE.search(text):
-        return COMMENT_REASON_LINK_FORBIDDEN
-    if _COMMENT_EMAIL_RE.search(text):
-        return COMMENT_REASON_EMAIL_FORBIDDEN
-    if _contains_forbidden_phone(text):
-        return COMMENT_REASON_PHONE_FORBIDDEN
-    return None
-
+    return (scan or scan_comment_text(text)).blocking_flag
 
-def _score_comment_risk(*, text: str, normalized_text: str):
-    score = 0
-    flags = []
 
-    if _COMMENT_SPAM_REPEAT_RE.search(normalized_text):
-        score += 50
-        flags.append(COMMENT_REASON_SPAM)
-
-    if len(normalized_text) >= 24 and len(set(normalized_text)) <= 4:
-        score += 30
-        flags.append("low_variation")
-
-    if _COMMENT_SYMBOL_RE.findall(text) and len(_COMMENT_SYMBOL_RE.findall(text)) >= 8:
-        score += 15
-        flags.append("symbol_noise")
-
-    for pattern in _COMMENT_INSULT_PATTERNS:
-        if pattern.search(normalized_text):
-            score += 70
-            flags.append(COMMENT_REASON_HARASSMENT)
-            break
-
-    for pattern in _COMMENT_DOXX_PATTERNS:
-        if pattern.search(normalized_text):
-            score += 95
-            flags.append(COMMENT_REASON_DOXXING)
-            break
-
-    return min(score, 100), list(dict.fromkeys(flags))
+def _score_comment_risk(*, text: str, normalized_text: str, scan: ModerationScan | None = None):
+    scan = scan or scan_comment_text(text, normalized_text=normalized_text)
+    return scan.score, list(scan.risk_flags)
 
 
 def _log_blocked_comment_attempt(
@@ -143,23 +69,48 @@ def _log_blocked_comment_attempt(
     meta: dict[str, Any] | None = None,
 ):
     target_owner = getattr(deposit, "user", None) if deposit else None
-    CommentAttemptLog.objects.create(
-        client=client,
-        deposit=deposit,
-        user=user,
-        deposit_public_key=getattr(deposit, "public_key", "") or "",
-        target_owner_user_id=getattr(target_owner, "id", None),
-        target_owner_username=getattr(target_owner, "username", "") or "",
-        text=(text or "")[:COMMENT_MAX_LENGTH],
-        normalized_text=(normalized_text or "")[:160],
-        reason_code=reason_code,
-        meta=meta or {},
-        author_ip=author_ip,
-        author_user_agent=(author_user_agent or "")[:255],
+    buffered_create(
+        CommentAttemptLog(
+            client=client,
+            deposit=deposit,
+            user=user,
+            deposit_public_key=getattr(deposit, "public_key", "") or "",
+            target_owner_user_id=getattr(target_owner, "id", None),
+            target_owner_username=getattr(target_owner, "username", "") or "",
+            text=(text or "")[:COMMENT_MAX_LENGTH],
+            normalized_text=(normalized_text or "")[:160],
+            reason_code=reason_code,
+            meta=meta or {},
+            author_ip=author_ip,
+            author_user_agent=(author_user_agent or "")[:255],
+        )
     )
 
 
+def _load_comment_restriction_entries(user_id, client_ids, now_dt):
+    restrictions = (
+        CommentUserRestriction.objects.filter(user_id=user_id, client_id__in=client_ids)
+        .filter(Q(ends_at__isnull=True) | Q(ends_at__gt=now_dt))
+        .order_by("client_id", "-created_at", "-id")
+    )
+    grouped = {client_id: [] for client_id in client_ids}
+    for restriction in restrictions:
+        grouped[restriction.client_id].append(restriction)
+
+    entries = {}
+    for client_id, client_restrictions in grouped.items():
+        active = next((r for r in client_restrictions if r.starts_at <= now_dt), None)
+        # L'entrée reste valable jusqu'à la fin de la restriction active ou au début de la suivante.
+        boundaries = [now_dt + timedelta(seconds=COMMENT_ANTI_ABUSE_CACHE_MAX_TTL_SECONDS)]
+        boundaries += [r.starts_at for r in client_restrictions if r.starts_at > now_dt]
+        if active and active.ends_at:
+            boundaries.append(active.ends_at)
+        entries[client_id] = {"restriction": active, "valid_until": min(boundaries)}
+    return entries
+
+
 def get_active_comment_restrictions_for_clients(user: CustomUser | None, client_ids: Iterable[int]):
+    """Restriction active par client, mise en cache par (utilisateur, client) jusqu'à son prochain changement."""
     if not is_full_comment_user(user):
         return {}
 
@@ -168,16 +119,27 @@ def get_active_comment_restrictions_for_clients(user: CustomUser | None, client_
         return {}
 
     now_dt = timezone.now()
-    restrictions = (
-        CommentUserRestriction.objects.filter(user_id=user.id, client_id__in=clean_client_ids, starts_at__lte=now_dt)
-        .filter(Q(ends_at__isnull=True) | Q(ends_at__gt=now_dt))
-        .order_by("client_id", "-created_at", "-id")
-    )
+    keys = {cid: make_cache_key(COMMENT_RESTRICTION_CACHE_NAMESPACE, user.id, cid) for cid in clean_client_ids}
+    cached = cache.get_many(list(keys.values()))
 
-    by_client = {}
-    for restriction in restrictions:
-        by_client.setdefault(restriction.client_id, restriction)
-    return by_client
+    entries = {}
+    missing_client_ids = []
+    for client_id, key in keys.items():
+        entry = cached.get(key)
+        if entry and entry["valid_until"] > now_dt:
+            entries[client_id] = entry
+        else:
+            missing_client_ids.append(client_id)
+
+    if missing_client_ids:
+        loaded = _load_comment_restriction_entries(user.id, missing_client_ids, now_dt)
+        entries.update(loaded)
+        cache.set_many(
+            {keys[client_id]: entry for client_id, entry in loaded.items()},
+            COMMENT_ANTI_ABUSE_CACHE_MAX_TTL_SECONDS,
+        )
+
+    return {client_id: entry["restriction"] for client_id, entry in entries.items() if entry["restriction"]}
 
 
 __all__ = [
@@ -187,5 +149,6 @@ __all__ = [
     "get_profile_picture_url",
     "_log_blocked_comment_attempt",
     "normalize_comment_text",
+    "scan_comment_text",
     "_score_comment_risk",
 ]
@@ -1,10 +1,8 @@
-from datetime import timedelta
 from typing import Any
 
-from django.utils import timezone
-from django.utils.timezone import localdate, localtime
+from django.utils.timezone import localdate
 
-from box_management.models import Deposit, Song
+from box_management.models import Deposit, Song, SongBoxPresence, UserBoxStats
 from la_boite_a_son.economy import (
     NB_POINTS_ADD_SONG,
     NB_POINTS_CONSECUTIVE_DAYS_BOX,
@@ -24,55 +22,29 @@ def build_successes(
     successes: dict[str, dict[str, Any]] = {}
     points_to_add = int(NB_POINTS_ADD_SONG)
 
-    def _compute_streak_from_dates(dates: list) -> int:
-        if not dates:
-            return 0
-
-        today = localdate()
-        target = today - timedelta(days=1)
-        streak = 0
-
-        seen_days: list = []
-        for dt in dates:
-            try:
-                d = localtime(dt).date()
-            except Exception:
-                d = timezone.localtime(dt).date()
-            if not seen_days or seen_days[-1] != d:
-                seen_days.append(d)
-
-        for d in seen_days:
-            if d == target:
-                streak += 1
-                target -= timedelta(days=1)
-            elif d < target:
-                break
-
-        return streak
-
-    exclude_current_filter: dict[str, Any] = {}
-    if current_deposit is not None and getattr(current_deposit, "pk", None):
-        exclude_current_filter["pk"] = current_deposit.pk
-
-    user_box_dates: list = []
+    # Les tables de résumé sont tenues à jour par le post_save de Deposit : le dépôt courant y est
+    # déjà compté, on le retire pour raisonner sur l'historique antérieur.
+    current_box_id = getattr(current_deposit, "box_id", None) if current_deposit is not None else None
+    current_counted = current_deposit is not None and getattr(current_deposit, "pk", None) is not None
+
+    nb_consecutive_days = 0
     has_user_deposit_in_box = False
     if user:
-        user_box_qs = Deposit.objects.filter(user=user, box=box)
-        if exclude_current_filter:
-            user_box_qs = user_box_qs.exclude(**exclude_current_filter)
-
-        user_box_dates = list(user_box_qs.order_by("-deposited_at").values_list("deposited_at", flat=True))
-        has_user_deposit_in_box = len(user_box_dates) > 0
+        user_box_stats = UserBoxStats.objects.filter(user=user, box=box).first()
+        if user_box_stats is not None:
+            own_deposit = int(current_counted and current_box_id == box.id and current_deposit.user_id == user.id)
+            has_user_deposit_in_box = user_box_stats.deposit_count - own_deposit > 0
+            nb_consecutive_days = user_box_stats.streak_before(localdate())
 
-    song_box_ids: list[int] = []
+    is_first_song_in_box = False
+    is_first_song_global = False
     if title and artist:
-        song_deposits_qs = Deposit.objects.filter(song=song)
-        if exclude_current_filter:
-            song_deposits_qs = song_deposits_qs.exclude(**exclude_current_filter)
-
-        song_box_ids = list(song_deposits_qs.values_list("box_id", flat=True))
+        in_box = SongBoxPresence.objects.filter(song=song, box=box).values_list("deposit_count", flat=True).first() or 0
+        if current_counted and current_deposit.song_id == song.id and current_box_id == box.id:
+            in_box -= 1
+        is_first_song_in_box = in_box <= 0
+        is_first_song_global = is_first_song_in_box and not SongBoxPresence.objects.filter(song=song).exclude(box=box).exists()
 
-    nb_consecutive_days = _compute_streak_from_dates(user_box_dates) if user else 0
     if nb_consecutive_days > 0:
         bonus = nb_consecutive_days * int(NB_POINTS_CONSECUTIVE_DAYS_BOX)
         points_to_add += bonus
@@ -92,10 +64,6 @@ def build_successes(
             "emoji": "🔍",
         }
 
-    is_first_song_in_box = False
-    if title and artist:
-        is_first_song_in_box = box.id not in song_box_ids
-
     if is_first_song_in_box:
         points_to_add += int(NB_POINTS_FIRST_SONG_DEPOSIT_BOX)
         successes["first_song_deposit"] = {
@@ -105,10 +73,6 @@ def build_successes(
             "emoji": "🤠",
         }
 
-    is_first_song_global = False
-    if title and artist:
-        is_first_song_global = len(song_box_ids) == 0
-
     if is_first_song_global:
         points_to_add += int(NB_POINTS_FIRST_SONG_DEPOSIT_GLOBAL)
         successes["first_song_deposit_global"] = {
@@ -1,4 +1,3 @@
-import json
 from pathlib import Path
 from typing import Any
 
@@ -6,35 +5,32 @@ from django.db.models import Prefetch
 from django.utils import timezone
 
 from box_management.models import Deposit, Reaction
+from la_boite_a_son.json_config import JsonConfigFile, require_int, require_list, thaw
 
 PINNED_PRICE_STEPS_PATH = Path(__file__).resolve().parents[2] / "data" / "pinned_price_steps.json"
 
 
-def load_pinned_price_steps() -> list[dict[str, int]]:
-    try:
-        raw = json.loads(PINNED_PRICE_STEPS_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        raw = []
-
-    steps: list[dict[str, int]] = []
-    for item in raw if isinstance(raw, list) else []:
-        if not isinstance(item, dict):
-            continue
-        try:
-            minutes = int(item.get("minutes"))
-            points = int(item.get("points"))
-        except (TypeError, ValueError):
-            continue
-        if minutes <= 0 or points <= 0:
-            continue
-        steps.append({"minutes": minutes, "points": points})
-
+def parse_pinned_price_steps(raw) -> list[dict[str, int]]:
+    steps = []
+    for item in require_list(raw):
+        steps.append({"minutes": require_int(item, "minutes", minimum=1), "points": require_int(item, "points", minimum=1)})
+    minutes = [step["minutes"] for step in steps]
+    if len(set(minutes)) != len(minutes):
+        raise ValueError("durées d'épinglage en double")
     steps.sort(key=lambda entry: entry["minutes"])
     return steps
 
 
+PINNED_PRICE_STEPS_CONFIG = JsonConfigFile(PINNED_PRICE_STEPS_PATH, parse_pinned_price_steps)
+
+
+def load_pinned_price_steps():
+    """Paliers triés par durée, figés et partagés par tout le processus."""
+    return PINNED_PRICE_STEPS_CONFIG.get()
+
+
 def get_pinned_price_steps_raw() -> list[dict[str, int]]:
-    return load_pinned_price_steps()
+    return thaw(load_pinned_price_steps())
 
 
 def get_pinned_price_step(duration_minutes: int) -> dict[str, int] | None:
@@ -93,6 +89,7 @@ def get_active_pinned_deposit_for_box(box, *, for_update: bool = False):
 
 
 __all__ = [
+    "PINNED_PRICE_STEPS_CONFIG",
     "load_pinned_price_steps",
     "build_pinned_price_steps_payload",
     "get_active_pinned_deposit_for_box",
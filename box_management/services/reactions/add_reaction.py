@@ -1,8 +1,12 @@
 from django.db import transaction
 from rest_framework import status
 
-from box_management.models import Deposit, DiscoveredSong, Emoji, EmojiRight, Reaction
-from box_management.selectors.deposits import get_deposit_for_reaction, get_deposit_with_reactions
+from box_management.models import Emoji, EmojiRight, Reaction
+from box_management.selectors.deposits import (
+    get_deposit_for_reaction,
+    get_deposit_with_reactions,
+    is_revealed_for_user,
+)
 from users.models import CustomUser
 
 
@@ -11,13 +15,7 @@ def add_or_remove_reaction(*, user, dep_public_key, emoji_id):
     if not deposit:
         return None, {"status": status.HTTP_404_NOT_FOUND, "code": "DEPOSIT_NOT_FOUND", "detail": "Dépôt introuvable"}
 
-    is_revealed_for_user = bool(
-        getattr(deposit, "user_id", None) == getattr(user, "id", None)
-        or getattr(deposit, "deposit_type", Deposit.DEPOSIT_TYPE_BOX)
-        in (Deposit.DEPOSIT_TYPE_FAVORITE, Deposit.DEPOSIT_TYPE_PINNED)
-        or DiscoveredSong.objects.filter(user=user, deposit=deposit).exists()
-    )
-    if not is_revealed_for_user:
+    if not is_revealed_for_user(deposit, user):
         return None, {
             "status": status.HTTP_403_FORBIDDEN,
             "code": "DEPOSIT_NOT_REVEALED",
@@ -0,0 +1,47 @@
+from rest_framework import status
+
+from box_management.builders.deposit_payloads import build_reaction_item_from_instance
+from box_management.domain.constants import REACTIONS_MAX_PAGE_SIZE, REACTIONS_PAGE_SIZE
+from box_management.models import Deposit
+from box_management.selectors.deposits import is_revealed_for_user
+from box_management.selectors.reactions import get_deposit_reactions_page
+
+
+def _coerce_page_value(raw_value, default):
+    try:
+        return int(raw_value)
+    except (TypeError, ValueError):
+        return default
+
+
+def list_deposit_reactions(*, viewer, dep_public_key, emoji=None, limit=None, offset=None):
+    deposit = (
+        Deposit.objects.filter(public_key=(dep_public_key or "").strip()).only("id", "user_id", "deposit_type").first()
+    )
+    if not deposit:
+        return None, {"status": status.HTTP_404_NOT_FOUND, "code": "DEPOSIT_NOT_FOUND", "detail": "Dépôt introuvable"}
+
+    # Même règle que l'ajout d'une réaction : la liste des personnes qui ont réagi suppose la chanson révélée.
+    if not is_revealed_for_user(deposit, viewer):
+        return None, {
+            "status": status.HTTP_403_FORBIDDEN,
+            "code": "DEPOSIT_NOT_REVEALED",
+            "detail": "Révèle la chanson pour voir les réactions",
+        }
+
+    limit = _coerce_page_value(limit, REACTIONS_PAGE_SIZE)
+    offset = _coerce_page_value(offset, 0)
+    limit = REACTIONS_PAGE_SIZE if limit <= 0 else min(limit, REACTIONS_MAX_PAGE_SIZE)
+    offset = max(offset, 0)
+    emoji_char = (emoji or "").strip() or None
+
+    reactions, total = get_deposit_reactions_page(deposit.id, emoji_char=emoji_char, limit=limit, offset=offset)
+    next_offset = offset + len(reactions)
+    return {
+        "items": [build_reaction_item_from_instance(reaction) for reaction in reactions],
+        "count": total,
+        "limit": limit,
+        "offset": offset,
+        "has_more": next_offset < total,
+        "next_offset": next_offset,
+    }, None
@@ -1,24 +1,35 @@
-import base64
+import copy
 import io
+import logging
+import os
 import re
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
 import xml.etree.ElementTree as ET
 import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import status
 
-from box_management.models import ColorProfile, StickerTemplate
+from box_management.models import ColorProfile, Sticker, StickerTemplate
+
+logger = logging.getLogger(__name__)
 
 _QRCODE_MODULE = None
 _CAIROSVG_MODULE = None
 _PIL_IMAGE = None
 _PYPDF = None
+_WORKER_PREPARED_TEMPLATE = None
+_TEMPLATE_CACHE = {}
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+_TEMPLATE_CACHE_STATS = {"parses": 0, "hits": 0}
 
 DPI = 300
 PAPER_SIZES_MM = {
@@ -33,8 +44,30 @@ PAPER_SIZES_MM = {
 FILE_TYPES = {"png", "jpeg", "pdf"}
 ORIENTATIONS = {"portrait", "landscape"}
 PDF_COLOR_MODES = {"cmyk", "rgb"}
+PDF_ENGINE_INKSCAPE = "inkscape"
+PDF_ENGINE_CAIRO = "cairo"
+PDF_ENGINES = {PDF_ENGINE_INKSCAPE, PDF_ENGINE_CAIRO}
 SVG_NS = "http://www.w3.org/2000/svg"
 XLINK_NS = "http://www.w3.org/1999/xlink"
+STICKER_EXPORT_INLINE_MAX = 4
+STICKER_PDF_MIN_PAGES_PER_SESSION = 10
+INKSCAPE_SESSION_TIMEOUT_SECONDS = 60
+INKSCAPE_PAGE_TIMEOUT_SECONDS = 10
+STICKER_EXPORT_ERROR_DETAILS = {
+    "qrcode_missing": "L’export de stickers nécessite la dépendance Python qrcode côté serveur.",
+    "cairosvg_missing": "L’export de stickers nécessite la dépendance Python cairosvg côté serveur pour générer les PNG et JPEG.",
+    "cairosvg_system_missing": "L’export de stickers nécessite les bibliothèques système Cairo sur le serveur pour générer les PNG et JPEG.",
+    "inkscape_missing": "L’export PDF nécessite Inkscape côté serveur.",
+    "inkscape_failed": "La génération PDF via Inkscape a échoué.",
+    "inkscape_blank_pdf": "Inkscape a généré un PDF vide pour le sticker.",
+    "cairosvg_failed": "La génération PDF via cairosvg a échoué.",
+    "cairosvg_blank_pdf": "cairosvg a généré un PDF vide pour le sticker.",
+    "sticker_cmyk_profile_missing": "L’export CMYK nécessite un profil ICC CMYK configuré côté serveur.",
+    "sticker_cmyk_profile_unreadable": "Le profil ICC CMYK configuré est introuvable ou illisible.",
+    "ghostscript_missing": "L’export CMYK nécessite Ghostscript côté serveur.",
+    "ghostscript_failed": "La conversion CMYK a échoué.",
+    "pypdf_missing": "L’export PDF de stickers nécessite la dépendance Python pypdf côté serveur.",
+}
 ET.register_namespace("", SVG_NS)
 ET.register_namespace("xlink", XLINK_NS)
 
@@ -52,6 +85,7 @@ def validate_export_options(payload):
     paper_size = str(payload.get("paper_size") or "").strip().upper()
     orientation = str(payload.get("orientation") or "").strip().lower()
     color_mode = str(payload.get("color_mode") or "").strip().lower()
+    pdf_engine = str(payload.get("pdf_engine") or "").strip().lower()
     if file_type not in FILE_TYPES:
         return None, {"status": status.HTTP_400_BAD_REQUEST, "code": "STICKER_EXPORT_FILE_TYPE_INVALID", "detail": "Type de fichier invalide."}
     if paper_size not in PAPER_SIZES_MM:
@@ -62,9 +96,24 @@ def validate_export_options(payload):
         color_mode = color_mode or "cmyk"
         if color_mode not in PDF_COLOR_MODES:
             return None, {"status": status.HTTP_400_BAD_REQUEST, "code": "STICKER_EXPORT_COLOR_MODE_INVALID", "detail": "Espace couleur invalide."}
+        pdf_engine = pdf_engine or get_default_pdf_engine()
+        if pdf_engine not in PDF_ENGINES:
+            return None, {"status": status.HTTP_400_BAD_REQUEST, "code": "STICKER_EXPORT_PDF_ENGINE_INVALID", "detail": "Moteur PDF invalide."}
     else:
         color_mode = "rgb"
-    return {"file_type": file_type, "paper_size": paper_size, "orientation": orientation or "portrait", "color_mode": color_mode}, None
+        pdf_engine = ""
+    return {
+        "file_type": file_type,
+        "paper_size": paper_size,
+        "orientation": orientation or "portrait",
+        "color_mode": color_mode,
+        "pdf_engine": pdf_engine,
+    }, None
+
+
+def get_default_pdf_engine():
+    configured = str(getattr(settings, "STICKER_PDF_ENGINE", "") or "").strip().lower()
+    return configured if configured in PDF_ENGINES else PDF_ENGINE_INKSCAPE
 
 
 def resolve_client_sticker_template(client_id, template_id):
@@ -151,7 +200,41 @@ def get_svg_viewbox_size(root):
     return float(parts[2]), float(parts[3])
 
 
+def get_sticker_template_cache_key(template):
+    return template.updated_at, template.svg_file.name
+
+
 def load_sticker_template_with_zone(template):
+    """
+    Renvoie (root, zone, (largeur, hauteur)) depuis le cache de processus : une entrée par template,
+    remplacée dès que updated_at ou le fichier change. Le root est partagé, chaque rendu part d'une copie.
+    """
+    cache_key = get_sticker_template_cache_key(template)
+    with _TEMPLATE_CACHE_LOCK:
+        cached = _TEMPLATE_CACHE.get(template.pk)
+        if cached and cached[0] == cache_key:
+            _TEMPLATE_CACHE_STATS["hits"] += 1
+            return cached[1]
+    prepared = parse_sticker_template_with_zone(template)
+    with _TEMPLATE_CACHE_LOCK:
+        _TEMPLATE_CACHE_STATS["parses"] += 1
+        if template.pk is not None:
+            _TEMPLATE_CACHE[template.pk] = (cache_key, prepared)
+    return prepared
+
+
+def get_sticker_template_cache_stats():
+    with _TEMPLATE_CACHE_LOCK:
+        return {**_TEMPLATE_CACHE_STATS, "templates": len(_TEMPLATE_CACHE)}
+
+
+def clear_sticker_template_cache():
+    with _TEMPLATE_CACHE_LOCK:
+        _TEMPLATE_CACHE.clear()
+        _TEMPLATE_CACHE_STATS.update(parses=0, hits=0)
+
+
+def parse_sticker_template_with_zone(template):
     with template.svg_file.open("r") as svg_file:
         svg_text = svg_file.read()
     root = ET.fromstring(svg_text)
@@ -164,28 +247,54 @@ def load_sticker_template_with_zone(template):
     return root, zone, get_svg_viewbox_size(root)
 
 
-def generate_qr_png_bytes(content, *, size=1400):
+def generate_qr_matrix(content):
     qrcode_module = get_qrcode_module()
-    qr = qrcode_module.QRCode(version=None, error_correction=qrcode_module.constants.ERROR_CORRECT_Q, box_size=12, border=4)
+    qr = qrcode_module.QRCode(version=None, error_correction=qrcode_module.constants.ERROR_CORRECT_Q, border=4)
     qr.add_data(content)
     qr.make(fit=True)
-    image = qr.make_image(fill_color="black", back_color="white").convert("RGBA").resize((size, size))
-    buffer = io.BytesIO()
-    image.save(buffer, format="PNG")
-    return buffer.getvalue()
+    return qr.get_matrix()
+
+
+def build_qr_path_data(matrix):
+    # Une sous-commande par suite horizontale de modules noirs : le chemin reste compact.
+    commands = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < len(row):
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < len(row) and row[x]:
+                x += 1
+            commands.append(f"M{start} {y}h{x - start}v1h-{x - start}z")
+    return "".join(commands)
+
+
+def build_qr_svg_element(content, qr_zone):
+    matrix = generate_qr_matrix(content)
+    modules = len(matrix)
+    group = ET.Element(
+        f"{{{SVG_NS}}}g",
+        {
+            "id": "generated-qr",
+            "transform": f"translate({qr_zone['x']} {qr_zone['y']}) scale({qr_zone['width'] / modules} {qr_zone['height'] / modules})",
+            "shape-rendering": "crispEdges",
+        },
+    )
+    ET.SubElement(group, f"{{{SVG_NS}}}rect", {"width": str(modules), "height": str(modules), "fill": "#ffffff"})
+    ET.SubElement(group, f"{{{SVG_NS}}}path", {"d": build_qr_path_data(matrix), "fill": "#000000"})
+    return group
 
 
 def build_sticker_svg_bytes(sticker, template, absolute_sticker_url):
-    root, qr_zone, (svg_width, svg_height) = load_sticker_template_with_zone(template)
-    qr_png_base64 = base64.b64encode(generate_qr_png_bytes(absolute_sticker_url)).decode("ascii")
-    image_el = ET.Element(f"{{{SVG_NS}}}image")
-    for key in ("x", "y", "width", "height"):
-        image_el.set(key, str(qr_zone[key]))
-    image_el.set("id", "generated-qr")
-    image_el.set("preserveAspectRatio", "none")
-    image_el.set(f"{{{XLINK_NS}}}href", f"data:image/png;base64,{qr_png_base64}")
-    image_el.set("href", f"data:image/png;base64,{qr_png_base64}")
-    root.append(image_el)
+    return build_sticker_svg_bytes_from_prepared(load_sticker_template_with_zone(template), absolute_sticker_url)
+
+
+def build_sticker_svg_bytes_from_prepared(prepared_template, absolute_sticker_url):
+    template_root, qr_zone, (svg_width, svg_height) = prepared_template
+    root = copy.deepcopy(template_root)
+    root.append(build_qr_svg_element(absolute_sticker_url, qr_zone))
     return ET.tostring(root, encoding="utf-8", xml_declaration=True), svg_width, svg_height
 
 
@@ -196,8 +305,12 @@ def contained_pixel_size(svg_width, svg_height, paper_size):
 
 
 def render_sticker_image_bytes(sticker, template, absolute_sticker_url, *, paper_size, file_type):
+    return render_sticker_image_bytes_from_prepared(load_sticker_template_with_zone(template), absolute_sticker_url, paper_size=paper_size, file_type=file_type)
+
+
+def render_sticker_image_bytes_from_prepared(prepared_template, absolute_sticker_url, *, paper_size, file_type):
     cairosvg_module = get_cairosvg_module()
-    svg_bytes, svg_width, svg_height = build_sticker_svg_bytes(sticker, template, absolute_sticker_url)
+    svg_bytes, svg_width, svg_height = build_sticker_svg_bytes_from_prepared(prepared_template, absolute_sticker_url)
     out_w, out_h = contained_pixel_size(svg_width, svg_height, paper_size)
     png = cairosvg_module.svg2png(bytestring=svg_bytes, output_width=out_w, output_height=out_h)
     if file_type == "png":
@@ -217,27 +330,120 @@ def sticker_asset_basename(sticker):
 
 def mark_stickers_generated(stickers, now=None):
     now = now or timezone.now()
+    Sticker.objects.filter(id__in=[sticker.id for sticker in stickers]).mark_generated(at=now)
     for sticker in stickers:
         sticker.mark_generated(at=now)
-        sticker.save(update_fields=["qr_generated_at", "status", "updated_at", "assigned_at"])
+        sticker.updated_at = now
     return stickers
 
 
 def mark_stickers_downloaded(stickers, now=None):
     now = now or timezone.now()
+    Sticker.objects.filter(id__in=[sticker.id for sticker in stickers]).mark_downloaded(at=now)
     for sticker in stickers:
         sticker.mark_downloaded(at=now)
-        sticker.save(update_fields=["qr_generated_at", "downloaded_at", "status", "updated_at", "assigned_at"])
+        sticker.updated_at = now
     return stickers
 
 
+def get_sticker_export_max_workers():
+    configured = int(getattr(settings, "STICKER_EXPORT_MAX_WORKERS", 0) or 0)
+    if configured > 0:
+        return configured
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _init_sticker_render_worker(template_svg_bytes, qr_zone, svg_size):
+    global _WORKER_PREPARED_TEMPLATE
+    _WORKER_PREPARED_TEMPLATE = (ET.fromstring(template_svg_bytes), qr_zone, svg_size)
+
+
+def _render_sticker_in_worker(filename, absolute_sticker_url, paper_size, file_type):
+    return filename, render_sticker_image_bytes_from_prepared(_WORKER_PREPARED_TEMPLATE, absolute_sticker_url, paper_size=paper_size, file_type=file_type)
+
+
+def iter_rendered_sticker_images(jobs, prepared_template, *, paper_size, file_type, max_workers=None):
+    """
+    Rend les stickers (filename, url) et renvoie (filename, bytes) dans l'ordre de fin de rendu.
+    Au-delà de STICKER_EXPORT_INLINE_MAX, le rendu part dans un pool de processus dont chaque
+    worker parse le template une seule fois ; le nombre de rendus en vol est borné pour
+    garder la mémoire constante.
+    """
+    jobs = list(jobs)
+    max_workers = max_workers or get_sticker_export_max_workers()
+    if max_workers <= 1 or len(jobs) <= STICKER_EXPORT_INLINE_MAX:
+        for filename, url in jobs:
+            yield filename, render_sticker_image_bytes_from_prepared(prepared_template, url, paper_size=paper_size, file_type=file_type)
+        return
+
+    root, qr_zone, svg_size = prepared_template
+    initargs = (ET.tostring(root, encoding="utf-8"), qr_zone, svg_size)
+    pending_jobs = iter(jobs)
+    in_flight = set()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_sticker_render_worker, initargs=initargs) as executor:
+        for filename, url in pending_jobs:
+            in_flight.add(executor.submit(_render_sticker_in_worker, filename, url, paper_size, file_type))
+            if len(in_flight) >= max_workers * 2:
+                break
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_job = next(pending_jobs, None)
+                if next_job is not None:
+                    in_flight.add(executor.submit(_render_sticker_in_worker, *next_job, paper_size, file_type))
+
+
+class _ZipChunkBuffer:
+    """Flux d'écriture non seekable : zipfile y écrit, le générateur vide les octets au fil de l'eau."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        return None
+
+    def pop(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip_chunks(named_files):
+    buffer = _ZipChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, data in named_files:
+            archive.writestr(filename, data)
+            chunk = buffer.pop()
+            if chunk:
+                yield chunk
+    yield buffer.pop()
+
+
+def get_export_base_url(request):
+    return request.build_absolute_uri("/")
+
+
+def build_sticker_absolute_url(base_url, sticker):
+    return f"{base_url.rstrip('/')}/s/{sticker.slug}"
+
+
+def build_sticker_render_jobs(base_url, stickers, file_type):
+    return [(f"{sticker_asset_basename(sticker)}.{file_type}", build_sticker_absolute_url(base_url, sticker)) for sticker in stickers]
+
+
 def build_stickers_zip_response(request, stickers, *, template, paper_size, file_type):
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
-        for sticker in stickers:
-            image_bytes = render_sticker_image_bytes(sticker, template, request.build_absolute_uri(f"/s/{sticker.slug}"), paper_size=paper_size, file_type=file_type)
-            archive.writestr(f"{sticker_asset_basename(sticker)}.{file_type}", image_bytes)
-    response = HttpResponse(zip_buffer.getvalue(), content_type="application/zip")
+    # Dépendances et template vérifiés avant de streamer : les erreurs restent des réponses API.
+    get_qrcode_module()
+    get_cairosvg_module()
+    prepared_template = load_sticker_template_with_zone(template)
+    jobs = build_sticker_render_jobs(get_export_base_url(request), stickers, file_type)
+    rendered = iter_rendered_sticker_images(jobs, prepared_template, paper_size=paper_size, file_type=file_type)
+    response = StreamingHttpResponse(iter_zip_chunks(rendered), content_type="application/zip")
     response["Content-Disposition"] = f'attachment; filename="stickers-{paper_size.lower()}-{file_type}.zip"'
     return response
 
@@ -279,18 +485,91 @@ def build_pdf_wrapper_svg(sticker_svg_bytes, page_width_pt, page_height_pt):
     return ET.tostring(wrapper, encoding="utf-8", xml_declaration=True)
 
 
-def export_svg_to_pdf_with_inkscape(input_svg, output_pdf):
+def build_inkscape_shell_script(pages):
+    lines = [
+        f"file-open:{input_svg}; export-type:pdf; export-filename:{output_pdf}; export-text-to-path; export-do; file-close"
+        for input_svg, output_pdf in pages
+    ]
+    lines.append("quit")
+    return "\n".join(lines) + "\n"
+
+
+def _start_inkscape_shell(pages, script_path):
+    script_path.write_text(build_inkscape_shell_script(pages), encoding="utf-8")
+    with script_path.open("rb") as stdin:
+        return subprocess.Popen(["inkscape", "--shell"], stdin=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _wait_inkscape_session(process, page_count, started):
+    try:
+        returncode = process.wait(timeout=INKSCAPE_SESSION_TIMEOUT_SECONDS + INKSCAPE_PAGE_TIMEOUT_SECONDS * page_count)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        returncode = None
+    return returncode, time.monotonic() - started
+
+
+def export_svgs_to_pdf_with_inkscape(pages, *, max_sessions=None):
+    """
+    Exporte les pages (input_svg, output_pdf) via des sessions `inkscape --shell` lancées en parallèle :
+    chaque session traite un lot d'au moins STICKER_PDF_MIN_PAGES_PER_SESSION pages, le démarrage
+    d'Inkscape n'est donc payé qu'une fois par lot. Renvoie une entrée par session, dans l'ordre des
+    pages : {"pages": nombre de pages du lot, "seconds": durée réelle de la session}. Inkscape ne
+    rapporte pas de durée par page.
+    """
+    pages = [(Path(input_svg), Path(output_pdf)) for input_svg, output_pdf in pages]
+    if not pages:
+        return []
     if not shutil.which("inkscape"):
         raise RuntimeError("inkscape_missing")
-    try:
-        subprocess.run(
-            ["inkscape", str(input_svg), "--export-type=pdf", f"--export-filename={output_pdf}", "--export-text-to-path"],
-            check=True,
-            capture_output=True,
-            text=True,
+
+    max_sessions = max_sessions or get_sticker_export_max_workers()
+    session_count = max(1, min(max_sessions, len(pages) // STICKER_PDF_MIN_PAGES_PER_SESSION))
+    chunk_size = -(-len(pages) // session_count)
+    chunks = [pages[start : start + chunk_size] for start in range(0, len(pages), chunk_size)]
+
+    started = time.monotonic()
+    workdir = pages[0][1].parent
+    processes = [_start_inkscape_shell(chunk, workdir / f"inkscape-session-{index}.txt") for index, chunk in enumerate(chunks)]
+    # Attente concurrente : chaque session est chronométrée (et sa limite de temps appliquée) dès sa fin.
+    with ThreadPoolExecutor(max_workers=len(processes)) as executor:
+        results = list(
+            executor.map(lambda item: _wait_inkscape_session(item[0], len(item[1]), started), zip(processes, chunks))
         )
-    except subprocess.CalledProcessError as exc:
-        raise RuntimeError("inkscape_failed") from exc
+    sessions = [{"pages": len(chunk), "seconds": seconds} for chunk, (_returncode, seconds) in zip(chunks, results)]
+    failed = any(returncode != 0 for returncode, _seconds in results)
+
+    if failed or any(not output_pdf.is_file() or output_pdf.stat().st_size == 0 for _input_svg, output_pdf in pages):
+        raise RuntimeError("inkscape_failed")
+    return sessions
+
+
+def export_svg_to_pdf_with_inkscape(input_svg, output_pdf):
+    export_svgs_to_pdf_with_inkscape([(input_svg, output_pdf)], max_sessions=1)
+
+
+def export_svgs_to_pdf_with_cairosvg(pages):
+    """
+    Exporte chaque page (input_svg, output_pdf) en PDF vectoriel dans le processus, sans binaire externe.
+    Chaque page est sa propre session : les durées renvoyées sont donc réellement par page.
+    """
+    cairosvg = get_cairosvg_module()
+    sessions = []
+    for input_svg, output_pdf in pages:
+        started = time.monotonic()
+        try:
+            cairosvg.svg2pdf(bytestring=Path(input_svg).read_bytes(), write_to=str(output_pdf))
+        except (OSError, ValueError) as exc:
+            raise RuntimeError("cairosvg_failed") from exc
+        sessions.append({"pages": 1, "seconds": time.monotonic() - started})
+    return sessions
+
+
+def export_pdf_pages(pages, engine):
+    if engine == PDF_ENGINE_CAIRO:
+        return export_svgs_to_pdf_with_cairosvg(pages)
+    return export_svgs_to_pdf_with_inkscape(pages)
 
 
 def _pdf_stream_bytes(contents):
@@ -304,9 +583,12 @@ def _pdf_stream_bytes(contents):
 
 def assert_pdf_has_visible_content(pdf_path):
     PdfReader, _PdfWriter = get_pypdf_writer()
-    reader = PdfReader(str(pdf_path))
+    assert_pdf_reader_has_visible_content(PdfReader(str(pdf_path)))
+
+
+def assert_pdf_reader_has_visible_content(reader, blank_error="inkscape_blank_pdf"):
     if not reader.pages:
-        raise RuntimeError("inkscape_blank_pdf")
+        raise RuntimeError(blank_error)
     drawing_operators = {b"m", b"l", b"c", b"v", b"y", b"h", b"re", b"S", b"s", b"f", b"F", b"f*", b"B", b"B*", b"b", b"b*", b"Do", b"Tj", b"TJ", b"'", b'"'}
     for page in reader.pages:
         resources = page.get("/Resources")
@@ -315,30 +597,92 @@ def assert_pdf_has_visible_content(pdf_path):
         has_drawing_operator = any(token in drawing_operators for token in tokens)
         if content.strip() and (has_drawing_operator or (resources and resources.get_object())):
             return
-    raise RuntimeError("inkscape_blank_pdf")
+    raise RuntimeError(blank_error)
+
+
+def build_stickers_pdf_bytes(request, stickers, *, template, paper_size, orientation, engine=PDF_ENGINE_INKSCAPE):
+    return render_stickers_pdf_bytes(
+        get_export_base_url(request),
+        stickers,
+        template=template,
+        paper_size=paper_size,
+        orientation=orientation,
+        engine=engine,
+    )
 
 
-def build_stickers_pdf_bytes(request, stickers, *, template, paper_size, orientation):
+def render_stickers_pdf_bytes(
+    base_url,
+    stickers,
+    *,
+    template,
+    paper_size,
+    orientation,
+    engine=PDF_ENGINE_INKSCAPE,
+    progress_callback=None,
+    timings=None,
+):
+    """
+    Construit le PDF multi-pages : toutes les pages passent par le moteur choisi (sessions Inkscape
+    groupées ou cairosvg en processus), puis chaque PDF de page est lu une seule fois pour la
+    validation et la fusion.
+    Si `timings` est une liste, elle reçoit le détail par page : build_ms, merge_ms, et la session
+    d'export qui contient la page (export_session, export_session_ms). Avec Inkscape, une session
+    couvre plusieurs pages ; avec cairosvg, chaque page est une session.
+    """
     PdfReader, PdfWriter = get_pypdf_writer()
     width_mm, height_mm = PAPER_SIZES_MM[paper_size]
     if orientation == "landscape":
         width_mm, height_mm = height_mm, width_mm
     page_width_pt, page_height_pt = mm_to_pt(width_mm), mm_to_pt(height_mm)
     writer = PdfWriter()
+    started = time.monotonic()
+    cache_hits_before = get_sticker_template_cache_stats()["hits"]
     with tempfile.TemporaryDirectory() as tmp:
         tmp_path = Path(tmp)
+        pages = []
+        build_durations = []
         for index, sticker in enumerate(stickers):
-            sticker_svg, _w, _h = build_sticker_svg_bytes(sticker, template, request.build_absolute_uri(f"/s/{sticker.slug}"))
+            page_started = time.monotonic()
+            sticker_svg, _w, _h = build_sticker_svg_bytes(sticker, template, build_sticker_absolute_url(base_url, sticker))
             wrapper_svg_path = tmp_path / f"page-{index}.svg"
             page_pdf_path = tmp_path / f"page-{index}.pdf"
             wrapper_svg = build_pdf_wrapper_svg(sticker_svg, page_width_pt, page_height_pt)
             wrapper_svg_path.write_bytes(wrapper_svg)
-            export_svg_to_pdf_with_inkscape(wrapper_svg_path, page_pdf_path)
-            assert_pdf_has_visible_content(page_pdf_path)
-            for page in PdfReader(str(page_pdf_path)).pages:
+            pages.append((wrapper_svg_path, page_pdf_path))
+            build_durations.append(time.monotonic() - page_started)
+
+        export_sessions = export_pdf_pages(pages, engine)
+        page_sessions = [index for index, session in enumerate(export_sessions) for _ in range(session["pages"])]
+        blank_error = "cairosvg_blank_pdf" if engine == PDF_ENGINE_CAIRO else "inkscape_blank_pdf"
+
+        for index, (_wrapper_svg_path, page_pdf_path) in enumerate(pages):
+            page_started = time.monotonic()
+            reader = PdfReader(str(page_pdf_path))
+            assert_pdf_reader_has_visible_content(reader, blank_error)
+            for page in reader.pages:
                 writer.add_page(page)
+            if timings is not None:
+                timings.append(
+                    {
+                        "page": index + 1,
+                        "build_ms": round(build_durations[index] * 1000, 1),
+                        "export_session": page_sessions[index] + 1,
+                        "export_session_ms": round(export_sessions[page_sessions[index]]["seconds"] * 1000, 1),
+                        "merge_ms": round((time.monotonic() - page_started) * 1000, 1),
+                    }
+                )
+            if progress_callback:
+                progress_callback(index + 1)
         output = io.BytesIO()
         writer.write(output)
+    logger.info(
+        "sticker pdf export (%s): %s pages in %.1fs, %s template parses avoided",
+        engine,
+        len(pages),
+        time.monotonic() - started,
+        get_sticker_template_cache_stats()["hits"] - cache_hits_before,
+    )
     return output.getvalue()
 
 
@@ -385,18 +729,29 @@ def convert_pdf_to_cmyk_with_ghostscript(input_pdf, output_pdf, icc_profile_path
         raise RuntimeError("ghostscript_failed") from exc
 
 
-def build_stickers_pdf_response(request, stickers, *, template, paper_size, orientation, color_mode="cmyk"):
-    rgb_pdf_bytes = build_stickers_pdf_bytes(request, stickers, template=template, paper_size=paper_size, orientation=orientation)
-    pdf_bytes = rgb_pdf_bytes
-    if color_mode == "cmyk":
-        icc_profile_path = resolve_cmyk_icc_profile_path()
-        with tempfile.TemporaryDirectory() as tmp:
-            tmp_path = Path(tmp)
-            input_pdf = tmp_path / "stickers-rgb.pdf"
-            output_pdf = tmp_path / "stickers-cmyk.pdf"
-            input_pdf.write_bytes(rgb_pdf_bytes)
-            convert_pdf_to_cmyk_with_ghostscript(input_pdf, output_pdf, icc_profile_path)
-            pdf_bytes = output_pdf.read_bytes()
+def apply_pdf_color_mode(rgb_pdf_bytes, color_mode):
+    if color_mode != "cmyk":
+        return rgb_pdf_bytes
+    icc_profile_path = resolve_cmyk_icc_profile_path()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        input_pdf = tmp_path / "stickers-rgb.pdf"
+        output_pdf = tmp_path / "stickers-cmyk.pdf"
+        input_pdf.write_bytes(rgb_pdf_bytes)
+        convert_pdf_to_cmyk_with_ghostscript(input_pdf, output_pdf, icc_profile_path)
+        return output_pdf.read_bytes()
+
+
+def build_stickers_pdf_response(request, stickers, *, template, paper_size, orientation, color_mode="cmyk", pdf_engine=PDF_ENGINE_INKSCAPE):
+    rgb_pdf_bytes = build_stickers_pdf_bytes(
+        request,
+        stickers,
+        template=template,
+        paper_size=paper_size,
+        orientation=orientation,
+        engine=pdf_engine,
+    )
+    pdf_bytes = apply_pdf_color_mode(rgb_pdf_bytes, color_mode)
     response = HttpResponse(pdf_bytes, content_type="application/pdf")
     response["Content-Disposition"] = f'attachment; filename="stickers-{paper_size.lower()}.pdf"'
     return response
@@ -0,0 +1,254 @@
+import hashlib
+import json
+import logging
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+
+from box_management.domain.constants import STICKER_EXPORT_JOB_STALE_SECONDS
+from box_management.models import StickerExportJob
+from box_management.selectors.stickers import get_client_stickers_by_ids
+from box_management.services.stickers.export import (
+    PDF_ENGINE_INKSCAPE,
+    STICKER_EXPORT_ERROR_DETAILS,
+    apply_pdf_color_mode,
+    build_sticker_render_jobs,
+    get_cairosvg_module,
+    get_qrcode_module,
+    iter_rendered_sticker_images,
+    iter_zip_chunks,
+    load_sticker_template_with_zone,
+    render_stickers_pdf_bytes,
+)
+
+logger = logging.getLogger(__name__)
+
+STICKER_EXPORT_JOB_ERROR_DETAILS = {
+    **STICKER_EXPORT_ERROR_DETAILS,
+    "sticker_template_invalid": "Le template SVG sticker est invalide.",
+    "sticker_export_failed": "L’export de stickers a échoué.",
+    "sticker_export_stale": "L’export a été interrompu. Relance-le.",
+}
+REUSABLE_STATUSES = (StickerExportJob.STATUS_PENDING, StickerExportJob.STATUS_RUNNING, StickerExportJob.STATUS_DONE)
+
+
+def build_export_fingerprint(*, client_id, sticker_ids, template, options, base_url):
+    # Le template est identifié par sa version : un SVG remplacé invalide les artefacts existants.
+    raw = json.dumps(
+        {
+            "client_id": client_id,
+            "sticker_ids": list(sticker_ids),
+            "template_id": template.id,
+            "template_updated_at": template.updated_at.isoformat() if template.updated_at else None,
+            "options": options,
+            "base_url": base_url,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def fail_stale_export_job(job, now=None):
+    """
+    Un job running sans battement depuis STICKER_EXPORT_JOB_STALE_SECONDS a perdu son worker
+    (crash, redémarrage) : on le passe en échec pour qu'une nouvelle demande reparte de zéro.
+    """
+    now = now or timezone.now()
+    last_seen = job.heartbeat_at or job.started_at or job.created_at
+    stale_before = now - timedelta(seconds=STICKER_EXPORT_JOB_STALE_SECONDS)
+    if job.status != StickerExportJob.STATUS_RUNNING or last_seen >= stale_before:
+        return False
+    # Conditionnel sur heartbeat_at : un worker encore vivant qui vient de battre garde son job.
+    return bool(
+        StickerExportJob.objects.filter(
+            pk=job.pk, status=StickerExportJob.STATUS_RUNNING, heartbeat_at=job.heartbeat_at
+        ).update(status=StickerExportJob.STATUS_FAILED, error_code="sticker_export_stale", finished_at=now)
+    )
+
+
+def get_export_retention_cutoff(now=None):
+    hours = max(1, int(getattr(settings, "STICKER_EXPORT_RETENTION_HOURS", 72) or 72))
+    return (now or timezone.now()) - timedelta(hours=hours)
+
+
+def prune_expired_export_jobs(now=None):
+    """
+    Supprime les jobs terminés (done/failed) depuis plus de STICKER_EXPORT_RETENTION_HOURS,
+    avec leur artefact : chaque empreinte distincte écrit un nouveau fichier dans MEDIA_ROOT.
+    """
+    expired = StickerExportJob.objects.filter(
+        status__in=(StickerExportJob.STATUS_DONE, StickerExportJob.STATUS_FAILED),
+        finished_at__lt=get_export_retention_cutoff(now),
+    )
+    pruned = 0
+    for job in expired.iterator():
+        if job.artifact:
+            job.artifact.delete(save=False)
+        job.delete()
+        pruned += 1
+    return pruned
+
+
+def find_reusable_export_job(fingerprint):
+    now = timezone.now()
+    # Un job terminé hors rétention va être purgé avec son fichier : on ne le ressert plus.
+    jobs = (
+        StickerExportJob.objects.filter(fingerprint=fingerprint, status__in=REUSABLE_STATUSES)
+        .exclude(status=StickerExportJob.STATUS_DONE, finished_at__lt=get_export_retention_cutoff(now))
+        .order_by("-created_at", "-id")
+    )
+    for job in jobs:
+        if job.status == StickerExportJob.STATUS_RUNNING and fail_stale_export_job(job, now):
+            continue
+        if job.status != StickerExportJob.STATUS_DONE or job.has_artifact():
+            return job
+    return None
+
+
+def get_or_create_sticker_export_job(*, client_id, user, stickers, template, options, base_url):
+    sticker_ids = [sticker.id for sticker in stickers]
+    fingerprint = build_export_fingerprint(
+        client_id=client_id,
+        sticker_ids=sticker_ids,
+        template=template,
+        options=options,
+        base_url=base_url,
+    )
+    with transaction.atomic():
+        job = find_reusable_export_job(fingerprint)
+        if job:
+            return job, False
+        job = StickerExportJob.objects.create(
+            client_id=client_id,
+            requested_by=user,
+            template=template,
+            sticker_ids=sticker_ids,
+            options=options,
+            base_url=base_url,
+            fingerprint=fingerprint,
+            progress_total=len(sticker_ids),
+        )
+    return job, True
+
+
+def get_client_export_job(*, client_id, job_id):
+    job = StickerExportJob.objects.filter(client_id=client_id, id=job_id).first()
+    if not job:
+        return None, {
+            "status": status.HTTP_404_NOT_FOUND,
+            "code": "STICKER_EXPORT_JOB_NOT_FOUND",
+            "detail": "Export introuvable pour ce client.",
+        }
+    return job, None
+
+
+def build_export_artifact_name(options):
+    paper_size = str(options.get("paper_size") or "").lower()
+    if options.get("file_type") == "pdf":
+        return f"stickers-{paper_size}.pdf"
+    return f"stickers-{paper_size}-{options.get('file_type')}.zip"
+
+
+def claim_export_job(job):
+    now = timezone.now()
+    claimed = StickerExportJob.objects.filter(pk=job.pk, status=StickerExportJob.STATUS_PENDING).update(
+        status=StickerExportJob.STATUS_RUNNING,
+        started_at=now,
+        heartbeat_at=now,
+        progress_done=0,
+    )
+    if not claimed:
+        return False
+    job.refresh_from_db()
+    return True
+
+
+def _save_progress(job, done):
+    # Chaque avancement sert aussi de battement : le job n'est pas considéré comme abandonné.
+    job.progress_done = done
+    job.heartbeat_at = timezone.now()
+    StickerExportJob.objects.filter(pk=job.pk).update(progress_done=done, heartbeat_at=job.heartbeat_at)
+
+
+def _write_zip_artifact(job, stickers, output):
+    options = job.options
+    get_qrcode_module()
+    get_cairosvg_module()
+    prepared_template = load_sticker_template_with_zone(job.template)
+    jobs = build_sticker_render_jobs(job.base_url, stickers, options["file_type"])
+    rendered = iter_rendered_sticker_images(jobs, prepared_template, paper_size=options["paper_size"], file_type=options["file_type"])
+
+    def counted(named_files):
+        for done, named_file in enumerate(named_files, start=1):
+            yield named_file
+            _save_progress(job, done)
+
+    for chunk in iter_zip_chunks(counted(rendered)):
+        output.write(chunk)
+
+
+def _write_pdf_artifact(job, stickers, output):
+    options = job.options
+    rgb_pdf_bytes = render_stickers_pdf_bytes(
+        job.base_url,
+        stickers,
+        template=job.template,
+        paper_size=options["paper_size"],
+        orientation=options["orientation"],
+        engine=options.get("pdf_engine") or PDF_ENGINE_INKSCAPE,
+        progress_callback=lambda done: _save_progress(job, done),
+    )
+    output.write(apply_pdf_color_mode(rgb_pdf_bytes, options.get("color_mode")))
+
+
+def run_sticker_export_job(job):
+    """
+    Produit l'artefact d'un job réclamé (status running) dans MEDIA_ROOT.
+    Toute erreur passe le job en échec avec un code lisible par le polling, sans arrêter le worker.
+    """
+    started = time.monotonic()
+    stickers = get_client_stickers_by_ids(client_id=job.client_id, sticker_ids=job.sticker_ids)
+    artifact_name = build_export_artifact_name(job.options)
+    try:
+        with tempfile.TemporaryFile() as output:
+            if job.file_type == "pdf":
+                _write_pdf_artifact(job, stickers, output)
+            else:
+                _write_zip_artifact(job, stickers, output)
+            output.seek(0)
+            job.artifact.save(artifact_name, File(output), save=False)
+    except Exception as exc:
+        if isinstance(exc, RuntimeError) and str(exc) in STICKER_EXPORT_ERROR_DETAILS:
+            error_code = str(exc)
+        elif isinstance(exc, ValueError):
+            error_code = "sticker_template_invalid"
+        else:
+            error_code = "sticker_export_failed"
+            logger.exception("sticker export job %s crashed", job.pk)
+        job.status = StickerExportJob.STATUS_FAILED
+        job.error_code = error_code
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error_code", "finished_at"])
+        return job
+
+    job.status = StickerExportJob.STATUS_DONE
+    job.artifact_name = artifact_name
+    job.progress_done = len(stickers)
+    job.progress_total = len(stickers)
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "artifact", "artifact_name", "progress_done", "progress_total", "finished_at"])
+    logger.info("sticker export job %s done: %s stickers in %.1fs", job.pk, len(stickers), time.monotonic() - started)
+    return job
+
+
+def run_next_sticker_export_job():
+    for job in StickerExportJob.objects.filter(status=StickerExportJob.STATUS_PENDING).order_by("created_at", "id")[:5]:
+        if claim_export_job(job):
+            return run_sticker_export_job(job)
+    return None
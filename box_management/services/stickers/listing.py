@@ -0,0 +1,80 @@
+import base64
+import json
+from datetime import datetime
+
+from rest_framework import status
+
+from box_management.builders.sticker_payloads import serialize_client_admin_sticker, serialize_client_admin_sticker_row
+from box_management.domain.constants import STICKERS_FIELDS_LIGHT, STICKERS_MAX_PAGE_SIZE, STICKERS_PAGE_SIZE
+from box_management.models import Sticker
+from box_management.selectors.stickers import (
+    STICKER_LIGHT_FIELDS,
+    filter_client_stickers,
+    get_client_sticker_counts,
+    get_client_stickers_keyset_page,
+)
+
+
+def encode_sticker_cursor(created_at, sticker_id):
+    raw = json.dumps([created_at.isoformat(), sticker_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_sticker_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, sticker_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(sticker_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def _coerce_limit(raw_limit):
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        return STICKERS_PAGE_SIZE
+    return STICKERS_PAGE_SIZE if limit <= 0 else min(limit, STICKERS_MAX_PAGE_SIZE)
+
+
+def list_client_stickers(*, client_id, search="", status_filter="all", limit=None, cursor=None, fields=None):
+    """
+    Sans `limit` ni `cursor`, renvoie toute la liste (contrat historique du tableau admin).
+    Avec l'un des deux, renvoie une page keyset et `next_cursor` pour la suivante.
+    `fields=light` sert une projection .values() sans instancier les stickers.
+    """
+    stickers_qs = filter_client_stickers(client_id=client_id, search=search, status_filter=status_filter)
+    light = fields == STICKERS_FIELDS_LIGHT
+    status_labels = dict(Sticker.STATUS_CHOICES)
+    payload = {"counts": get_client_sticker_counts(client_id=client_id)}
+
+    if limit is None and not cursor:
+        if light:
+            rows = stickers_qs.values(*STICKER_LIGHT_FIELDS)
+            payload["results"] = [serialize_client_admin_sticker_row(row, status_labels) for row in rows]
+        else:
+            payload["results"] = [serialize_client_admin_sticker(sticker) for sticker in stickers_qs.select_related("client", "box")]
+        return payload, None
+
+    after = None
+    if cursor:
+        after = decode_sticker_cursor(cursor)
+        if after is None:
+            return None, {"status": status.HTTP_400_BAD_REQUEST, "code": "STICKER_CURSOR_INVALID", "detail": "Curseur de pagination invalide."}
+
+    limit = _coerce_limit(limit)
+    items, has_more = get_client_stickers_keyset_page(stickers_qs, limit=limit, after=after, light=light)
+    if light:
+        payload["results"] = [serialize_client_admin_sticker_row(row, status_labels) for row in items]
+    else:
+        payload["results"] = [serialize_client_admin_sticker(sticker) for sticker in items]
+
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        if light:
+            next_cursor = encode_sticker_cursor(last["created_at"], last["id"])
+        else:
+            next_cursor = encode_sticker_cursor(last.created_at, last.id)
+    payload.update({"limit": limit, "has_more": has_more, "next_cursor": next_cursor})
+    return payload, None
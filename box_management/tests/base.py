@@ -1,5 +1,6 @@
 from datetime import date, timedelta
 
+from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.utils import timezone
 from rest_framework.test import APITestCase
@@ -93,6 +94,8 @@ class ClientAdminTestCase(APITestCase):
 class FlowboxAPITestCase(APITestCase):
     def setUp(self):
         super().setUp()
+        # Le cache locmem survit au rollback de chaque test alors que les ids sont réutilisés.
+        cache.clear()
         self._authed_user = None
 
     def make_user(self, *, username="user-test", points=0, is_guest=False):
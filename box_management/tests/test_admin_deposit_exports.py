@@ -0,0 +1,67 @@
+import csv
+import io
+from datetime import datetime
+
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory
+from django.utils import timezone
+
+from box_management.admin import DepositAdmin
+from box_management.models import Deposit
+
+from .base import FlowboxAPITestCase
+
+
+class DepositAdminCsvExportTests(FlowboxAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = DepositAdmin(Deposit, AdminSite())
+        self.request = RequestFactory().get("/admin/box_management/deposit/")
+        self.user = self.make_user(username="csv-user")
+        self.box_a = self.make_box(url="csv-a", name="CSV A")
+        self.box_b = self.make_box(url="csv-b", name="CSV B")
+        self.song = self.make_song(public_key="csv-song", title="CSV song")
+        for day in (5, 5, 6, 20):
+            self.make_deposit(user=self.user, song=self.song, box=self.box_a, deposited_at=self.at(2026, 1, day))
+        self.make_deposit(user=None, song=self.song, box=self.box_a, deposited_at=self.at(2026, 2, 2))
+        self.make_deposit(user=self.user, song=self.song, box=self.box_b, deposited_at=self.at(2026, 1, 5))
+
+    def at(self, year, month, day):
+        return timezone.make_aware(datetime(year, month, day, 12, 0))
+
+    def read_rows(self, response):
+        self.assertEqual(response["Content-Type"], "text/csv")
+        content = "".join(chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk for chunk in response.streaming_content)
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_global_export_rolls_up_every_granularity_in_one_query(self):
+        with self.assertNumQueries(1):
+            rows = self.read_rows(self.admin.export_deposits_global(self.request, Deposit.objects.filter(box=self.box_a)))
+
+        self.assertEqual(rows[0], ["Box", "Period", "Number of Deposits"])
+        body = rows[1:]
+        self.assertIn(["CSV A", "2026-01", "4"], body)
+        self.assertIn(["CSV A", "2026-02", "1"], body)
+        self.assertIn(["CSV A", "2026-01", "3"], body)
+        self.assertIn(["CSV A", "2026-03", "1"], body)
+        self.assertIn(["CSV A", "2026-01-05", "2"], body)
+        self.assertEqual(len(body), 2 + 3 + 4)
+        self.assertFalse(any(row[0] == "CSV B" for row in body))
+
+    def test_distribution_export_honors_selection(self):
+        rows = self.read_rows(self.admin.export_deposits_distribution(self.request, Deposit.objects.filter(box=self.box_b)))
+
+        self.assertEqual(rows[1:], [["CSV B", "2026-01", "2026-01-05", "1"]])
+
+    def test_active_users_export_skips_anonymous_deposits(self):
+        rows = self.read_rows(self.admin.export_active_users_csv(self.request, Deposit.objects.filter(box=self.box_a)))
+
+        self.assertEqual(sum(int(row[4]) for row in rows[1:]), 4)
+        self.assertTrue(all(row[0] == "csv-user" for row in rows[1:]))
+
+    def test_popular_songs_export_keeps_one_row_per_day(self):
+        rows = self.read_rows(self.admin.export_popular_songs_csv(self.request, Deposit.objects.all()))
+
+        self.assertEqual(rows[0], ["Song", "Box", "Month", "Week", "Day", "Number of Deposits"])
+        self.assertIn(["CSV song", "CSV A", "2026-01", "2026-01", "2026-01-05", "2"], rows[1:])
+        self.assertEqual(len(rows) - 1, 5)
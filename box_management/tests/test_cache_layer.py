@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from la_boite_a_son.cache import (
+    build_caches_setting,
+    bump_namespace_version,
+    get_or_compute,
+    make_cache_key,
+)
+
+
+class CacheLayerTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_get_or_compute_caches_values_including_none(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return None
+
+        self.assertIsNone(get_or_compute("tests", ("a",), compute))
+        self.assertIsNone(get_or_compute("tests", ("a",), compute))
+        self.assertEqual(len(calls), 1)
+
+    def test_bumping_the_namespace_invalidates_its_keys_only(self):
+        get_or_compute("tests", ("a",), lambda: "old")
+        get_or_compute("other", ("a",), lambda: "kept")
+        old_key = make_cache_key("tests", "a")
+
+        bump_namespace_version("tests")
+
+        self.assertNotEqual(make_cache_key("tests", "a"), old_key)
+        self.assertEqual(get_or_compute("tests", ("a",), lambda: "new"), "new")
+        self.assertEqual(get_or_compute("other", ("a",), lambda: "recomputed"), "kept")
+
+    def test_bump_without_existing_version_moves_past_the_implicit_one(self):
+        self.assertEqual(bump_namespace_version("fresh"), 2)
+        self.assertEqual(make_cache_key("fresh", 1, "x"), "fresh:v2:1:x")
+
+    def test_backend_is_selected_from_environment(self):
+        self.assertIn("LocMemCache", build_caches_setting({})["default"]["BACKEND"])
+        self.assertIn("LocMemCache", build_caches_setting({"CACHE_BACKEND": "redis"})["default"]["BACKEND"])
+        file_cache = build_caches_setting({"CACHE_BACKEND": "file", "CACHE_LOCATION": "/tmp/lbas"})["default"]
+        self.assertEqual((file_cache["BACKEND"].rsplit(".", 1)[-1], file_cache["LOCATION"]), ("FileBasedCache", "/tmp/lbas"))
+        self.assertIn("DatabaseCache", build_caches_setting({"CACHE_BACKEND": "db"})["default"]["BACKEND"])
@@ -1,7 +1,17 @@
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 from unittest.mock import patch
 
+from django.core.cache import cache
 from django.urls import reverse
+from django.utils import timezone
+
+from box_management.models import Article, IncitationPhrase
+from box_management.selectors.incitations_overlap import build_incitation_overlap_counts
+from box_management.services.articles.visibility import (
+    build_visible_article_schedule,
+    get_visible_article_ids_for_client,
+)
+from box_management.services.boxes.incitations import get_current_incitation_for_box
 
 from .base import ClientAdminTestCase
 
@@ -73,6 +83,89 @@ class ClientAdminArticlesAndIncitationsTests(ClientAdminTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["title"], "Article importé")
 
+    def test_visible_article_schedule_matches_queryset_and_next_change(self):
+        today = date(2026, 3, 10)
+        windows = [
+            {},
+            {"display_start_time": time(9, 0), "display_end_time": time(18, 0, 30)},
+            {"display_start_time": time(22, 0), "display_end_time": time(6, 0)},
+            {"display_start_time": time(12, 0, 30)},
+            {"display_start_date": today + timedelta(days=1)},
+            {"display_end_date": today},
+        ]
+        for index, window in enumerate(windows):
+            article = self.make_article(client=self.client_a, author=self.owner_a, title=f"A{index}", status="published")
+            Article.objects.filter(pk=article.pk).update(**window)
+        articles = list(Article.objects.for_client(self.client_a).published())
+
+        for hour, minute in [(8, 59), (9, 0), (12, 0), (12, 1), (18, 0), (18, 1), (22, 0), (23, 59)]:
+            at = timezone.make_aware(datetime.combine(today, time(hour, minute, 15)))
+            ids, next_change = build_visible_article_schedule(articles, at=at)
+            expected = Article.objects.for_client(self.client_a).currently_visible(at=at)
+            self.assertEqual(set(ids), set(expected.values_list("id", flat=True)), (hour, minute))
+            just_before = next_change - timedelta(seconds=1)
+            before_ids, _ = build_visible_article_schedule(articles, at=just_before)
+            self.assertEqual(set(before_ids), set(ids), (hour, minute))
+
+        _, next_change = build_visible_article_schedule(
+            articles, at=timezone.make_aware(datetime.combine(today, time(12, 0, 15)))
+        )
+        self.assertEqual(timezone.localtime(next_change).time(), time(12, 1))
+
+    def test_visible_article_ids_are_cached_until_an_article_changes(self):
+        cache.clear()
+        article = self.make_article(client=self.client_a, author=self.owner_a, status="published")
+
+        self.assertEqual(get_visible_article_ids_for_client(self.client_a.id), [article.id])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_visible_article_ids_for_client(self.client_a.id), [article.id])
+
+        article.status = "archived"
+        article.save()
+        self.assertEqual(get_visible_article_ids_for_client(self.client_a.id), [])
+
+    def test_incitation_overlap_counts_match_per_phrase_queries(self):
+        today = date.today()
+        for offset, length in [(0, 3), (2, 0), (3, 4), (8, 1), (9, 0), (-5, 2)]:
+            self.make_incitation(
+                client=self.client_a,
+                text=f"P{offset}",
+                start_date=today + timedelta(days=offset),
+                end_date=today + timedelta(days=offset + length),
+            )
+        self.make_incitation(client=self.client_b, text="Autre client", start_date=today)
+        phrases = list(IncitationPhrase.objects.all())
+
+        with self.assertNumQueries(0):
+            counts = build_incitation_overlap_counts(phrases)
+
+        self.assertEqual(counts, {phrase.id: phrase.get_overlap_count() for phrase in phrases})
+
+    def test_current_incitation_is_cached_and_invalidated_on_change(self):
+        cache.clear()
+        box = self.make_box(client=self.client_a)
+        first = self.make_incitation(client=self.client_a, text="Première")
+
+        self.assertEqual(get_current_incitation_for_box(box), first)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_current_incitation_for_box(box), first)
+
+        second = self.make_incitation(client=self.client_a, text="Seconde")
+        self.assertEqual(get_current_incitation_for_box(box), second)
+
+        second.delete()
+        self.assertEqual(get_current_incitation_for_box(box), first)
+
+    def test_current_incitation_is_invalidated_for_previous_client_when_phrase_moves(self):
+        cache.clear()
+        box = self.make_box(client=self.client_a)
+        phrase = self.make_incitation(client=self.client_a, text="Déplacée")
+        self.assertEqual(get_current_incitation_for_box(box), phrase)
+
+        phrase.client = self.client_b
+        phrase.save()
+        self.assertIsNone(get_current_incitation_for_box(box))
+
     def test_incitation_overlap_returns_conflict_with_overlaps(self):
         self.make_incitation(
             client=self.client_a,
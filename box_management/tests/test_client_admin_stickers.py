@@ -1,21 +1,38 @@
+import io
+import re
 import subprocess
 import tempfile
+import threading
+import xml.etree.ElementTree as ET
+import zipfile
+from datetime import timedelta
 from pathlib import Path
 from unittest.mock import patch
 
 from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
+from django.db import connection
 from django.http import HttpResponse
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
-from box_management.models import ColorProfile, StickerTemplate
+from box_management.domain.constants import STICKER_EXPORT_JOB_STALE_SECONDS
+from box_management.models import ColorProfile, Sticker, StickerExportJob, StickerTemplate
+from box_management.selectors.stickers import get_client_sticker_counts
+from box_management.services.stickers import export as sticker_export
 from box_management.services.stickers.export import (
     assert_pdf_has_visible_content,
     build_pdf_wrapper_svg,
     build_stickers_pdf_bytes,
+    build_stickers_zip_response,
+    iter_zip_chunks,
+    mark_stickers_downloaded,
+    mark_stickers_generated,
     resolve_cmyk_icc_profile_path,
 )
+from box_management.services.stickers.export_jobs import prune_expired_export_jobs, run_next_sticker_export_job
 
 from .base import ClientAdminTestCase
 
@@ -73,6 +90,138 @@ class ClientAdminStickersTests(ClientAdminTestCase):
         self.assertIn("sticker", response.data)
 
 
+class ClientAdminStickerListTests(ClientAdminTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client_a = self.make_client(name="List A", slug="list-a")
+        self.client_b = self.make_client(name="List B", slug="list-b")
+        self.owner_a = self.make_client_user(username="list-owner-a", client=self.client_a)
+        self.box = self.make_box(client=self.client_a, name="List box", url="list-box")
+        self.stickers = [self.make_sticker(client=self.client_a, slug=f"2000000000{index}") for index in range(5)]
+        self.make_sticker(client=self.client_a, slug="20000000010", box=self.box)
+        self.make_sticker(client=self.client_a, slug="20000000011", is_active=False)
+        self.make_sticker(client=self.client_b, slug="20000000012")
+        self.auth(self.owner_a)
+
+    def get_list(self, **params):
+        return self.client.get(reverse("client-admin-stickers-list"), params)
+
+    def test_counts_are_computed_in_one_query(self):
+        with self.assertNumQueries(1):
+            counts = get_client_sticker_counts(client_id=self.client_a.id)
+
+        self.assertEqual(
+            counts,
+            {"all": 7, "never_generated": 7, "never_downloaded": 7, "assigned": 1, "unassigned": 6, "inactive": 1},
+        )
+
+    def test_list_without_limit_keeps_full_payload(self):
+        response = self.get_list()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 7)
+        self.assertIn("client", response.data["results"][0])
+        self.assertNotIn("next_cursor", response.data)
+
+    def test_keyset_pages_cover_every_sticker_once(self):
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.get_list(**params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(item["id"] for item in response.data["results"])
+            cursor = response.data["next_cursor"]
+            if not response.data["has_more"]:
+                break
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+        self.assertIsNone(cursor)
+
+    def test_light_projection_serves_table_fields(self):
+        response = self.get_list(limit=10, fields="light", status="assigned")
+
+        self.assertEqual(len(response.data["results"]), 1)
+        row = response.data["results"][0]
+        self.assertEqual(row["box"], {"id": self.box.id, "name": "List box", "slug": "list-box"})
+        self.assertEqual(row["status_label"], "Assigné")
+        self.assertNotIn("client", row)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.get_list(cursor="not-a-cursor")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["code"], "STICKER_CURSOR_INVALID")
+
+
+class StickerBulkTransitionTests(ClientAdminTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client_a = self.make_client(name="Bulk A", slug="bulk-a")
+        self.box = self.make_box(client=self.client_a, name="Bulk box", url="bulk-box")
+        self.fresh = self.make_sticker(client=self.client_a, slug="10000000001")
+        self.assigned = self.make_sticker(client=self.client_a, slug="10000000002", box=self.box)
+        self.downloaded = self.make_sticker(client=self.client_a, slug="10000000003")
+        self.downloaded.mark_downloaded()
+        self.downloaded.save()
+
+    def test_mark_generated_is_one_update_and_keeps_status_priority(self):
+        stickers = [self.fresh, self.assigned, self.downloaded]
+        first_generated_at = self.downloaded.qr_generated_at
+
+        with self.assertNumQueries(1):
+            mark_stickers_generated(stickers)
+
+        for sticker in stickers:
+            sticker.refresh_from_db()
+        self.assertEqual(self.fresh.status, Sticker.STATUS_GENERATED)
+        self.assertEqual(self.assigned.status, Sticker.STATUS_ASSIGNED)
+        self.assertEqual(self.downloaded.status, Sticker.STATUS_DOWNLOADED)
+        self.assertEqual(self.downloaded.qr_generated_at, first_generated_at)
+        self.assertIsNotNone(self.assigned.assigned_at)
+        self.assertIsNone(self.fresh.assigned_at)
+
+    def test_mark_downloaded_updates_rows_and_instances(self):
+        stickers = [self.fresh, self.assigned]
+
+        with self.assertNumQueries(1):
+            mark_stickers_downloaded(stickers)
+
+        self.assertEqual(self.fresh.status, Sticker.STATUS_DOWNLOADED)
+        self.fresh.refresh_from_db()
+        self.assigned.refresh_from_db()
+        self.assertEqual(self.fresh.status, Sticker.STATUS_DOWNLOADED)
+        self.assertIsNotNone(self.fresh.qr_generated_at)
+        self.assertEqual(self.assigned.status, Sticker.STATUS_ASSIGNED)
+        self.assertIsNotNone(self.assigned.downloaded_at)
+
+    def test_allocate_slugs_skips_taken_and_duplicate_candidates(self):
+        candidates = iter(["10000000001", "20000000001", "20000000001"] + [f"3000000000{index}" for index in range(10)])
+        with patch.object(Sticker, "generate_slug", side_effect=lambda: next(candidates)):
+            slugs = Sticker.allocate_slugs(2)
+
+        self.assertEqual(len(slugs), 2)
+        self.assertNotIn("10000000001", slugs)
+        self.assertEqual(len(set(slugs)), 2)
+
+    def test_bulk_create_for_client_uses_a_handful_of_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            created = Sticker.bulk_create_for_client(self.client_a, 600, batch_size=500)
+
+        statements = [query["sql"].split(" ", 1)[0] for query in queries.captured_queries]
+        self.assertEqual(statements.count("SELECT"), 1)
+        self.assertLessEqual(len(statements), 10)
+
+        slugs = list(Sticker.objects.filter(client=self.client_a).exclude(pk__in=[self.fresh.pk, self.assigned.pk, self.downloaded.pk]).values_list("slug", flat=True))
+        self.assertEqual(len(created), 600)
+        self.assertEqual(len(set(slugs)), 600)
+        self.assertTrue(all(len(slug) == 11 and slug.isdigit() for slug in slugs))
+        self.assertFalse(Sticker.objects.filter(client=self.client_a).exclude(status=Sticker.STATUS_CREATED).exclude(pk__in=[self.assigned.pk, self.downloaded.pk]).exists())
+
+
 class StickerTemplateTests(ClientAdminTestCase):
     def test_valid_template_can_be_created(self):
         client = self.make_client(name="Template client", slug="template-client")
@@ -203,14 +352,16 @@ class StickerPdfExportUnitTests(ClientAdminTestCase):
         self.assertIn('preserveAspectRatio="xMidYMid meet"', wrapper)
 
     @patch("box_management.services.stickers.export.get_pypdf_writer")
-    @patch("box_management.services.stickers.export.assert_pdf_has_visible_content")
-    @patch("box_management.services.stickers.export.export_svg_to_pdf_with_inkscape")
-    def test_build_stickers_pdf_bytes_writes_self_contained_wrapper(self, export_pdf, assert_content, get_pypdf):
+    @patch("box_management.services.stickers.export.assert_pdf_reader_has_visible_content")
+    @patch("box_management.services.stickers.export.export_pdf_pages")
+    def test_build_stickers_pdf_bytes_writes_self_contained_wrapper(self, export_pdfs, assert_content, get_pypdf):
         template = self.make_sticker_template(clients=self.client_a, svg_content=self.sticker_svg_bytes().decode("utf-8"))
         seen_wrappers = []
+        opened_paths = []
 
         class FakeReader:
-            def __init__(self, _path):
+            def __init__(self, path):
+                opened_paths.append(path)
                 self.pages = [object()]
 
         class FakeWriter:
@@ -223,20 +374,149 @@ class StickerPdfExportUnitTests(ClientAdminTestCase):
             def write(self, output):
                 output.write(b"pdf")
 
-        def fake_export(input_svg, output_pdf):
-            seen_wrappers.append(Path(input_svg).read_text(encoding="utf-8"))
-            Path(output_pdf).write_bytes(b"%PDF-1.4\n%test")
+        def fake_export(pages, engine):
+            for input_svg, output_pdf in pages:
+                seen_wrappers.append(Path(input_svg).read_text(encoding="utf-8"))
+                Path(output_pdf).write_bytes(b"%PDF-1.4\n%test")
+            return [{"pages": 1, "seconds": 0.01}] * len(pages)
 
         get_pypdf.return_value = (FakeReader, FakeWriter)
-        export_pdf.side_effect = fake_export
+        export_pdfs.side_effect = fake_export
         request = self.client.post("/").wsgi_request
         build_stickers_pdf_bytes(request, [self.sticker], template=template, paper_size="A4", orientation="portrait")
 
+        self.assertEqual(export_pdfs.call_count, 1)
         self.assertEqual(len(seen_wrappers), 1)
         self.assertIn('id="visible-marker"', seen_wrappers[0])
         self.assertNotIn("file://", seen_wrappers[0])
         self.assertNotIn("sticker-0.svg", seen_wrappers[0])
         assert_content.assert_called_once()
+        self.assertEqual(len(opened_paths), 1)
+
+    @patch("box_management.services.stickers.export.get_pypdf_writer")
+    @patch("box_management.services.stickers.export.assert_pdf_reader_has_visible_content")
+    @patch("box_management.services.stickers.export.export_pdf_pages")
+    def test_render_stickers_pdf_reports_per_page_timings(self, export_pdfs, _assert_content, get_pypdf):
+        template = self.make_sticker_template(clients=self.client_a, svg_content=self.sticker_svg_bytes().decode("utf-8"))
+        other = self.make_sticker(client=self.client_a, slug="55555555556")
+
+        class FakeReader:
+            def __init__(self, _path):
+                self.pages = [object()]
+
+        class FakeWriter:
+            def add_page(self, page):
+                return page
+
+            def write(self, output):
+                output.write(b"pdf")
+
+        get_pypdf.return_value = (FakeReader, FakeWriter)
+        export_pdfs.side_effect = lambda pages, engine: [{"pages": len(pages), "seconds": 0.5}]
+        timings = []
+        sticker_export.render_stickers_pdf_bytes(
+            "http://testserver/",
+            [self.sticker, other],
+            template=template,
+            paper_size="A6",
+            orientation="portrait",
+            timings=timings,
+        )
+
+        self.assertEqual([timing["page"] for timing in timings], [1, 2])
+        self.assertTrue(all((timing["export_session"], timing["export_session_ms"]) == (1, 500.0) for timing in timings))
+        self.assertTrue(all({"build_ms", "merge_ms"} <= set(timing) for timing in timings))
+
+    def test_cairo_engine_exports_pages_in_process(self):
+        class FakeCairoPdf:
+            @staticmethod
+            def svg2pdf(bytestring, write_to):
+                Path(write_to).write_bytes(b"%PDF-" + bytestring[:8])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pages = [(Path(tmp) / f"page-{index}.svg", Path(tmp) / f"page-{index}.pdf") for index in range(2)]
+            for input_svg, _output_pdf in pages:
+                input_svg.write_bytes(self.sticker_svg_bytes())
+            with patch.object(sticker_export, "get_cairosvg_module", return_value=FakeCairoPdf), patch.object(sticker_export.shutil, "which") as which:
+                sessions = sticker_export.export_pdf_pages(pages, "cairo")
+                outputs = [output_pdf.read_bytes() for _input_svg, output_pdf in pages]
+
+        which.assert_not_called()
+        self.assertEqual([session["pages"] for session in sessions], [1, 1])
+        self.assertTrue(all(output.startswith(b"%PDF-<svg") for output in outputs))
+
+    def test_inkscape_shell_script_exports_every_page_then_quits(self):
+        script = sticker_export.build_inkscape_shell_script([("/tmp/a.svg", "/tmp/a.pdf"), ("/tmp/b.svg", "/tmp/b.pdf")])
+        lines = script.strip().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertIn("file-open:/tmp/a.svg", lines[0])
+        self.assertIn("export-filename:/tmp/a.pdf", lines[0])
+        self.assertIn("export-do", lines[1])
+        self.assertEqual(lines[-1], "quit")
+
+    @patch("box_management.services.stickers.export.subprocess.Popen")
+    @patch("box_management.services.stickers.export.shutil.which", return_value="/usr/bin/inkscape")
+    def test_inkscape_pages_share_sessions(self, _which, popen):
+        started_sessions = []
+
+        class FakeProcess:
+            def __init__(self, command, stdin, **kwargs):
+                self.command = command
+                script = stdin.read().decode("utf-8")
+                started_sessions.append(script)
+                for line in script.splitlines():
+                    match = re.search(r"export-filename:([^;]+);", line)
+                    if match:
+                        Path(match.group(1)).write_bytes(b"%PDF")
+
+            def wait(self, timeout=None):
+                return 0
+
+        popen.side_effect = FakeProcess
+        with tempfile.TemporaryDirectory() as tmp:
+            pages = [(Path(tmp) / f"page-{index}.svg", Path(tmp) / f"page-{index}.pdf") for index in range(25)]
+            sessions = sticker_export.export_svgs_to_pdf_with_inkscape(pages, max_sessions=4)
+
+        self.assertEqual(len(started_sessions), 2)
+        self.assertEqual(popen.call_args.args[0], ["inkscape", "--shell"])
+        self.assertEqual([session["pages"] for session in sessions], [13, 12])
+
+    @patch("box_management.services.stickers.export.subprocess.Popen")
+    @patch("box_management.services.stickers.export.shutil.which", return_value="/usr/bin/inkscape")
+    def test_inkscape_sessions_are_waited_concurrently(self, _which, popen):
+        # La première session ne se termine qu'après la seconde : une attente séquentielle échouerait.
+        second_done = threading.Event()
+        processes = []
+
+        class FakeProcess:
+            def __init__(self, command, stdin, **kwargs):
+                self.index = len(processes)
+                processes.append(self)
+                for match in re.finditer(r"export-filename:([^;]+);", stdin.read().decode("utf-8")):
+                    Path(match.group(1)).write_bytes(b"%PDF")
+
+            def wait(self, timeout=None):
+                if self.index == 0:
+                    return 0 if second_done.wait(timeout=5) else 1
+                second_done.set()
+                return 0
+
+        popen.side_effect = FakeProcess
+        with tempfile.TemporaryDirectory() as tmp:
+            pages = [(Path(tmp) / f"page-{index}.svg", Path(tmp) / f"page-{index}.pdf") for index in range(20)]
+            sessions = sticker_export.export_svgs_to_pdf_with_inkscape(pages, max_sessions=2)
+
+        self.assertEqual([session["pages"] for session in sessions], [10, 10])
+        self.assertLessEqual(sessions[1]["seconds"], sessions[0]["seconds"])
+
+    @patch("box_management.services.stickers.export.subprocess.Popen")
+    @patch("box_management.services.stickers.export.shutil.which", return_value="/usr/bin/inkscape")
+    def test_inkscape_session_without_output_fails(self, _which, popen):
+        popen.return_value.wait.return_value = 0
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaisesRegex(RuntimeError, "inkscape_failed"):
+                sticker_export.export_svgs_to_pdf_with_inkscape([(Path(tmp) / "page.svg", Path(tmp) / "page.pdf")])
 
     @patch("box_management.services.stickers.export.get_pypdf_writer")
     def test_assert_pdf_has_visible_content_rejects_blank_pdf(self, get_pypdf):
@@ -279,6 +559,279 @@ class StickerPdfExportUnitTests(ClientAdminTestCase):
         assert_pdf_has_visible_content("non-empty.pdf")
 
 
+class StickerTemplateCacheTests(ClientAdminTestCase):
+    def setUp(self):
+        super().setUp()
+        sticker_export.clear_sticker_template_cache()
+        self.addCleanup(sticker_export.clear_sticker_template_cache)
+        self.client_a = self.make_client(name="Cache client", slug="cache-client")
+        self.template = self.make_sticker_template(clients=self.client_a, name="Cache", slug="cache")
+        self.stickers = [self.make_sticker(client=self.client_a, slug=f"9999999990{index}") for index in range(3)]
+
+    def test_template_is_parsed_once_for_several_renders(self):
+        with patch.object(sticker_export.ET, "fromstring", wraps=sticker_export.ET.fromstring) as fromstring:
+            for sticker in self.stickers:
+                sticker_export.build_sticker_svg_bytes(sticker, self.template, f"https://example.test/s/{sticker.slug}")
+
+        self.assertEqual(fromstring.call_count, 1)
+        self.assertEqual(sticker_export.get_sticker_template_cache_stats(), {"parses": 1, "hits": 2, "templates": 1})
+
+    def test_renders_do_not_mutate_cached_tree(self):
+        sticker_export.build_sticker_svg_bytes(self.stickers[0], self.template, "https://example.test/s/a")
+        root, _zone, _size = sticker_export.load_sticker_template_with_zone(self.template)
+
+        self.assertIsNone(root.find(".//{http://www.w3.org/2000/svg}g[@id='generated-qr']"))
+
+    def test_saving_template_invalidates_cached_tree(self):
+        sticker_export.load_sticker_template_with_zone(self.template)
+        self.template.svg_file.save(
+            "cache-v2.svg",
+            ContentFile(b'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 50 50"><rect id="qr-zone" x="1" y="2" width="3" height="4" /></svg>'),
+            save=False,
+        )
+        self.template.save()
+
+        _root, zone, size = sticker_export.load_sticker_template_with_zone(self.template)
+
+        self.assertEqual(size, (50.0, 50.0))
+        self.assertEqual(zone["width"], 3.0)
+        self.assertEqual(sticker_export.get_sticker_template_cache_stats()["parses"], 2)
+
+
+class StickerVectorQrTests(ClientAdminTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client_a = self.make_client(name="QR client", slug="qr-client")
+        self.template = self.make_sticker_template(clients=self.client_a, name="QR", slug="qr")
+        self.sticker = self.make_sticker(client=self.client_a, slug="88888888888")
+
+    def decode_path_modules(self, path_data, size):
+        modules = [[False] * size for _ in range(size)]
+        for x, y, length in re.findall(r"M(\d+) (\d+)h(\d+)v1h-\d+z", path_data):
+            for column in range(int(x), int(x) + int(length)):
+                modules[int(y)][column] = True
+        return modules
+
+    def test_qr_is_embedded_as_vector_path_in_zone(self):
+        svg_bytes, _w, _h = sticker_export.build_sticker_svg_bytes(self.sticker, self.template, "https://example.test/s/88888888888")
+        root = ET.fromstring(svg_bytes)
+        group = root.find(".//{http://www.w3.org/2000/svg}g[@id='generated-qr']")
+
+        self.assertIsNotNone(group)
+        self.assertIsNone(root.find(".//{http://www.w3.org/2000/svg}image"))
+        self.assertTrue(group.attrib["transform"].startswith("translate(10.0 20.0) scale("))
+        self.assertLess(len(svg_bytes), 20_000)
+
+    def test_qr_path_round_trips_to_the_encoded_modules(self):
+        import qrcode
+
+        content = "https://example.test/s/88888888888"
+        svg_bytes, _w, _h = sticker_export.build_sticker_svg_bytes(self.sticker, self.template, content)
+        group = ET.fromstring(svg_bytes).find(".//{http://www.w3.org/2000/svg}g[@id='generated-qr']")
+        size = int(group.find("{http://www.w3.org/2000/svg}rect").attrib["width"])
+        decoded = self.decode_path_modules(group.find("{http://www.w3.org/2000/svg}path").attrib["d"], size)
+
+        reference = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_Q, box_size=1, border=4)
+        reference.add_data(content)
+        reference.make(fit=True)
+        image = reference.make_image(fill_color="black", back_color="white").convert("L")
+        raster = [[image.getpixel((x, y)) < 128 for x in range(image.size[0])] for y in range(image.size[1])]
+
+        self.assertEqual(image.size, (size, size))
+        self.assertEqual(decoded, raster)
+
+
+class FakeCairoSvg:
+    @staticmethod
+    def svg2png(bytestring, output_width, output_height):
+        return b"png:" + bytestring[-64:]
+
+
+class StickerZipExportTests(ClientAdminTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client_a = self.make_client(name="Zip export client", slug="zip-export-client")
+        self.template = self.make_sticker_template(clients=self.client_a, name="Zip", slug="zip")
+        self.stickers = [self.make_sticker(client=self.client_a, slug=f"7777777770{index}") for index in range(6)]
+
+    def read_zip(self, response):
+        return zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+
+    def test_iter_zip_chunks_builds_valid_archive(self):
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(iter_zip_chunks([("a.png", b"aaa"), ("b.png", b"bbb")]))))
+        self.assertEqual(archive.read("a.png"), b"aaa")
+        self.assertEqual(archive.read("b.png"), b"bbb")
+
+    @override_settings(STICKER_EXPORT_MAX_WORKERS=1)
+    @patch("box_management.services.stickers.export.get_cairosvg_module", return_value=FakeCairoSvg)
+    def test_zip_export_parses_template_once_and_streams_every_sticker(self, _cairosvg):
+        request = self.client.post("/").wsgi_request
+        with patch.object(sticker_export, "load_sticker_template_with_zone", wraps=sticker_export.load_sticker_template_with_zone) as load_template:
+            response = build_stickers_zip_response(request, self.stickers, template=self.template, paper_size="A6", file_type="png")
+            archive = self.read_zip(response)
+
+        self.assertEqual(load_template.call_count, 1)
+        self.assertEqual(sorted(archive.namelist()), sorted(f"sticker-{sticker.slug}.png" for sticker in self.stickers))
+        self.assertTrue(all(archive.read(name).startswith(b"png:") for name in archive.namelist()))
+
+    @override_settings(STICKER_EXPORT_MAX_WORKERS=2)
+    @patch("box_management.services.stickers.export.get_cairosvg_module", return_value=FakeCairoSvg)
+    def test_zip_export_with_process_pool_renders_every_sticker(self, _cairosvg):
+        request = self.client.post("/").wsgi_request
+        response = build_stickers_zip_response(request, self.stickers, template=self.template, paper_size="A6", file_type="png")
+        archive = self.read_zip(response)
+
+        self.assertEqual(len(archive.namelist()), len(self.stickers))
+        for sticker in self.stickers:
+            self.assertTrue(archive.read(f"sticker-{sticker.slug}.png").endswith(b"</svg>"))
+
+    @patch("box_management.services.stickers.export.get_cairosvg_module", side_effect=RuntimeError("cairosvg_system_missing"))
+    def test_zip_export_checks_dependencies_before_streaming(self, _cairosvg):
+        request = self.client.post("/").wsgi_request
+        with self.assertRaisesRegex(RuntimeError, "cairosvg_system_missing"):
+            build_stickers_zip_response(request, self.stickers, template=self.template, paper_size="A6", file_type="png")
+
+
+class StickerExportJobTests(ClientAdminTestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_override = override_settings(MEDIA_ROOT=media_root.name, STICKER_EXPORT_MAX_WORKERS=1)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.client_a = self.make_client(name="Job A", slug="job-a")
+        self.client_b = self.make_client(name="Job B", slug="job-b")
+        self.owner_a = self.make_client_user(username="job-owner-a", client=self.client_a)
+        self.owner_b = self.make_client_user(username="job-owner-b", client=self.client_b)
+        self.template = self.make_sticker_template(clients=self.client_a, name="Job", slug="job")
+        self.stickers = [self.make_sticker(client=self.client_a, slug=f"6666666660{index}") for index in range(3)]
+
+    def create_job(self, **payload):
+        self.auth(self.owner_a)
+        body = {
+            "sticker_ids": [sticker.id for sticker in self.stickers],
+            "file_type": "png",
+            "paper_size": "A6",
+            "template_id": self.template.id,
+        }
+        body.update(payload)
+        return self.client.post(reverse("client-admin-sticker-export-jobs"), body, format="json")
+
+    def test_create_job_is_pending_and_identical_request_reuses_it(self):
+        first = self.create_job()
+        second = self.create_job()
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(first.data["status"], StickerExportJob.STATUS_PENDING)
+        self.assertEqual(first.data["progress"], {"done": 0, "total": 3})
+        self.assertFalse(first.data["reused"])
+        self.assertEqual(second.data["id"], first.data["id"])
+        self.assertTrue(second.data["reused"])
+        self.assertEqual(StickerExportJob.objects.count(), 1)
+        for sticker in self.stickers:
+            sticker.refresh_from_db()
+            self.assertIsNotNone(sticker.qr_generated_at)
+
+    def test_stale_running_job_is_failed_instead_of_reused(self):
+        job_id = self.create_job().data["id"]
+        abandoned = timezone.now() - timedelta(seconds=STICKER_EXPORT_JOB_STALE_SECONDS + 60)
+        StickerExportJob.objects.filter(pk=job_id).update(
+            status=StickerExportJob.STATUS_RUNNING, started_at=abandoned, heartbeat_at=abandoned
+        )
+
+        retry = self.create_job()
+
+        self.assertEqual(retry.status_code, 202)
+        self.assertNotEqual(retry.data["id"], job_id)
+        stale = StickerExportJob.objects.get(pk=job_id)
+        self.assertEqual((stale.status, stale.error_code), (StickerExportJob.STATUS_FAILED, "sticker_export_stale"))
+
+    def test_running_job_with_recent_heartbeat_is_reused(self):
+        job_id = self.create_job().data["id"]
+        StickerExportJob.objects.filter(pk=job_id).update(
+            status=StickerExportJob.STATUS_RUNNING, started_at=timezone.now(), heartbeat_at=timezone.now()
+        )
+
+        self.assertEqual(self.create_job().data["id"], job_id)
+
+    def test_different_options_create_a_new_job(self):
+        first = self.create_job()
+        second = self.create_job(file_type="jpeg")
+
+        self.assertNotEqual(first.data["id"], second.data["id"])
+
+    @patch("box_management.services.stickers.export.get_cairosvg_module", return_value=FakeCairoSvg)
+    @patch("box_management.services.stickers.export_jobs.get_cairosvg_module", return_value=FakeCairoSvg)
+    def test_worker_writes_zip_artifact_then_done_job_is_reused(self, _jobs_cairosvg, _export_cairosvg):
+        job_id = self.create_job().data["id"]
+
+        job = run_next_sticker_export_job()
+        detail = self.client.get(reverse("client-admin-sticker-export-jobs-detail", args=[job_id]))
+        download = self.client.get(reverse("client-admin-sticker-export-jobs-download", args=[job_id]))
+        reused = self.create_job()
+
+        self.assertEqual(job.id, job_id)
+        self.assertEqual(detail.data["status"], StickerExportJob.STATUS_DONE)
+        self.assertEqual(detail.data["progress"], {"done": 3, "total": 3})
+        self.assertEqual(detail.data["download_url"], reverse("client-admin-sticker-export-jobs-download", args=[job_id]))
+        self.assertEqual(download.status_code, 200)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(download.streaming_content)))
+        self.assertEqual(sorted(archive.namelist()), sorted(f"sticker-{sticker.slug}.png" for sticker in self.stickers))
+        self.assertEqual(reused.status_code, 200)
+        self.assertEqual(reused.data["id"], job_id)
+        self.assertIsNone(run_next_sticker_export_job())
+
+    @patch("box_management.services.stickers.export.get_cairosvg_module", return_value=FakeCairoSvg)
+    @patch("box_management.services.stickers.export_jobs.get_cairosvg_module", return_value=FakeCairoSvg)
+    def test_expired_jobs_are_pruned_with_their_artifact(self, _jobs_cairosvg, _export_cairosvg):
+        self.create_job()
+        job = run_next_sticker_export_job()
+        failed_id = self.create_job(file_type="jpeg").data["id"]
+        StickerExportJob.objects.filter(pk=failed_id).update(status=StickerExportJob.STATUS_FAILED, finished_at=timezone.now())
+        artifact_path = Path(job.artifact.path)
+        expired_at = timezone.now() - timedelta(hours=73)
+        StickerExportJob.objects.filter(pk=job.pk).update(finished_at=expired_at)
+
+        retry = self.create_job()
+
+        self.assertEqual(retry.status_code, 202)
+        self.assertNotEqual(retry.data["id"], job.pk)
+        self.assertEqual(prune_expired_export_jobs(), 1)
+        self.assertFalse(artifact_path.exists())
+        self.assertFalse(StickerExportJob.objects.filter(pk=job.pk).exists())
+        self.assertTrue(StickerExportJob.objects.filter(pk=failed_id).exists())
+
+    @patch("box_management.services.stickers.export_jobs.get_cairosvg_module", side_effect=RuntimeError("cairosvg_system_missing"))
+    def test_worker_records_known_export_error(self, _cairosvg):
+        job_id = self.create_job().data["id"]
+
+        run_next_sticker_export_job()
+        detail = self.client.get(reverse("client-admin-sticker-export-jobs-detail", args=[job_id]))
+        retry = self.create_job()
+
+        self.assertEqual(detail.data["status"], StickerExportJob.STATUS_FAILED)
+        self.assertEqual(detail.data["error_code"], "CAIROSVG_SYSTEM_MISSING")
+        self.assertTrue(detail.data["error_detail"])
+        self.assertNotEqual(retry.data["id"], job_id)
+
+    def test_pending_job_download_is_conflict(self):
+        job_id = self.create_job().data["id"]
+
+        response = self.client.get(reverse("client-admin-sticker-export-jobs-download", args=[job_id]))
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["code"], "STICKER_EXPORT_NOT_READY")
+
+    def test_job_is_scoped_to_client(self):
+        job_id = self.create_job().data["id"]
+        self.auth(self.owner_b)
+
+        response = self.client.get(reverse("client-admin-sticker-export-jobs-detail", args=[job_id]))
+
+        self.assertEqual(response.status_code, 404)
+
+
 class ClientAdminStickerDownloadExportTests(ClientAdminTestCase):
     def setUp(self):
         self.client_a = self.make_client(name="Export A", slug="export-a")
@@ -356,6 +909,30 @@ class ClientAdminStickerDownloadExportTests(ClientAdminTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(build_pdf.call_args.kwargs["color_mode"], "rgb")
 
+    @patch("box_management.api.views.stickers.build_stickers_pdf_response")
+    def test_pdf_without_engine_uses_inkscape(self, build_pdf):
+        build_pdf.return_value = HttpResponse(b"pdf", content_type="application/pdf")
+        self.post_download({"template_id": self.template.id, "file_type": "pdf", "orientation": "portrait"})
+        self.assertEqual(build_pdf.call_args.kwargs["pdf_engine"], "inkscape")
+
+    @override_settings(STICKER_PDF_ENGINE="cairo")
+    @patch("box_management.api.views.stickers.build_stickers_pdf_response")
+    def test_pdf_engine_defaults_to_settings(self, build_pdf):
+        build_pdf.return_value = HttpResponse(b"pdf", content_type="application/pdf")
+        self.post_download({"template_id": self.template.id, "file_type": "pdf", "orientation": "portrait"})
+        self.assertEqual(build_pdf.call_args.kwargs["pdf_engine"], "cairo")
+
+    @patch("box_management.api.views.stickers.build_stickers_pdf_response")
+    def test_pdf_cairo_engine_is_passed(self, build_pdf):
+        build_pdf.return_value = HttpResponse(b"pdf", content_type="application/pdf")
+        response = self.post_download({"template_id": self.template.id, "file_type": "pdf", "orientation": "portrait", "pdf_engine": "cairo"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(build_pdf.call_args.kwargs["pdf_engine"], "cairo")
+
+    def test_pdf_rejects_invalid_engine(self):
+        response = self.post_download({"template_id": self.template.id, "file_type": "pdf", "orientation": "portrait", "pdf_engine": "word"})
+        self.assert_api_error(response, 400, "STICKER_EXPORT_PDF_ENGINE_INVALID")
+
     def test_pdf_rejects_invalid_color_mode(self):
         response = self.post_download({"template_id": self.template.id, "file_type": "pdf", "orientation": "portrait", "color_mode": "lab"})
         self.assert_api_error(response, 400, "STICKER_EXPORT_COLOR_MODE_INVALID")
@@ -0,0 +1,124 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.urls import reverse
+from django.utils import timezone
+
+from box_management.models import Comment, CommentUserRestriction
+from box_management.services.comments.anti_abuse import (
+    get_daily_target_comment_count,
+    is_comment_cooldown_active,
+    record_comment_created,
+)
+from box_management.services.comments.moderation_rules import get_active_comment_restrictions_for_clients
+from box_management.tests.base import FlowboxAPITestCase
+
+
+class CommentAntiAbuseCacheTests(FlowboxAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client_entity = self.make_client(name="Client anti-abus", slug="client-anti-abus")
+        self.box = self.make_box(url="box-anti-abus", name="Box anti-abus", client=self.client_entity)
+        self.owner = self.make_user(username="owner-anti-abus")
+        self.author = self.make_user(username="author-anti-abus")
+        self.deposit = self.make_deposit(user=self.owner, song=self.make_song(public_key="anti-abus"), box=self.box)
+
+    def _comment(self, **kwargs):
+        return Comment.objects.create(
+            client=self.client_entity,
+            deposit=self.deposit,
+            user=self.author,
+            text="Super",
+            normalized_text="super",
+            deposit_owner_user_id=self.owner.id,
+            **kwargs,
+        )
+
+    def _daily_count(self):
+        return get_daily_target_comment_count(
+            user_id=self.author.id, client_id=self.client_entity.id, target_user_id=self.owner.id
+        )
+
+    def test_daily_target_count_falls_back_to_db_then_stays_in_cache(self):
+        self._comment()
+        yesterday = self._comment()
+        Comment.objects.filter(pk=yesterday.pk).update(created_at=timezone.now() - timedelta(days=1))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self._daily_count(), 1)
+        record_comment_created(self._comment())
+        with self.assertNumQueries(0):
+            self.assertEqual(self._daily_count(), 2)
+
+    def test_cooldown_uses_last_comment_recorded_in_cache(self):
+        with self.assertNumQueries(1):
+            self.assertFalse(is_comment_cooldown_active(self.author.id))
+        record_comment_created(self._comment())
+        with self.assertNumQueries(0):
+            self.assertTrue(is_comment_cooldown_active(self.author.id))
+        later = timezone.now() + timedelta(minutes=5)
+        self.assertFalse(is_comment_cooldown_active(self.author.id, now=later))
+
+    def test_deleted_comment_no_longer_counts(self):
+        comment = self._comment()
+        record_comment_created(comment)
+        self.assertEqual(self._daily_count(), 1)
+        self.assertTrue(is_comment_cooldown_active(self.author.id))
+
+        comment.delete()
+
+        self.assertEqual(self._daily_count(), 0)
+        self.assertFalse(is_comment_cooldown_active(self.author.id))
+
+    def test_daily_limit_is_enforced_from_counters(self):
+        self.auth(self.author)
+        payload = {"dep_public_key": self.deposit.public_key, "text": "Super partage"}
+        now = timezone.now()
+        target = "box_management.services.comments.anti_abuse.timezone.now"
+
+        self.assertEqual(self.client.post(reverse("comments-create"), payload, format="json").status_code, 201)
+        # On avance l'horloge du cooldown ; le compteur quotidien, lui, n'est plus relu en base.
+        with patch(target, return_value=now + timedelta(minutes=5)):
+            self.assertEqual(self.client.post(reverse("comments-create"), payload, format="json").status_code, 201)
+        with patch(target, return_value=now + timedelta(minutes=10)):
+            blocked = self.client.post(reverse("comments-create"), payload, format="json")
+
+        self.assertEqual(blocked.status_code, 403)
+        self.assertEqual(Comment.objects.filter(user=self.author).count(), 2)
+
+    def test_restrictions_are_cached_and_invalidated_on_change(self):
+        client_id = self.client_entity.id
+        with self.assertNumQueries(1):
+            self.assertEqual(get_active_comment_restrictions_for_clients(self.author, [client_id]), {})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_active_comment_restrictions_for_clients(self.author, [client_id]), {})
+
+        restriction = CommentUserRestriction.objects.create(
+            client=self.client_entity,
+            user=self.author,
+            restriction_type=CommentUserRestriction.TYPE_MUTE_24H,
+            starts_at=timezone.now() - timedelta(minutes=1),
+            ends_at=timezone.now() + timedelta(hours=24),
+        )
+        self.assertEqual(get_active_comment_restrictions_for_clients(self.author, [client_id])[client_id], restriction)
+
+        restriction.delete()
+        self.assertEqual(get_active_comment_restrictions_for_clients(self.author, [client_id]), {})
+
+    def test_cached_restriction_expires_at_its_boundaries(self):
+        client_id = self.client_entity.id
+        now = timezone.now()
+        CommentUserRestriction.objects.create(
+            client=self.client_entity,
+            user=self.author,
+            restriction_type=CommentUserRestriction.TYPE_MUTE_24H,
+            starts_at=now + timedelta(minutes=10),
+            ends_at=now + timedelta(minutes=20),
+        )
+        self.assertEqual(get_active_comment_restrictions_for_clients(self.author, [client_id]), {})
+
+        target = "box_management.services.comments.moderation_rules.timezone.now"
+        with patch(target, return_value=now + timedelta(minutes=15)):
+            self.assertIn(client_id, get_active_comment_restrictions_for_clients(self.author, [client_id]))
+        with patch(target, return_value=now + timedelta(minutes=25)):
+            self.assertEqual(get_active_comment_restrictions_for_clients(self.author, [client_id]), {})
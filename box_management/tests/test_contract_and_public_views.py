@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from unittest.mock import patch
 
 from django.urls import reverse
 from django.utils import timezone
 
-from box_management.models import Deposit, Link
+from box_management.models import BoxStats, Deposit, IncitationPhrase, Link
 from box_management.tests.base import FlowboxAPITestCase
 from la_boite_a_son.economy import build_economy_payload
 
@@ -91,6 +92,70 @@ class PublicContractViewTests(FlowboxAPITestCase):
         self.assertEqual(response.data["client_slug"], client.slug)
         self.assertEqual(response.data["last_deposit_song_image_url"], song.image_url)
 
+    def test_box_preview_is_cached_and_invalidated_on_deposit_and_incitation(self):
+        client = self.make_client(name="Client cached box", slug="client-cached-box")
+        box = self.make_box(url="box-cached", name="Box cached", client=client)
+        owner = self.make_user(username="owner-cached-box")
+        self.make_deposit(user=owner, song=self.make_song(public_key="cached-song-1"), box=box)
+        self.client.get(reverse("box-preview"), {"boxSlug": box.url})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("box-preview"), {"boxSlug": box.url})
+        self.assertEqual(response.data["deposit_count"], 1)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.make_deposit(user=owner, song=self.make_song(public_key="cached-song-2"), box=box)
+            # Tant que le dépôt n'est pas commité, le cache garde l'état précédent.
+            self.assertEqual(self.client.get(reverse("box-preview"), {"boxSlug": box.url}).data["deposit_count"], 1)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(reverse("box-preview"), {"boxSlug": box.url}).data["deposit_count"], 2)
+
+        IncitationPhrase.objects.create(client=client, text="Une chanson pour l'automne ?", start_date=timezone.localdate(), end_date=timezone.localdate())
+
+        response = self.client.get(reverse("box-preview"), {"boxSlug": box.url})
+        self.assertEqual(response.data["deposit_count"], 2)
+        self.assertEqual(response.data["search_incitation_text"], "Une chanson pour l'automne ?")
+        self.assertEqual(BoxStats.objects.get(box=box).deposit_count, 2)
+
+    def test_box_preview_reads_the_current_song_image(self):
+        box = self.make_box(url="box-preview-cover", name="Box preview cover")
+        song = self.make_song(public_key="preview-cover-song")
+        self.make_deposit(user=self.make_user(username="owner-preview-cover"), song=song, box=box)
+
+        song.image_url = "https://example.com/new-cover.jpg"
+        song.save(update_fields=["image_url"])
+
+        response = self.client.get(reverse("box-preview"), {"boxSlug": box.url})
+        self.assertEqual(response.data["last_deposit_song_image_url"], "https://example.com/new-cover.jpg")
+
+    def test_box_stats_are_rebuilt_when_a_deposit_is_deleted(self):
+        box = self.make_box(url="box-stats-delete", name="Box stats delete")
+        owner = self.make_user(username="owner-stats-delete")
+        first = self.make_deposit(user=owner, song=self.make_song(public_key="stats-song-1"), box=box, deposited_at=timezone.now() - timedelta(hours=2))
+        latest = self.make_deposit(user=owner, song=self.make_song(public_key="stats-song-2"), box=box)
+
+        latest.delete()
+
+        stats = BoxStats.objects.get(box=box)
+        self.assertEqual((stats.deposit_count, stats.last_deposit_at), (1, first.deposited_at))
+
+    def test_deleting_a_box_with_deposits_cascades_without_rebuilding_stats(self):
+        box = self.make_box(url="box-delete-cascade", name="Box delete cascade")
+        owner = self.make_user(username="owner-delete-cascade")
+        for index in range(3):
+            self.make_deposit(user=owner, song=self.make_song(public_key=f"cascade-song-{index}"), box=box)
+        self.assertEqual(self.client.get(reverse("box-preview"), {"boxSlug": box.url}).status_code, 200)
+
+        with patch.object(BoxStats, "rebuild") as rebuild:
+            box.delete()
+
+        rebuild.assert_not_called()
+        self.assertFalse(Deposit.objects.filter(box_id=box.id).exists())
+        self.assertFalse(BoxStats.objects.filter(box_id=box.id).exists())
+        response = self.client.get(reverse("box-preview"), {"boxSlug": "box-delete-cascade"})
+        self.assertEqual(response.status_code, 404)
+
     def test_box_preview_sets_csrf_cookie(self):
         box = self.make_box(url="box-csrf", name="Box CSRF")
 
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from django.db import connection
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from box_management.builders.deposit_payloads import (
+    DepositBasePayloadMemo,
+    build_deposit_payload_from_instance,
+    build_deposits_payload,
+)
+from box_management.domain.constants import REACTION_SUMMARY_REACTORS_LIMIT, REACTIONS_MODE_SUMMARY
+from box_management.models import Deposit, DiscoveredSong, Reaction
+from box_management.tests.base import FlowboxAPITestCase
+
+
+class DepositPayloadSplitTests(FlowboxAPITestCase):
+    def _load_deposits(self, box):
+        return list(
+            Deposit.objects.filter(box=box)
+            .select_related("song", "box", "user")
+            .prefetch_related(
+                Prefetch(
+                    "reactions",
+                    queryset=Reaction.objects.select_related("emoji", "user").order_by("created_at", "id"),
+                    to_attr="prefetched_reactions",
+                )
+            )
+            .order_by("-deposited_at", "-id")
+        )
+
+    def _setup_box(self):
+        box = self.make_box(url="payload-split-box", name="Payload split box")
+        owner = self.make_user(username="payload-owner")
+        viewer_a = self.make_user(username="payload-viewer-a")
+        viewer_b = self.make_user(username="payload-viewer-b")
+        emoji = self.make_emoji(char="🎧")
+        deposit = self.make_deposit(user=owner, song=self.make_song(public_key="payload-split-song"), box=box)
+        Reaction.objects.create(user=viewer_a, deposit=deposit, emoji=emoji)
+        DiscoveredSong.objects.create(user=viewer_a, deposit=deposit, discovered_type="revealed", context="box")
+        return box, deposit, viewer_a, viewer_b
+
+    def test_warm_memo_matches_uncached_payloads_per_viewer(self):
+        box, _deposit, viewer_a, viewer_b = self._setup_box()
+        memo = DepositBasePayloadMemo()
+
+        for viewer in (viewer_a, viewer_b, None):
+            expected = build_deposits_payload(self._load_deposits(box), viewer=viewer, base_memo=None)
+            memoized = build_deposits_payload(self._load_deposits(box), viewer=viewer, base_memo=memo)
+            self.assertEqual(memoized, expected)
+
+        self.assertEqual(memo.misses, 1)
+        self.assertEqual(memo.hits, 2)
+
+    def test_personalization_does_not_leak_between_viewers(self):
+        box, _deposit, viewer_a, viewer_b = self._setup_box()
+        memo = DepositBasePayloadMemo()
+
+        payload_a = build_deposits_payload(self._load_deposits(box), viewer=viewer_a, base_memo=memo)[0]
+        payload_b = build_deposits_payload(self._load_deposits(box), viewer=viewer_b, base_memo=memo)[0]
+
+        self.assertEqual(payload_a["my_reaction"], {"emoji": "🎧"})
+        self.assertIn("title", payload_a["song"])
+        self.assertIsNone(payload_b["my_reaction"])
+        self.assertNotIn("title", payload_b["song"])
+        self.assertEqual(len(payload_b["reactions"]), 1)
+
+    def test_new_reaction_changes_base_version(self):
+        box, deposit, _viewer_a, viewer_b = self._setup_box()
+        memo = DepositBasePayloadMemo()
+        build_deposits_payload(self._load_deposits(box), viewer=viewer_b, base_memo=memo)
+
+        Reaction.objects.create(user=viewer_b, deposit=deposit, emoji=self.make_emoji(char="🔥"))
+        payload = build_deposits_payload(self._load_deposits(box), viewer=viewer_b, base_memo=memo)[0]
+
+        self.assertEqual(memo.misses, 2)
+        self.assertEqual(len(payload["reactions"]), 2)
+        self.assertEqual(payload["my_reaction"], {"emoji": "🔥"})
+
+    def test_warm_memo_does_not_load_reactions(self):
+        box, _deposit, _viewer_a, viewer_b = self._setup_box()
+        memo = DepositBasePayloadMemo()
+        deposits = Deposit.objects.filter(box=box).select_related("song", "box", "user")
+        build_deposits_payload(list(deposits), viewer=viewer_b, base_memo=memo)
+
+        with CaptureQueriesContext(connection) as ctx:
+            payload = build_deposits_payload(list(deposits), viewer=viewer_b, base_memo=memo)[0]
+
+        self.assertEqual(memo.hits, 1)
+        self.assertEqual(len(payload["reactions"]), 1)
+        self.assertFalse([query for query in ctx.captured_queries if "box_management_reaction" in query["sql"]])
+
+    def test_emoji_change_changes_base_version(self):
+        box, _deposit, _viewer_a, viewer_b = self._setup_box()
+        memo = DepositBasePayloadMemo()
+        build_deposits_payload(self._load_deposits(box), viewer=viewer_b, base_memo=memo)
+
+        emoji = Reaction.objects.get().emoji
+        emoji.active = False
+        emoji.save()
+        payload = build_deposits_payload(self._load_deposits(box), viewer=viewer_b, base_memo=memo)[0]
+
+        self.assertEqual(payload["reactions"], [])
+
+    def test_editing_a_payload_does_not_change_the_memo(self):
+        box, _deposit, viewer_a, _viewer_b = self._setup_box()
+        memo = DepositBasePayloadMemo()
+
+        payload = build_deposits_payload(self._load_deposits(box), viewer=viewer_a, base_memo=memo)[0]
+        payload["song"]["title"] = "Modifié"
+        payload["user"]["username"] = "modifié"
+        payload["reactions"][0]["emoji"] = "❌"
+        again = build_deposits_payload(self._load_deposits(box), viewer=viewer_a, base_memo=memo)[0]
+
+        self.assertEqual(memo.hits, 1)
+        self.assertNotEqual(again["song"]["title"], "Modifié")
+        self.assertEqual(again["user"]["username"], "payload-owner")
+        self.assertEqual(again["reactions"][0]["emoji"], "🎧")
+
+    def test_single_instance_builder_keeps_contract(self):
+        _box, deposit, viewer_a, _viewer_b = self._setup_box()
+
+        payload = build_deposit_payload_from_instance(
+            deposit,
+            include_user=True,
+            include_deposit_time=True,
+            hidden=True,
+            current_user=viewer_a,
+        )
+
+        self.assertEqual(set(payload["song"].keys()), {"image_url", "image_url_small"})
+        self.assertEqual(payload["my_reaction"], {"emoji": "🎧"})
+        self.assertEqual(payload["comments"], {"items": [], "count": 0, "viewer_state": {}})
+
+
+class ReactionSummaryTests(FlowboxAPITestCase):
+    def _setup_popular_deposit(self, reactions_count=5):
+        box = self.make_box(url="reaction-summary-box", name="Reaction summary box")
+        deposit = self.make_deposit(
+            user=self.make_user(username="summary-owner"),
+            song=self.make_song(public_key="reaction-summary-song"),
+            box=box,
+        )
+        fire = self.make_emoji(char="🔥")
+        heart = self.make_emoji(char="💜")
+        reactors = []
+        for index in range(reactions_count):
+            reactor = self.make_user(username=f"summary-reactor-{index}")
+            Reaction.objects.create(user=reactor, deposit=deposit, emoji=fire if index % 2 == 0 else heart)
+            reactors.append(reactor)
+        return box, deposit, reactors
+
+    def test_summary_mode_returns_counts_first_reactors_and_viewer_reaction(self):
+        _box, deposit, reactors = self._setup_popular_deposit(reactions_count=5)
+
+        payload = build_deposits_payload(
+            [Deposit.objects.select_related("song", "box", "user").get(pk=deposit.pk)],
+            viewer=reactors[3],
+            reactions_mode=REACTIONS_MODE_SUMMARY,
+        )[0]
+
+        self.assertEqual(payload["reactions_summary"]["total"], 5)
+        self.assertEqual(
+            payload["reactions_summary"]["counts"],
+            [{"emoji": "🔥", "count": 3}, {"emoji": "💜", "count": 2}],
+        )
+        self.assertEqual(len(payload["reactions"]), REACTION_SUMMARY_REACTORS_LIMIT)
+        self.assertEqual(payload["reactions"][0]["user"]["id"], reactors[0].id)
+        self.assertEqual(payload["my_reaction"], {"emoji": "💜"})
+
+    def test_full_mode_keeps_complete_reaction_list(self):
+        _box, deposit, _reactors = self._setup_popular_deposit(reactions_count=5)
+
+        payload = build_deposits_payload([Deposit.objects.get(pk=deposit.pk)])[0]
+
+        self.assertEqual(len(payload["reactions"]), 5)
+        self.assertNotIn("reactions_summary", payload)
+
+    def test_reactions_list_endpoint_is_paginated_and_filterable(self):
+        _box, deposit, reactors = self._setup_popular_deposit(reactions_count=5)
+        viewer = self.auth(self.make_user(username="summary-list-viewer"))
+        DiscoveredSong.objects.create(user=viewer, deposit=deposit, discovered_type="revealed", context="box")
+
+        response = self.client.get(
+            reverse("reactions-deposit-list", args=[deposit.public_key]), {"limit": 2, "offset": 1}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual([item["user"]["id"] for item in response.data["items"]], [reactors[1].id, reactors[2].id])
+        self.assertTrue(response.data["has_more"])
+        self.assertEqual(response.data["next_offset"], 3)
+
+        response = self.client.get(reverse("reactions-deposit-list", args=[deposit.public_key]), {"emoji": "💜"})
+        self.assertEqual(response.data["count"], 2)
+        self.assertFalse(response.data["has_more"])
+
+    def test_reactions_list_endpoint_unknown_deposit(self):
+        self.auth(self.make_user(username="summary-missing-viewer"))
+        response = self.client.get(reverse("reactions-deposit-list", args=["missing-deposit"]))
+
+        self.assert_api_error(response, 404, "DEPOSIT_NOT_FOUND")
+
+    def test_reactions_list_endpoint_requires_identity(self):
+        _box, deposit, _reactors = self._setup_popular_deposit(reactions_count=2)
+
+        response = self.client.get(reverse("reactions-deposit-list", args=[deposit.public_key]))
+
+        self.assert_api_error(response, 401, "AUTH_REQUIRED")
+
+    def test_reactions_list_endpoint_requires_revealed_deposit(self):
+        _box, deposit, _reactors = self._setup_popular_deposit(reactions_count=2)
+        self.auth(self.make_user(username="summary-unrevealed-viewer"))
+
+        response = self.client.get(reverse("reactions-deposit-list", args=[deposit.public_key]))
+
+        self.assert_api_error(response, 403, "DEPOSIT_NOT_REVEALED")
+
+    def test_reactions_list_endpoint_allows_pinned_deposit_like_reacting(self):
+        box, deposit, _reactors = self._setup_popular_deposit(reactions_count=2)
+        Deposit.objects.filter(pk=deposit.pk).update(deposit_type=Deposit.DEPOSIT_TYPE_PINNED)
+        self.auth(self.make_user(username="summary-pinned-viewer"))
+
+        response = self.client.get(reverse("reactions-deposit-list", args=[deposit.public_key]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_box_content_summary_mode(self):
+        user = self.auth(self.make_user(username="summary-box-viewer"))
+        box, _deposit, _reactors = self._setup_popular_deposit(reactions_count=4)
+        self.auth(user)
+
+        response = self.client.get(reverse("box-content"), {"boxSlug": box.url, "reactions": "summary"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["main"]["reactions_summary"]["total"], 4)
+        self.assertEqual(len(response.data["main"]["reactions"]), REACTION_SUMMARY_REACTORS_LIMIT)
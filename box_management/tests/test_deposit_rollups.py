@@ -0,0 +1,159 @@
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from box_management.models import (
+    AnalyticsWatermark,
+    BoxDailyStats,
+    Comment,
+    Deposit,
+    DiscoveredSong,
+    Reaction,
+    Song,
+    SongDailyStats,
+    UserDailyStats,
+)
+from box_management.services.analytics.rollups import DEPOSIT_ROLLUP_WATERMARK, run_incremental_deposit_rollup
+
+from .base import ClientAdminTestCase, FlowboxAPITestCase
+
+
+class DepositRollupTests(FlowboxAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user(username="rollup-alice")
+        self.bob = self.make_user(username="rollup-bob")
+        self.box = self.make_box(url="rollup-box", name="Rollup box")
+        self.song = self.make_song(public_key="rollup-song", title="Rollup song")
+        self.other_song = self.make_song(public_key="rollup-song-2", title="Rollup song 2")
+        self.make_deposit(user=self.alice, song=self.song, box=self.box, deposited_at=self.at(date(2026, 3, 1), 9))
+        self.make_deposit(user=self.alice, song=self.other_song, box=self.box, deposited_at=self.at(date(2026, 3, 1), 23, 30))
+        self.make_deposit(user=self.bob, song=self.song, box=self.box, deposited_at=self.at(date(2026, 3, 2), 0, 15))
+        self.make_deposit(user=None, song=self.song, box=self.box, deposited_at=self.at(date(2026, 3, 2), 10))
+
+    def at(self, day, hour, minute=0):
+        return timezone.make_aware(datetime.combine(day, datetime.min.time()).replace(hour=hour, minute=minute))
+
+    def test_rollup_groups_by_local_day(self):
+        summary = run_incremental_deposit_rollup(today=date(2026, 3, 3))
+
+        self.assertEqual((summary["start_day"], summary["end_day"]), (date(2026, 3, 1), date(2026, 3, 2)))
+        box_stats = {row.day: row for row in BoxDailyStats.objects.filter(box=self.box)}
+        self.assertEqual(box_stats[date(2026, 3, 1)].deposit_count, 2)
+        self.assertEqual(box_stats[date(2026, 3, 1)].depositor_count, 1)
+        self.assertEqual(box_stats[date(2026, 3, 2)].deposit_count, 2)
+        self.assertEqual(box_stats[date(2026, 3, 2)].depositor_count, 1)
+        self.assertEqual(SongDailyStats.objects.get(song=self.song, day=date(2026, 3, 2)).deposit_count, 2)
+        self.assertFalse(UserDailyStats.objects.filter(user__isnull=True).exists())
+        self.assertEqual(AnalyticsWatermark.objects.get(name=DEPOSIT_ROLLUP_WATERMARK).last_day, date(2026, 3, 2))
+
+    def test_second_run_only_processes_days_after_watermark(self):
+        run_incremental_deposit_rollup(today=date(2026, 3, 3))
+        self.make_deposit(user=self.bob, song=self.song, box=self.box, deposited_at=self.at(date(2026, 3, 1), 12))
+        self.make_deposit(user=self.bob, song=self.song, box=self.box, deposited_at=self.at(date(2026, 3, 3), 12))
+
+        summary = run_incremental_deposit_rollup(today=date(2026, 3, 4))
+
+        self.assertEqual((summary["start_day"], summary["end_day"]), (date(2026, 3, 3), date(2026, 3, 3)))
+        self.assertEqual(BoxDailyStats.objects.get(box=self.box, day=date(2026, 3, 1)).deposit_count, 2)
+        self.assertEqual(BoxDailyStats.objects.get(box=self.box, day=date(2026, 3, 3)).deposit_count, 1)
+
+    def test_rebuild_reprocesses_everything(self):
+        run_incremental_deposit_rollup(today=date(2026, 3, 3))
+        self.make_deposit(user=self.bob, song=self.song, box=self.box, deposited_at=self.at(date(2026, 3, 1), 12))
+
+        run_incremental_deposit_rollup(today=date(2026, 3, 3), rebuild=True)
+
+        box_day = BoxDailyStats.objects.get(box=self.box, day=date(2026, 3, 1))
+        self.assertEqual((box_day.deposit_count, box_day.depositor_count), (3, 2))
+
+    def test_rollup_counts_reveals_reactions_and_published_comments(self):
+        deposit = self.make_deposit(user=self.alice, song=self.song, box=self.box, deposited_at=self.at(date(2026, 3, 1), 8))
+        reveal = DiscoveredSong.objects.create(deposit=deposit, user=self.bob)
+        DiscoveredSong.objects.filter(pk=reveal.pk).update(discovered_at=self.at(date(2026, 3, 2), 11))
+        reaction = Reaction.objects.create(user=self.bob, deposit=deposit, emoji=self.make_emoji())
+        Reaction.objects.filter(pk=reaction.pk).update(created_at=self.at(date(2026, 3, 2), 12))
+        for text, comment_status in (("Top", Comment.STATUS_PUBLISHED), ("Spam", Comment.STATUS_QUARANTINED)):
+            comment = Comment.objects.create(deposit=deposit, user=self.bob, text=text, status=comment_status)
+            Comment.objects.filter(pk=comment.pk).update(created_at=self.at(date(2026, 3, 1), 20))
+
+        run_incremental_deposit_rollup(today=date(2026, 3, 3))
+
+        first_day = BoxDailyStats.objects.get(box=self.box, day=date(2026, 3, 1))
+        second_day = BoxDailyStats.objects.get(box=self.box, day=date(2026, 3, 2))
+        self.assertEqual((first_day.deposit_count, first_day.comment_count, first_day.reveal_count), (3, 1, 0))
+        self.assertEqual((second_day.reveal_count, second_day.reaction_count, second_day.comment_count), (1, 1, 0))
+
+    def test_command_reports_processed_range(self):
+        out = StringIO()
+        call_command("rollup_deposit_stats", stdout=out)
+
+        self.assertIn("agrégés", out.getvalue())
+        self.assertTrue(BoxDailyStats.objects.filter(day=date(2026, 3, 1)).exists())
+        self.assertEqual(
+            AnalyticsWatermark.objects.get(name=DEPOSIT_ROLLUP_WATERMARK).last_day,
+            timezone.localdate() - timedelta(days=1),
+        )
+
+
+class ClientAdminStatsTests(ClientAdminTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client_a = self.make_client(name="Stats A", slug="stats-a")
+        self.client_b = self.make_client(name="Stats B", slug="stats-b")
+        self.owner_a = self.make_client_user(username="stats-owner-a", client=self.client_a)
+        self.box_a = self.make_box(client=self.client_a, name="Stats box A", url="stats-box-a")
+        self.box_b = self.make_box(client=self.client_b, name="Stats box B", url="stats-box-b")
+        BoxDailyStats.objects.create(box=self.box_a, day=date(2026, 3, 1), deposit_count=4, depositor_count=3, reveal_count=2, reaction_count=1, comment_count=1)
+        BoxDailyStats.objects.create(box=self.box_a, day=date(2026, 3, 2), deposit_count=1, depositor_count=1, reveal_count=5)
+        BoxDailyStats.objects.create(box=self.box_a, day=date(2026, 2, 1), deposit_count=9, depositor_count=9)
+        BoxDailyStats.objects.create(box=self.box_b, day=date(2026, 3, 1), deposit_count=7, depositor_count=7)
+        self.url = reverse("client-admin-stats")
+        self.auth(self.owner_a)
+
+    def test_returns_daily_rows_and_totals_for_client_boxes_only(self):
+        response = self.client.get(self.url, {"from": "2026-03-01", "to": "2026-03-31"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([box["slug"] for box in response.data["boxes"]], ["stats-box-a"])
+        box = response.data["boxes"][0]
+        self.assertEqual([day["day"] for day in box["days"]], ["2026-03-01", "2026-03-02"])
+        self.assertEqual(box["days"][0]["depositors"], 3)
+        self.assertEqual(box["totals"], {"deposits": 5, "reveals": 7, "reactions": 1, "comments": 1})
+        self.assertEqual(response.data["totals"]["deposits"], 5)
+
+    def test_second_call_is_served_from_cache(self):
+        params = {"from": "2026-03-01", "to": "2026-03-31"}
+        self.client.get(self.url, params)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries.captured_queries if "box_management_boxdailystats" in query["sql"]])
+
+    def test_today_rollup_refreshes_cached_stats(self):
+        run_incremental_deposit_rollup()
+        today = timezone.localdate().isoformat()
+        params = {"from": today, "to": today}
+        self.assertEqual(self.client.get(self.url, params).data["totals"]["deposits"], 0)
+
+        song = Song.objects.create(public_key="stats-today", title="Stats today")
+        Deposit.objects.create(user=self.owner_a, song=song, box=self.box_a)
+        run_incremental_deposit_rollup(include_today=True)
+
+        self.assertEqual(self.client.get(self.url, params).data["totals"]["deposits"], 1)
+
+    def test_rejects_inverted_or_too_long_range(self):
+        response = self.client.get(self.url, {"from": "2026-03-02", "to": "2026-03-01"})
+        self.assert_api_error(response, status_code=400, code="STATS_RANGE_INVALID")
+
+        response = self.client.get(self.url, {"from": "2024-01-01", "to": "2026-03-01"})
+        self.assert_api_error(response, status_code=400, code="STATS_RANGE_INVALID")
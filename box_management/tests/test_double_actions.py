@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from django.urls import reverse
 from django.utils import timezone
 
+from box_management.domain.constants import COMMENT_LAST_AT_CACHE_NAMESPACE
 from box_management.models import (
     BoxSession,
     Comment,
@@ -18,6 +19,7 @@ from box_management.models import (
 )
 from box_management.services.boxes.session_helpers import open_box_session_for_user
 from box_management.tests.base import FlowboxAPITestCase
+from la_boite_a_son.cache import delete_cached
 
 
 class BoxSessionDepositFieldTests(FlowboxAPITestCase):
@@ -338,6 +340,8 @@ class CommentAndShareDoubleActionTests(FlowboxAPITestCase):
 
         first = self.client.post(reverse("comments-create"), payload, format="json")
         Comment.objects.filter(user=user).update(created_at=timezone.now() - timedelta(minutes=5))
+        # Le dernier commentaire est mémorisé dans le cache : on simule l'écoulement du cooldown.
+        delete_cached(COMMENT_LAST_AT_CACHE_NAMESPACE, user.id)
         second = self.client.post(reverse("comments-create"), payload, format="json")
 
         self.assertEqual(first.status_code, 201)
@@ -456,6 +460,7 @@ class CommentAndShareDoubleActionTests(FlowboxAPITestCase):
         payload = {"dep_public_key": self.deposit.public_key, "text": "première"}
         self.assertEqual(self.client.post(reverse("comments-create"), payload, format="json").status_code, 201)
         Comment.objects.filter(user=first_user).update(created_at=timezone.now() - timedelta(minutes=5))
+        delete_cached(COMMENT_LAST_AT_CACHE_NAMESPACE, first_user.id)
 
         self.auth(first_user)
         allowed_again = self.client.post(reverse("comments-create"), payload, format="json")
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from box_management.services.pinned.pricing import (
+    PINNED_PRICE_STEPS_CONFIG,
+    get_pinned_price_step,
+    get_pinned_price_steps_raw,
+    parse_pinned_price_steps,
+)
+from la_boite_a_son.json_config import JsonConfigFile
+
+
+class JsonConfigFileTests(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = Path(self.tmpdir.name) / "steps.json"
+
+    def write(self, payload, mtime_ns):
+        self.path.write_text(json.dumps(payload), encoding="utf-8")
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_parses_once_and_reloads_on_mtime_change(self):
+        self.write([{"minutes": 20, "points": 5}, {"minutes": 10, "points": 3}], 1_000_000_000)
+        config = JsonConfigFile(self.path, parse_pinned_price_steps)
+
+        first = config.get()
+        self.assertIs(config.get(), first)
+        self.assertEqual([step["minutes"] for step in first], [10, 20])
+        with self.assertRaises(TypeError):
+            first[0]["points"] = 0
+
+        self.write([{"minutes": 30, "points": 9}], 2_000_000_000)
+        self.assertEqual(config.get()[0]["minutes"], 30)
+        self.assertEqual(config.loads, 2)
+
+    def test_invalid_file_fails_at_startup_but_keeps_last_good_value_at_runtime(self):
+        self.write([{"minutes": "dix", "points": 5}], 1_000_000_000)
+        with self.assertRaises(ImproperlyConfigured):
+            JsonConfigFile(self.path, parse_pinned_price_steps).validate()
+
+        self.write([{"minutes": 10, "points": 5}], 2_000_000_000)
+        config = JsonConfigFile(self.path, parse_pinned_price_steps)
+        good = config.get()
+        self.write([{"minutes": 10, "points": 5}, {"minutes": 10, "points": 6}], 3_000_000_000)
+        with self.assertLogs("la_boite_a_son.json_config", level="ERROR"):
+            self.assertIs(config.get(), good)
+
+    def test_pricing_helpers_return_serializable_copies(self):
+        raw = get_pinned_price_steps_raw()
+
+        self.assertIsInstance(raw[0], dict)
+        self.assertEqual(json.loads(json.dumps(raw)), raw)
+        self.assertEqual(get_pinned_price_step(raw[0]["minutes"])["points"], raw[0]["points"])
+        self.assertEqual(PINNED_PRICE_STEPS_CONFIG.get()[0]["minutes"], raw[0]["minutes"])
@@ -0,0 +1,77 @@
+import copy
+import json
+
+from django.test import SimpleTestCase
+
+from box_management.services.comments.moderation_rules import _detect_comment_pre_creation_error, _score_comment_risk
+from la_boite_a_son.moderation import MODERATION_RULES_PATH, ModerationEngine, parse_moderation_rules, scan_text
+from private_messages.services.moderation import validate_message_text
+
+
+class ModerationEngineTests(SimpleTestCase):
+    def setUp(self):
+        self.raw_rules = json.loads(MODERATION_RULES_PATH.read_text(encoding="utf-8"))
+
+    def test_single_scan_returns_every_flag(self):
+        scan = scan_text("On sait où tu habites, connard !!!!!!")
+
+        self.assertEqual(scan.block_flags, ())
+        self.assertEqual(scan.risk_flags, ("spam", "harassment", "doxxing"))
+        self.assertEqual(scan.score, 100)
+
+    def test_rules_matching_at_the_same_position_are_all_reported(self):
+        for text in ("111111112", "appelle 000000001 stp"):
+            scan = scan_text(text)
+            self.assertEqual((scan.block_flags, scan.risk_flags), (("phone_forbidden",), ("spam",)), text)
+        self.assertEqual(_detect_comment_pre_creation_error("appelle 000000001 stp"), "phone_forbidden")
+        self.assertEqual(
+            validate_message_text("111111112")[1], "Les numéros de téléphone ne sont pas autorisés en messagerie."
+        )
+
+    def test_comment_rules_keep_their_priorities(self):
+        self.assertEqual(_detect_comment_pre_creation_error(""), "empty")
+        self.assertEqual(_detect_comment_pre_creation_error("x" * 101), "too_long")
+        self.assertEqual(_detect_comment_pre_creation_error("écris à a.b@mail.com"), "link_forbidden")
+        self.assertEqual(_detect_comment_pre_creation_error("moi@exemple"), None)
+        self.assertEqual(_detect_comment_pre_creation_error("appelle 06 12 34 56 78"), "phone_forbidden")
+        self.assertEqual(_detect_comment_pre_creation_error("1234-567"), None)
+        self.assertEqual(_detect_comment_pre_creation_error("Super morceau"), None)
+
+        self.assertEqual(
+            _score_comment_risk(text="T'es un CONNARD", normalized_text="t'es un connard"), (70, ["harassment"])
+        )
+        self.assertEqual(_score_comment_risk(text="Super morceau", normalized_text="super morceau"), (0, []))
+
+    def test_private_messages_use_the_shared_rules(self):
+        self.assertEqual(validate_message_text("  Merci pour la reco  "), (True, "Merci pour la reco"))
+        self.assertEqual(
+            validate_message_text("va sur www.site.fr")[1], "Les liens ne sont pas autorisés en messagerie."
+        )
+        self.assertEqual(validate_message_text("sale pute")[1], "Le message contient du contenu inapproprié.")
+        self.assertTrue(validate_message_text("on va en parler, c'est une dispute")[0])
+        # Le doxxing ne fait que scorer les commentaires : la messagerie, elle, ne l'a jamais bloqué.
+        self.assertEqual(
+            validate_message_text("tu peux me donner ton adresse ?"), (True, "tu peux me donner ton adresse ?")
+        )
+        self.assertEqual(validate_message_text("waouh!!! trop bien!!!")[1], "Le message ressemble à du spam.")
+
+    def test_rules_are_loaded_from_data(self):
+        raw = copy.deepcopy(self.raw_rules)
+        raw["rules"].append({"flag": "custom", "action": "score", "score": 10, "patterns": [r"\bbanane\b"]})
+
+        scan = ModerationEngine(parse_moderation_rules(raw)).scan("Une banane")
+
+        self.assertEqual((scan.risk_flags, scan.score), (("custom",), 10))
+
+    def test_invalid_rules_are_rejected(self):
+        for mutate in (
+            lambda raw: raw["rules"].append({"flag": "x", "action": "ban", "patterns": ["a"]}),
+            lambda raw: raw["rules"].append({"flag": "x", "action": "block", "patterns": ["("]}),
+            lambda raw: raw["rules"].append({"flag": "x", "action": "block", "patterns": [r"(a)\1"]}),
+            lambda raw: raw["rules"].append(dict(raw["rules"][0])),
+            lambda raw: raw["signals"].pop("spam"),
+        ):
+            raw = copy.deepcopy(self.raw_rules)
+            mutate(raw)
+            with self.assertRaises(ValueError):
+                parse_moderation_rules(raw)
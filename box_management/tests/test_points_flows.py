@@ -6,7 +6,16 @@ from unittest.mock import patch
 from django.urls import reverse
 from django.utils import timezone
 
-from box_management.models import BoxSession, Deposit, DiscoveredSong, EmojiRight, Reaction
+from box_management.models import (
+    BoxSession,
+    Deposit,
+    DiscoveredSong,
+    EmojiRight,
+    Reaction,
+    SongBoxPresence,
+    UserBoxStats,
+)
+from box_management.services.deposits.achievements import build_successes
 from box_management.tests.base import FlowboxAPITestCase
 from la_boite_a_son.economy import (
     COST_REVEAL_BOX,
@@ -984,3 +993,57 @@ class DepositPointsFlowTests(FlowboxAPITestCase):
         user.refresh_from_db()
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["points_balance"], user.points)
+
+
+class DepositPresenceStatsTests(FlowboxAPITestCase):
+    def test_deposits_maintain_user_box_stats_and_song_presence(self):
+        user = self.make_user(username="presence-user")
+        box = self.make_box(url="box-presence", name="Box presence")
+        song = self.make_song(public_key="presence-song")
+        now = timezone.now()
+        for days_ago in (4, 2, 1, 1):
+            self.make_deposit(user=user, song=song, box=box, deposited_at=now - timedelta(days=days_ago))
+        self.make_deposit(user=user, song=song, deposit_type=Deposit.DEPOSIT_TYPE_FAVORITE)
+
+        stats = UserBoxStats.objects.get(user=user, box=box)
+        self.assertEqual((stats.deposit_count, stats.current_streak), (4, 2))
+        self.assertEqual(stats.streak_before(timezone.localdate()), 2)
+        self.assertEqual(SongBoxPresence.objects.get(song=song, box=box).deposit_count, 4)
+        self.assertTrue(SongBoxPresence.objects.filter(song=song, box__isnull=True).exists())
+
+    def test_deleting_deposits_rebuilds_user_box_stats_and_song_presence(self):
+        user = self.make_user(username="presence-delete")
+        box = self.make_box(url="box-presence-delete", name="Box presence delete")
+        song = self.make_song(public_key="presence-delete-song", title="Gone", artists=["Gone artist"])
+        now = timezone.now()
+        oldest = self.make_deposit(user=user, song=song, box=box, deposited_at=now - timedelta(days=3))
+        latest = self.make_deposit(user=user, song=song, box=box, deposited_at=now - timedelta(days=1))
+
+        oldest.delete()
+
+        stats = UserBoxStats.objects.get(user=user, box=box)
+        self.assertEqual((stats.deposit_count, stats.first_deposit_at), (1, latest.deposited_at))
+        presence = SongBoxPresence.objects.get(song=song, box=box)
+        self.assertEqual((presence.deposit_count, presence.first_deposit_at), (1, latest.deposited_at))
+
+        latest.delete()
+
+        self.assertFalse(UserBoxStats.objects.filter(user=user, box=box).exists())
+        self.assertFalse(SongBoxPresence.objects.filter(song=song, box=box).exists())
+        deposit = self.make_deposit(user=user, song=song, box=box)
+        successes, _points = build_successes(box=box, user=user, song=song, current_deposit=deposit)
+        self.assertIn("Nouvelle dans cette boîte", [success["name"] for success in successes])
+
+    def test_achievements_read_stats_in_constant_queries(self):
+        user = self.make_user(username="presence-regular")
+        box = self.make_box(url="box-presence-2", name="Box presence 2")
+        song = self.make_song(public_key="presence-song-2", title="Regular", artists=["Regular artist"])
+        for days_ago in range(1, 40):
+            self.make_deposit(user=user, song=song, box=box, deposited_at=timezone.now() - timedelta(days=days_ago))
+        deposit = self.make_deposit(user=user, song=song, box=box)
+
+        with self.assertNumQueries(2):
+            successes, points = build_successes(box=box, user=user, song=song, current_deposit=deposit)
+
+        self.assertEqual(points, NB_POINTS_ADD_SONG + 39 * NB_POINTS_CONSECUTIVE_DAYS_BOX)
+        self.assertEqual([success["name"] for success in successes], ["Série en cours", "Dépôt validé", "Total"])
@@ -0,0 +1,36 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from la_boite_a_son.sqlite import build_conn_max_age, build_sqlite_options
+
+
+class SqliteOptionsTests(SimpleTestCase):
+    def test_defaults_enable_wal_and_immediate_transactions(self):
+        options = build_sqlite_options({})
+
+        self.assertIn("PRAGMA journal_mode=WAL", options["init_command"])
+        self.assertIn("PRAGMA synchronous=NORMAL", options["init_command"])
+        self.assertEqual(options["timeout"], 5.0)
+        self.assertEqual(options["transaction_mode"], "IMMEDIATE")
+
+    def test_environment_overrides_and_invalid_values_fall_back(self):
+        options = build_sqlite_options({"SQLITE_BUSY_TIMEOUT_MS": "12000", "SQLITE_SYNCHRONOUS": "bogus", "SQLITE_CACHE_SIZE_KB": "64"})
+
+        self.assertIn("PRAGMA busy_timeout=12000", options["init_command"])
+        self.assertIn("PRAGMA synchronous=NORMAL", options["init_command"])
+        self.assertIn("PRAGMA cache_size=-64", options["init_command"])
+        self.assertEqual(options["timeout"], 12.0)
+
+    def test_conn_max_age_from_environment(self):
+        self.assertEqual(build_conn_max_age({}), 60)
+        self.assertEqual(build_conn_max_age({"DB_CONN_MAX_AGE": "0"}), 0)
+        self.assertIsNone(build_conn_max_age({"DB_CONN_MAX_AGE": "persistent"}))
+
+
+class SqliteConnectionTests(TestCase):
+    def test_pragmas_are_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)
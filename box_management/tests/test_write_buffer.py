@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from box_management.models import CommentAttemptLog, Link
+from la_boite_a_son.write_buffer import WriteBuffer
+from users.models import CustomUser
+from users.utils import touch_last_seen
+
+from .base import FlowboxAPITestCase
+
+
+class WriteBufferTests(FlowboxAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = self.make_user(username="buffer-owner")
+        self.deposit = self.make_deposit(user=self.owner, song=self.make_song(public_key="buffer-song"), box=self.make_box(url="buffer-box"))
+        self.link = Link.objects.create(deposit=self.deposit, created_by=self.owner)
+        self.buffer = WriteBuffer(max_size=100, auto_start=False)
+
+    def test_increments_are_coalesced_into_one_update(self):
+        for _ in range(5):
+            self.buffer.increment(Link, self.link.pk, "anonymous_view_count")
+
+        self.assertEqual(self.buffer.get_metrics()["depth"], 5)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.buffer.flush(), 5)
+
+        self.assertEqual(len([query for query in queries.captured_queries if query["sql"].startswith("UPDATE")]), 1)
+        self.link.refresh_from_db()
+        self.assertEqual(self.link.anonymous_view_count, 5)
+        metrics = self.buffer.get_metrics()
+        self.assertEqual((metrics["depth"], metrics["flushes"], metrics["flushed_ops"]), (0, 1, 5))
+        self.assertGreaterEqual(metrics["max_flush_ms"], metrics["last_flush_ms"])
+
+    def test_last_seen_is_deferred_until_flush_when_enabled(self):
+        viewer = self.make_user(username="buffer-viewer")
+        with override_settings(WRITE_BUFFER_ENABLED=True), patch("la_boite_a_son.write_buffer._write_buffer", self.buffer):
+            touch_last_seen(viewer)
+            touch_last_seen(viewer)
+
+        self.assertIsNone(CustomUser.objects.get(pk=viewer.pk).last_seen_at)
+        self.buffer.flush()
+        self.assertEqual(CustomUser.objects.get(pk=viewer.pk).last_seen_at, viewer.last_seen_at)
+
+    def test_invalid_row_does_not_drop_the_rest_of_the_batch(self):
+        self.buffer.create(CommentAttemptLog(user=self.owner, text="spam", reason_code="spam"))
+        self.buffer.create(CommentAttemptLog(user=self.owner, text="broken", reason_code=None))
+        self.buffer.increment(Link, self.link.pk, "anonymous_view_count")
+
+        with self.assertLogs("la_boite_a_son.write_buffer", level="ERROR"):
+            self.buffer.flush()
+
+        self.assertEqual(CommentAttemptLog.objects.filter(user=self.owner).count(), 1)
+        self.assertEqual(Link.objects.get(pk=self.link.pk).anonymous_view_count, 1)
+        self.assertEqual(self.buffer.get_metrics()["errors"], 1)
+
+    def test_full_queue_flushes_inline(self):
+        buffer = WriteBuffer(max_size=2, auto_start=False)
+        buffer.increment(Link, self.link.pk, "anonymous_view_count")
+        buffer.increment(Link, self.link.pk, "anonymous_view_count")
+
+        self.assertEqual(buffer.get_metrics()["depth"], 0)
+        self.assertEqual(Link.objects.get(pk=self.link.pk).anonymous_view_count, 2)
+
+    def test_anonymous_public_link_view_increments_counter(self):
+        response = self.client.get(reverse("share-link-public-detail", kwargs={"link_slug": self.link.slug}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Link.objects.get(pk=self.link.pk).anonymous_view_count, 1)
+        self.assertGreater(Link.objects.get(pk=self.link.pk).expires_at, timezone.now())
@@ -1,5 +1,6 @@
 from django.urls import path
 
+from box_management.api.views.analytics import ClientAdminStatsView
 from box_management.api.views.comments import (
     ClientAdminCommentListView,
     ClientAdminCommentModerateView,
@@ -7,6 +8,7 @@ from box_management.api.views.comments import (
     CommentCreateView,
     CommentDetailView,
     CommentReportView,
+    DepositReactionsView,
     DepositRepliesView,
     ReactionView,
 )
@@ -40,6 +42,9 @@ from box_management.api.views.stickers import (
     ClientAdminStickerAssignView,
     ClientAdminStickerConfirmDownloadView,
     ClientAdminStickerDownloadView,
+    ClientAdminStickerExportJobCreateView,
+    ClientAdminStickerExportJobDetailView,
+    ClientAdminStickerExportJobDownloadView,
     ClientAdminStickerGenerateView,
     ClientAdminStickerInstallView,
     ClientAdminStickerListView,
@@ -66,6 +71,7 @@ urlpatterns = [
     path("emojis/catalog", EmojiCatalogView.as_view(), name="emoji-catalog"),
     path("emojis/purchase", PurchaseEmojiView.as_view(), name="emoji-purchase"),
     path("reactions", ReactionView.as_view(), name="reactions"),
+    path("reactions/deposit/<str:dep_public_key>/", DepositReactionsView.as_view(), name="reactions-deposit-list"),
     path("comments/", CommentCreateView.as_view(), name="comments-create"),
     path("comments/deposit/<str:dep_public_key>/", DepositRepliesView.as_view(), name="comments-deposit-replies"),
     path("comments/<int:comment_id>/", CommentDetailView.as_view(), name="comments-detail"),
@@ -96,6 +102,11 @@ urlpatterns = [
         ClientAdminCommentListView.as_view(),
         name="client-admin-comments-list",
     ),
+    path(
+        "client-admin/stats/",
+        ClientAdminStatsView.as_view(),
+        name="client-admin-stats",
+    ),
     path(
         "client-admin/stickers/",
         ClientAdminStickerListView.as_view(),
@@ -116,6 +127,21 @@ urlpatterns = [
         ClientAdminStickerDownloadView.as_view(),
         name="client-admin-stickers-download",
     ),
+    path(
+        "client-admin/stickers/export-jobs/",
+        ClientAdminStickerExportJobCreateView.as_view(),
+        name="client-admin-sticker-export-jobs",
+    ),
+    path(
+        "client-admin/stickers/export-jobs/<int:job_id>/",
+        ClientAdminStickerExportJobDetailView.as_view(),
+        name="client-admin-sticker-export-jobs-detail",
+    ),
+    path(
+        "client-admin/stickers/export-jobs/<int:job_id>/download/",
+        ClientAdminStickerExportJobDownloadView.as_view(),
+        name="client-admin-sticker-export-jobs-download",
+    ),
     path(
         "client-admin/stickers/confirm-download/",
         ClientAdminStickerConfirmDownloadView.as_view(),
@@ -0,0 +1,99 @@
+"""
+Couche commune au-dessus de django.core.cache.
+
+- clés namespacées et versionnées : `namespace:v<version>:part1:part2` ;
+- invalidation par namespace : `bump_namespace_version` rend toutes les clés existantes
+  inaccessibles sans les parcourir (elles expirent d'elles-mêmes) ;
+- `get_or_compute` typé, qui sait aussi mettre en cache une valeur None.
+
+Le backend se choisit via CACHE_BACKEND (locmem, file, db) : file et db sont partagés entre
+workers gunicorn sans service externe (db nécessite `manage.py createcachetable`).
+"""
+
+from collections.abc import Callable
+from datetime import datetime, time, timedelta
+from typing import TypeVar
+
+from django.core.cache import cache
+from django.utils import timezone
+
+T = TypeVar("T")
+
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "db": "django.core.cache.backends.db.DatabaseCache",
+}
+DEFAULT_CACHE_LOCATIONS = {
+    "locmem": "la-boite-a-son",
+    "file": "/var/tmp/la_boite_a_son_cache",
+    "db": "django_cache",
+}
+
+_MISSING = object()
+_NONE = "__cache_none__"
+
+
+def build_caches_setting(environ):
+    backend = (environ.get("CACHE_BACKEND") or "locmem").strip().lower()
+    if backend not in CACHE_BACKENDS:
+        backend = "locmem"
+    return {
+        "default": {
+            "BACKEND": CACHE_BACKENDS[backend],
+            "LOCATION": environ.get("CACHE_LOCATION") or DEFAULT_CACHE_LOCATIONS[backend],
+            "TIMEOUT": int(environ.get("CACHE_DEFAULT_TIMEOUT", "300") or 300),
+            "KEY_PREFIX": environ.get("CACHE_KEY_PREFIX", "lbas"),
+            "OPTIONS": {"MAX_ENTRIES": int(environ.get("CACHE_MAX_ENTRIES", "10000") or 10000)},
+        }
+    }
+
+
+def _version_key(namespace):
+    return f"ns-version:{namespace}"
+
+
+def get_namespace_version(namespace):
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        cache.add(_version_key(namespace), 1, None)
+        version = cache.get(_version_key(namespace)) or 1
+    return int(version)
+
+
+def bump_namespace_version(namespace):
+    """Invalide toutes les clés du namespace ; renvoie la nouvelle version."""
+    try:
+        return cache.incr(_version_key(namespace))
+    except ValueError:
+        # Version absente (premier appel ou éviction) : on repart au-delà de la valeur implicite 1.
+        cache.set(_version_key(namespace), 2, None)
+        return 2
+
+
+def make_cache_key(namespace, *parts):
+    suffix = ":".join(str(part) for part in parts)
+    return f"{namespace}:v{get_namespace_version(namespace)}:{suffix}"
+
+
+def get_or_compute(namespace: str, parts: tuple, compute: Callable[[], T], timeout: int | None = 300) -> T:
+    key = make_cache_key(namespace, *parts)
+    cached = cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        return None if isinstance(cached, str) and cached == _NONE else cached
+    value = compute()
+    cache.set(key, _NONE if value is None else value, timeout)
+    return value
+
+
+def delete_cached(namespace, *parts):
+    cache.delete(make_cache_key(namespace, *parts))
+
+
+def seconds_until_local_midnight(now=None):
+    """TTL des entrées valables jusqu'à la fin de la journée locale (TIME_ZONE)."""
+    local_now = timezone.localtime(now or timezone.now())
+    next_midnight = timezone.make_aware(
+        datetime.combine(local_now.date() + timedelta(days=1), time.min), timezone.get_current_timezone()
+    )
+    return max(1, int((next_midnight - local_now).total_seconds()) + 1)
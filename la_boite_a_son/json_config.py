@@ -0,0 +1,95 @@
+"""
+Chargeur commun des fichiers de configuration JSON versionnés avec le code (paliers d'épinglage,
+statuts utilisateurs...).
+
+Chaque fichier est lu, validé et figé (tuples de mappings en lecture seule) une fois par processus,
+puis relu seulement si son mtime change. Un fichier invalide lève ImproperlyConfigured au démarrage
+(AppConfig.ready) ; une édition invalide à chaud est journalisée et l'ancienne valeur reste servie.
+"""
+
+import json
+import logging
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Copie modifiable et sérialisable (réponses API) d'une valeur figée."""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class JsonConfigFile:
+    def __init__(self, path: Path, parse: Callable[[Any], Any]):
+        self.path = Path(path)
+        self.parse = parse
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._value = None
+        self.loads = 0
+
+    def _read(self):
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            return freeze(self.parse(raw))
+        except (OSError, ValueError, TypeError) as exc:
+            raise ImproperlyConfigured(f"Configuration JSON invalide ({self.path.name}) : {exc}") from exc
+
+    def get(self):
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError as exc:
+            if self._mtime is None:
+                raise ImproperlyConfigured(f"Configuration JSON introuvable : {self.path}") from exc
+            return self._value
+        if mtime == self._mtime:
+            return self._value
+
+        with self._lock:
+            if mtime == self._mtime:
+                return self._value
+            try:
+                value = self._read()
+            except ImproperlyConfigured:
+                if self._mtime is None:
+                    raise
+                logger.exception("Rechargement ignoré, configuration précédente conservée (%s)", self.path.name)
+                return self._value
+            self._value, self._mtime = value, mtime
+            self.loads += 1
+            return value
+
+    def validate(self):
+        """Appelé au démarrage : lève ImproperlyConfigured si le fichier est absent ou invalide."""
+        self.get()
+
+
+def require_int(item, key, *, minimum):
+    value = item.get(key) if isinstance(item, dict) else None
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise ValueError(f"{key} doit être un entier ≥ {minimum} (reçu {value!r})")
+    return value
+
+
+def require_list(raw):
+    if not isinstance(raw, list):
+        raise ValueError("une liste JSON est attendue")
+    return raw
@@ -0,0 +1,219 @@
+"""
+Moteur de modération commun aux commentaires et aux messages privés.
+
+Les règles (liens, emails, téléphones, insultes, doxxing...) sont chargées depuis
+data/moderation_rules.json et compilées en une seule alternance de groupes nommés, placée dans
+un lookahead : un seul parcours du texte normalisé repère les positions où au moins une règle
+matche, au lieu d'une regex par motif. Ces positions (rares) sont ensuite revérifiées avec un
+lookahead optionnel par motif, pour rapporter toutes les règles qui y commencent et pas seulement
+la première alternative. Les motifs s'écrivent en minuscules (le texte est normalisé avant le scan).
+Les signaux structurels (répétition, faible variété, bruit de symboles) sont calculés dans la
+même passe ou en une opération C chacun.
+
+Chaque canal décide ensuite quoi faire des flags : blocage immédiat (action "block") ou score
+de risque (action "score").
+"""
+
+import re
+import threading
+from pathlib import Path
+
+from la_boite_a_son.json_config import JsonConfigFile, require_int, require_list
+
+MODERATION_RULES_PATH = Path(__file__).resolve().parent / "data" / "moderation_rules.json"
+
+MODERATION_ACTIONS = ("block", "score")
+MODERATION_SPAM_FLAG = "spam"
+MODERATION_LOW_VARIATION_FLAG = "low_variation"
+MODERATION_SYMBOL_NOISE_FLAG = "symbol_noise"
+
+_ZERO_WIDTH_RE = re.compile("[​‌‍]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_DIGIT_RE = re.compile(r"\d")
+_SYMBOL_RE = re.compile(r"[^\w\sÀ-ÿ]")
+
+
+def normalize_moderation_text(value: str | None) -> str:
+    value = _ZERO_WIDTH_RE.sub("", str(value or ""))
+    return _WHITESPACE_RE.sub(" ", value).strip().lower()
+
+
+def _require_signal(signals, name, *keys):
+    signal = signals.get(name)
+    if not isinstance(signal, dict):
+        raise ValueError(f"signal {name!r} manquant")
+    return {key: require_int(signal, key, minimum=1 if key != "score" else 0) for key in keys}
+
+
+def parse_moderation_rules(raw) -> dict:
+    if not isinstance(raw, dict):
+        raise ValueError("un objet JSON est attendu")
+
+    rules = []
+    seen_flags = set()
+    for item in require_list(raw.get("rules")):
+        flag = str(item.get("flag") or "").strip() if isinstance(item, dict) else ""
+        if not flag or flag in seen_flags:
+            raise ValueError(f"règle sans flag ou flag en double : {item!r}")
+        seen_flags.add(flag)
+        action = item.get("action")
+        if action not in MODERATION_ACTIONS:
+            raise ValueError(f"{flag} : action inconnue {action!r}")
+        patterns = require_list(item.get("patterns"))
+        if not patterns or not all(isinstance(pattern, str) and pattern for pattern in patterns):
+            raise ValueError(f"{flag} : patterns doit être une liste de regex non vides")
+        for pattern in patterns:
+            try:
+                compiled = re.compile(pattern)
+            except re.error as exc:
+                raise ValueError(f"{flag} : regex invalide {pattern!r} ({exc})") from exc
+            # Une fois intégré aux regex communes, un groupe numéroté (ou une référence arrière) viserait
+            # le mauvais groupe : seuls les groupes non capturants sont acceptés.
+            if compiled.groups:
+                raise ValueError(f"{flag} : utiliser des groupes non capturants (?:...) dans {pattern!r}")
+        rules.append(
+            {
+                "flag": flag,
+                "action": action,
+                "score": require_int(item, "score", minimum=0) if action == "score" else 0,
+                "min_digits": require_int(item, "min_digits", minimum=1) if "min_digits" in item else 0,
+                "patterns": list(patterns),
+            }
+        )
+
+    signals = raw.get("signals") if isinstance(raw.get("signals"), dict) else {}
+    parsed = {
+        "rules": rules,
+        "signals": {
+            MODERATION_SPAM_FLAG: _require_signal(signals, MODERATION_SPAM_FLAG, "min_run", "score"),
+            MODERATION_LOW_VARIATION_FLAG: _require_signal(
+                signals, MODERATION_LOW_VARIATION_FLAG, "min_length", "max_distinct", "score"
+            ),
+            MODERATION_SYMBOL_NOISE_FLAG: _require_signal(signals, MODERATION_SYMBOL_NOISE_FLAG, "min_count", "score"),
+        },
+    }
+    try:
+        ModerationEngine(parsed)
+    except re.error as exc:
+        raise ValueError(f"règles incompatibles dans l'alternance commune ({exc})") from exc
+    return parsed
+
+
+class ModerationScan:
+    def __init__(self, *, normalized_text, block_flags, risk_flags, score):
+        self.normalized_text = normalized_text
+        self.block_flags = block_flags
+        self.risk_flags = risk_flags
+        self.score = score
+
+    @property
+    def blocking_flag(self):
+        return self.block_flags[0] if self.block_flags else None
+
+    @property
+    def flags(self):
+        return self.block_flags + self.risk_flags
+
+
+class ModerationEngine:
+    def __init__(self, config):
+        self.rules = list(config["rules"])
+        self.signals = config["signals"]
+
+        spam = self.signals[MODERATION_SPAM_FLAG]
+        spam_pattern = f"(?P<_spam_char>.)(?P=_spam_char){{{spam['min_run'] - 1},}}"
+        alternatives = [f"(?:{spam_pattern})"]
+        position_checks = [f"(?:(?=(?P<_spam>{spam_pattern})))?"]
+        word_alternatives = []
+        self._rule_by_group = {}
+        for rule_index, rule in enumerate(self.rules):
+            for pattern_index, pattern in enumerate(rule["patterns"]):
+                group = f"r{rule_index}_{pattern_index}"
+                self._rule_by_group[group] = rule_index
+                position_checks.append(f"(?:(?=(?P<{group}>{pattern})))?")
+                # Les motifs qui commencent par \b sont regroupés derrière un seul \b : l'alternance
+                # n'est alors essayée qu'aux débuts de mots, pas à chaque caractère.
+                if pattern.startswith(r"\b"):
+                    word_alternatives.append(f"(?:{pattern[2:]})")
+                else:
+                    alternatives.append(f"(?:{pattern})")
+        if word_alternatives:
+            alternatives.append(r"\b(?:" + "|".join(word_alternatives) + ")")
+        # Le texte est déjà normalisé en minuscules : pas de re.IGNORECASE, nettement plus lent.
+        # pattern repère les positions candidates ; à une même position l'alternance s'arrête au premier
+        # motif qui matche, position_pattern essaie ensuite chaque motif dans son propre lookahead.
+        self.pattern = re.compile("(?=" + "|".join(alternatives) + ")", re.DOTALL)
+        self.position_pattern = re.compile("".join(position_checks), re.DOTALL)
+
+    def scan(self, text, normalized_text=None):
+        normalized = normalize_moderation_text(text) if normalized_text is None else normalized_text
+
+        matched_rules = set()
+        has_spam_run = False
+        for match in self.pattern.finditer(normalized):
+            at_position = self.position_pattern.match(normalized, match.start())
+            for group, value in at_position.groupdict().items():
+                if value is None:
+                    continue
+                if group == "_spam":
+                    has_spam_run = True
+                elif group in self._rule_by_group:
+                    matched_rules.add(self._rule_by_group[group])
+
+        digits_count = None
+        block_flags, scored_flags, score = [], [], 0
+        for rule_index, rule in enumerate(self.rules):
+            if rule_index not in matched_rules:
+                continue
+            if rule["min_digits"]:
+                if digits_count is None:
+                    digits_count = len(_DIGIT_RE.findall(normalized))
+                if digits_count < rule["min_digits"]:
+                    continue
+            if rule["action"] == "block":
+                block_flags.append(rule["flag"])
+            else:
+                scored_flags.append(rule["flag"])
+                score += rule["score"]
+
+        signal_flags = []
+        if has_spam_run:
+            signal_flags.append(MODERATION_SPAM_FLAG)
+            score += self.signals[MODERATION_SPAM_FLAG]["score"]
+        low_variation = self.signals[MODERATION_LOW_VARIATION_FLAG]
+        if len(normalized) >= low_variation["min_length"] and len(set(normalized)) <= low_variation["max_distinct"]:
+            signal_flags.append(MODERATION_LOW_VARIATION_FLAG)
+            score += low_variation["score"]
+        symbol_noise = self.signals[MODERATION_SYMBOL_NOISE_FLAG]
+        if len(_SYMBOL_RE.findall(normalized)) >= symbol_noise["min_count"]:
+            signal_flags.append(MODERATION_SYMBOL_NOISE_FLAG)
+            score += symbol_noise["score"]
+
+        return ModerationScan(
+            normalized_text=normalized,
+            block_flags=tuple(block_flags),
+            risk_flags=tuple(signal_flags + scored_flags),
+            score=min(score, 100),
+        )
+
+
+MODERATION_RULES_CONFIG = JsonConfigFile(MODERATION_RULES_PATH, parse_moderation_rules)
+
+_engine = None
+_engine_config = None
+_engine_lock = threading.Lock()
+
+
+def get_moderation_engine() -> ModerationEngine:
+    """Moteur compilé, reconstruit seulement quand le fichier de règles est rechargé."""
+    global _engine, _engine_config
+    config = MODERATION_RULES_CONFIG.get()
+    if config is not _engine_config:
+        with _engine_lock:
+            if config is not _engine_config:
+                _engine, _engine_config = ModerationEngine(config), config
+    return _engine
+
+
+def scan_text(text, normalized_text=None) -> ModerationScan:
+    return get_moderation_engine().scan(text, normalized_text=normalized_text)
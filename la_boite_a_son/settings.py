@@ -13,6 +13,9 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 import os
 from pathlib import Path
 
+from la_boite_a_son.cache import build_caches_setting
+from la_boite_a_son.sqlite import build_conn_max_age, build_sqlite_options
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -92,9 +95,15 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": build_sqlite_options(),
+        "CONN_MAX_AGE": build_conn_max_age(),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Cache partagé entre workers : CACHE_BACKEND=locmem (défaut, par processus), file ou db.
+CACHES = build_caches_setting(os.environ)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -133,6 +142,12 @@ STATIC_ROOT = Path("/var/www/boite-a-groove/static")
 MEDIA_URL = "/media/"
 MEDIA_ROOT = Path("/var/www/boite-a-groove/media")
 STICKER_GENERIC_CMYK_ICC_PROFILE_PATH = os.environ.get("STICKER_GENERIC_CMYK_ICC_PROFILE_PATH", "")
+STICKER_EXPORT_MAX_WORKERS = int(os.environ.get("STICKER_EXPORT_MAX_WORKERS", "0") or 0)
+STICKER_PDF_ENGINE = os.environ.get("STICKER_PDF_ENGINE", "inkscape")
+STICKER_EXPORT_RETENTION_HOURS = int(os.environ.get("STICKER_EXPORT_RETENTION_HOURS", "72") or 72)
+WRITE_BUFFER_ENABLED = os.environ.get("WRITE_BUFFER_ENABLED", "False") == "True"
+WRITE_BUFFER_FLUSH_INTERVAL_MS = int(os.environ.get("WRITE_BUFFER_FLUSH_INTERVAL_MS", "1000") or 1000)
+WRITE_BUFFER_MAX_SIZE = int(os.environ.get("WRITE_BUFFER_MAX_SIZE", "500") or 500)
 FILE_UPLOAD_PERMISSIONS = 0o664
 FILE_UPLOAD_DIRECTORY_PERMISSIONS = 0o2775
 
@@ -0,0 +1,60 @@
+"""
+Réglages de connexion SQLite pour la production (plusieurs workers gunicorn, un seul fichier).
+
+Les PRAGMA passent par l'option `init_command` de Django : ils sont rejoués à chaque nouvelle
+connexion, avant toute requête applicative. Tout est surchargeable par variable d'environnement.
+"""
+
+import os
+
+SQLITE_JOURNAL_MODES = {"WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"}
+SQLITE_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+SQLITE_TRANSACTION_MODES = {"DEFERRED", "IMMEDIATE", "EXCLUSIVE"}
+
+
+def _env_int(environ, name, default):
+    try:
+        return int(environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_choice(environ, name, default, choices):
+    value = (environ.get(name) or default).strip().upper()
+    return value if value in choices else default
+
+
+def build_sqlite_pragmas(environ=None):
+    environ = os.environ if environ is None else environ
+    return [
+        ("journal_mode", _env_choice(environ, "SQLITE_JOURNAL_MODE", "WAL", SQLITE_JOURNAL_MODES)),
+        # En WAL, NORMAL ne perd au pire que les dernières transactions en cas de coupure machine.
+        ("synchronous", _env_choice(environ, "SQLITE_SYNCHRONOUS", "NORMAL", SQLITE_SYNCHRONOUS_MODES)),
+        ("busy_timeout", max(0, _env_int(environ, "SQLITE_BUSY_TIMEOUT_MS", 5000))),
+        ("mmap_size", max(0, _env_int(environ, "SQLITE_MMAP_SIZE", 128 * 1024 * 1024))),
+        # Valeur négative = taille en KiB plutôt qu'en pages.
+        ("cache_size", -max(0, _env_int(environ, "SQLITE_CACHE_SIZE_KB", 20000))),
+        ("temp_store", "MEMORY"),
+    ]
+
+
+def build_sqlite_options(environ=None):
+    environ = os.environ if environ is None else environ
+    pragmas = build_sqlite_pragmas(environ)
+    busy_timeout_ms = dict(pragmas)["busy_timeout"]
+    return {
+        "init_command": ";".join(f"PRAGMA {name}={value}" for name, value in pragmas),
+        # Délai d'attente du verrou côté module sqlite3, aligné sur busy_timeout.
+        "timeout": busy_timeout_ms / 1000,
+        # BEGIN IMMEDIATE : le verrou d'écriture est pris dès l'ouverture de la transaction, donc
+        # attendu via busy_timeout au lieu d'échouer en « database is locked » lors de l'upgrade.
+        "transaction_mode": _env_choice(environ, "SQLITE_TRANSACTION_MODE", "IMMEDIATE", SQLITE_TRANSACTION_MODES),
+    }
+
+
+def build_conn_max_age(environ=None):
+    environ = os.environ if environ is None else environ
+    raw = (environ.get("DB_CONN_MAX_AGE") or "").strip().lower()
+    if raw in {"none", "persistent"}:
+        return None
+    return max(0, _env_int(environ, "DB_CONN_MAX_AGE", 60))
@@ -0,0 +1,217 @@
+"""
+File d'écritures différées, par processus, pour les écritures fréquentes et non critiques
+(last_seen_at, compteurs de vues, journaux de tentatives).
+
+Sous SQLite, chaque petite transaction prend le verrou d'écriture unique : regrouper ces
+écritures en une transaction périodique libère le verrou pour les écritures visibles
+(points, dépôts), qui restent sur le chemin direct. Désactivée par défaut (WRITE_BUFFER_ENABLED),
+auquel cas chaque appel écrit immédiatement, comme avant.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBuffer:
+    def __init__(self, *, flush_interval=1.0, max_size=500, auto_start=True):
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.auto_start = auto_start
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._reset_pending()
+        self.metrics = {
+            "flushes": 0,
+            "flushed_ops": 0,
+            "errors": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+            "max_depth": 0,
+        }
+
+    def _reset_pending(self):
+        # Incréments cumulés, dernières valeurs (last-write-wins) et insertions, par modèle.
+        self._increments = defaultdict(int)
+        self._values = {}
+        self._creates = defaultdict(list)
+        self._depth = 0
+
+    def get_metrics(self):
+        with self._lock:
+            metrics = dict(self.metrics)
+            metrics["depth"] = self._depth
+        flushes = metrics["flushes"]
+        metrics["avg_flush_ms"] = round(metrics["total_flush_ms"] / flushes, 2) if flushes else 0.0
+        return metrics
+
+    def increment(self, model, pk, field, amount=1):
+        with self._lock:
+            self._increments[(model, pk, field)] += amount
+            full = self._count_locked()
+        self._after_enqueue(full)
+
+    def set_value(self, model, pk, field, value):
+        with self._lock:
+            self._values[(model, pk, field)] = value
+            full = self._count_locked()
+        self._after_enqueue(full)
+
+    def create(self, instance):
+        with self._lock:
+            self._creates[type(instance)].append(instance)
+            full = self._count_locked()
+        self._after_enqueue(full)
+
+    def _count_locked(self):
+        self._depth += 1
+        self.metrics["max_depth"] = max(self.metrics["max_depth"], self._depth)
+        return self._depth >= self.max_size
+
+    def _after_enqueue(self, full):
+        if not self.auto_start:
+            if full:
+                self.flush()
+            return
+        self._ensure_worker()
+        if full:
+            self._wake.set()
+
+    def _ensure_worker(self):
+        # Après un fork (workers gunicorn), le thread du parent n'existe pas dans l'enfant.
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="write-buffer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Write buffer flush failed")
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                increments, values, creates, depth = self._increments, self._values, self._creates, self._depth
+                self._reset_pending()
+            if not depth:
+                return 0
+
+            started = time.perf_counter()
+            errors = 0
+            try:
+                with transaction.atomic():
+                    self._write(increments, values, creates)
+            except Exception:
+                # Un lot invalide (ex. FK supprimée entre-temps) ne doit pas faire perdre les autres écritures.
+                logger.exception("Write buffer batch failed, retrying row by row")
+                errors = self._write_one_by_one(increments, values, creates)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            with self._lock:
+                self.metrics["flushes"] += 1
+                self.metrics["flushed_ops"] += depth
+                self.metrics["errors"] += errors
+                self.metrics["last_flush_ms"] = round(elapsed_ms, 2)
+                self.metrics["max_flush_ms"] = round(max(self.metrics["max_flush_ms"], elapsed_ms), 2)
+                self.metrics["total_flush_ms"] += elapsed_ms
+            logger.debug("Write buffer flushed %s ops in %.1f ms", depth, elapsed_ms)
+            return depth
+
+    def _write(self, increments, values, creates):
+        grouped = defaultdict(list)
+        for (model, pk, field), amount in increments.items():
+            grouped[(model, field, amount)].append(pk)
+        for (model, field, amount), pks in grouped.items():
+            model.objects.filter(pk__in=pks).update(**{field: F(field) + amount})
+
+        by_value = defaultdict(list)
+        for (model, pk, field), value in values.items():
+            by_value[(model, field, value)].append(pk)
+        for (model, field, value), pks in by_value.items():
+            model.objects.filter(pk__in=pks).update(**{field: value})
+
+        for model, instances in creates.items():
+            model.objects.bulk_create(instances, batch_size=self.max_size)
+
+    def _write_one_by_one(self, increments, values, creates):
+        operations = [({key: amount}, {}, {}) for key, amount in increments.items()]
+        operations += [({}, {key: value}, {}) for key, value in values.items()]
+        operations += [({}, {}, {model: [instance]}) for model, instances in creates.items() for instance in instances]
+        errors = 0
+        for operation in operations:
+            try:
+                with transaction.atomic():
+                    self._write(*operation)
+            except Exception:
+                errors += 1
+        return errors
+
+
+_write_buffer = None
+_write_buffer_lock = threading.Lock()
+
+
+def is_write_buffer_enabled():
+    return bool(getattr(settings, "WRITE_BUFFER_ENABLED", False))
+
+
+def get_write_buffer():
+    global _write_buffer
+    if _write_buffer is None:
+        with _write_buffer_lock:
+            if _write_buffer is None:
+                _write_buffer = WriteBuffer(
+                    flush_interval=max(0.05, int(getattr(settings, "WRITE_BUFFER_FLUSH_INTERVAL_MS", 1000)) / 1000),
+                    max_size=max(1, int(getattr(settings, "WRITE_BUFFER_MAX_SIZE", 500))),
+                )
+                atexit.register(_write_buffer.flush)
+    return _write_buffer
+
+
+def get_write_buffer_metrics():
+    """Profondeur de file et latences de flush du processus courant."""
+    return get_write_buffer().get_metrics()
+
+
+def buffered_increment(model, pk, field, amount=1):
+    if not is_write_buffer_enabled():
+        return model.objects.filter(pk=pk).update(**{field: F(field) + amount})
+    get_write_buffer().increment(model, pk, field, amount)
+
+
+def buffered_set(model, pk, field, value):
+    if not is_write_buffer_enabled():
+        return model.objects.filter(pk=pk).update(**{field: value})
+    get_write_buffer().set_value(model, pk, field, value)
+
+
+def buffered_create(instance):
+    if not is_write_buffer_enabled():
+        instance.save()
+        return instance
+    get_write_buffer().create(instance)
+    return instance
@@ -106,9 +106,9 @@ class MessageThreadByUsernameDetailView(APIView):
         if error:
             return error
 
-        from users.models import CustomUser
+        from users.models import get_user_by_username
 
-        target = CustomUser.objects.filter(username__iexact=username, is_guest=False).first()
+        target = get_user_by_username(username)
         if not target:
             return api_error(status.HTTP_404_NOT_FOUND, "USER_NOT_FOUND", "Utilisateur introuvable.")
 
@@ -365,9 +365,9 @@ class MessageThreadStatusView(APIView):
         if error:
             return error
 
-        from users.models import CustomUser
+        from users.models import get_user_by_username
 
-        target = CustomUser.objects.filter(username__iexact=username, is_guest=False).first()
+        target = get_user_by_username(username)
         if not target:
             return api_error(status.HTTP_404_NOT_FOUND, "TARGET_USER_NOT_FOUND", "Utilisateur introuvable.")
 
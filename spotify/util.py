@@ -8,7 +8,7 @@ from django.core.files.base import ContentFile
 from django.utils import timezone
 from requests import post
 
-from users.models import CustomUser
+from users.models import CustomUser, username_ci_match
 from users.provider_connections import (
     disconnect_provider_connection,
     get_provider_connection,
@@ -121,18 +121,18 @@ def generate_unique_username(*preferred_values: str) -> str:
         if not base:
             continue
         candidate = base
-        if not CustomUser.objects.filter(username__iexact=candidate).exists():
+        if not CustomUser.objects.filter(username_ci_match(candidate)).exists():
             return candidate
         for index in range(1, 1000):
             candidate = f"{base}_{index}"
-            if not CustomUser.objects.filter(username__iexact=candidate).exists():
+            if not CustomUser.objects.filter(username_ci_match(candidate)).exists():
                 return candidate
 
     fallback = f"spotify_{timezone.now().strftime('%Y%m%d%H%M%S')}"
-    if not CustomUser.objects.filter(username__iexact=fallback).exists():
+    if not CustomUser.objects.filter(username_ci_match(fallback)).exists():
         return fallback
     suffix = 1
-    while CustomUser.objects.filter(username__iexact=f"{fallback}_{suffix}").exists():
+    while CustomUser.objects.filter(username_ci_match(f"{fallback}_{suffix}")).exists():
         suffix += 1
     return f"{fallback}_{suffix}"
 
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "users"
+
+    def ready(self):
+        from users.utils import USER_STATUSES_CONFIG
+
+        USER_STATUSES_CONFIG.validate()
@@ -2,7 +2,7 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.validators import UnicodeUsernameValidator
 
-from .models import CustomUser
+from .models import CustomUser, username_ci_match
 
 
 class RegisterUserForm(UserCreationForm):
@@ -36,7 +36,7 @@ class RegisterUserForm(UserCreationForm):
                 "Le nom d’utilisateur ne peut contenir que des lettres, des chiffres et certains caractères simples."
             )
 
-        duplicate = CustomUser.objects.filter(username__iexact=username)
+        duplicate = CustomUser.objects.filter(username_ci_match(username))
         if self.instance and self.instance.pk:
             duplicate = duplicate.exclude(pk=self.instance.pk)
         if duplicate.exists():
@@ -1,5 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
 from django.dispatch import receiver
 
 from utils import generate_unique_filename
@@ -86,6 +89,9 @@ class CustomUser(AbstractUser):
             models.Index(fields=["portal_status"]),
             models.Index(fields=["client", "client_role"]),
         ]
+        constraints = [
+            models.UniqueConstraint(Lower("username"), name="users_customuser_username_ci_unique"),
+        ]
 
     @property
     def is_client_user(self):
@@ -104,6 +110,22 @@ class CustomUser(AbstractUser):
         return self.client_role in {"client_owner", "client_editor"} and self.can_access_client_portal
 
 
+def username_ci_match(username):
+    """
+    Condition « même nom d'utilisateur, casse ignorée » servie par l'index unique sur Lower("username").
+    username__iexact compile en UPPER()/LIKE, que cet index ne peut pas servir.
+    """
+    return Exact(Lower("username"), Lower(Value(username or "")))
+
+
+def get_user_by_username(username, *, include_guests=False):
+    queryset = CustomUser.objects.filter(username_ci_match(username))
+    if not include_guests:
+        queryset = queryset.filter(is_guest=False)
+    # Pas de .first() : son ORDER BY id pourrait faire préférer un parcours de la clé primaire.
+    return next(iter(queryset[:1]), None)
+
+
 @receiver(models.signals.pre_delete, sender=CustomUser)
 # When a user is deleted, his profile picture is deleted from the database
 def delete_profile_picture(sender, instance, **kwargs):
@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from box_management.models import Comment, CommentReport, Deposit, DiscoveredSong, EmojiRight, Reaction, UserBoxStats
+from box_management.services.comments.anti_abuse import get_daily_target_comment_count, is_comment_cooldown_active
+from box_management.tests.base import FlowboxAPITestCase
+from users.models import CustomUser
+from users.utils import merge_guest_into_user
+
+
+class GuestMergeTests(FlowboxAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.guest = self.make_user(username="guest_merge", is_guest=True)
+        self.account = self.make_user(username="merge-account")
+        self.owner = self.make_user(username="merge-owner")
+        self.box = self.make_box(url="merge-box")
+
+    def _deposits(self, count, user=None):
+        existing = Deposit.objects.count()
+        return [
+            self.make_deposit(
+                user=user or self.owner, song=self.make_song(public_key=f"merge-{existing + i}"), box=self.box
+            )
+            for i in range(count)
+        ]
+
+    def test_merge_resolves_conflicts_like_the_row_by_row_rules(self):
+        shared, guest_only, other = self._deposits(3)
+        fire, headphones = self.make_emoji(char="🔥"), self.make_emoji(char="🎧")
+        EmojiRight.objects.create(user=self.guest, emoji=fire)
+        EmojiRight.objects.create(user=self.guest, emoji=headphones)
+        EmojiRight.objects.create(user=self.account, emoji=fire)
+
+        earlier = timezone.now() - timedelta(days=2)
+        guest_shared = DiscoveredSong.objects.create(user=self.guest, deposit=shared, discovered_type="main")
+        DiscoveredSong.objects.filter(pk=guest_shared.pk).update(discovered_at=earlier)
+        account_shared = DiscoveredSong.objects.create(user=self.account, deposit=shared)
+        DiscoveredSong.objects.create(user=self.guest, deposit=guest_only)
+
+        Reaction.objects.create(user=self.account, deposit=shared, emoji=fire)
+        Reaction.objects.create(user=self.guest, deposit=shared, emoji=headphones)
+        Reaction.objects.create(user=self.guest, deposit=other, emoji=fire)
+
+        account_comment = Comment.objects.create(user=self.account, deposit=shared, text="Déjà là")
+        clashing = Comment.objects.create(user=self.guest, deposit=shared, text="Doublon")
+        first = Comment.objects.create(user=self.guest, deposit=other, text="Premier")
+        second = Comment.objects.create(user=self.guest, deposit=other, text="Second")
+        CommentReport.objects.create(comment=account_comment, reporter=self.account, reason_code="spam")
+        clashing_report = CommentReport.objects.create(comment=account_comment, reporter=self.guest, reason_code="spam")
+        moved_report = CommentReport.objects.create(comment=first, reporter=self.guest, reason_code="spam")
+
+        result = merge_guest_into_user(self.guest, self.account)
+
+        self.assertTrue(result["merged"])
+        self.assertFalse(CustomUser.objects.filter(pk=self.guest.pk).exists())
+        self.assertEqual((result["emoji_rights_moved"], result["emoji_rights_deleted"]), (1, 1))
+        self.assertEqual(EmojiRight.objects.filter(user=self.account).count(), 2)
+
+        self.assertEqual((result["discoveries_moved"], result["discoveries_merged"]), (1, 1))
+        account_shared.refresh_from_db()
+        self.assertEqual(account_shared.discovered_type, "main")
+        self.assertEqual(account_shared.discovered_at, earlier)
+        self.assertEqual(DiscoveredSong.objects.filter(user=self.account).count(), 2)
+
+        self.assertEqual((result["reactions_moved"], result["reactions_updated"]), (1, 1))
+        self.assertEqual(Reaction.objects.get(user=self.account, deposit=shared).emoji, headphones)
+        self.assertEqual(Reaction.objects.filter(user=self.account).count(), 2)
+
+        self.assertEqual((result["comments_moved"], result["comments_detached"]), (1, 2))
+        clashing.refresh_from_db()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertIsNone(clashing.user_id)
+        self.assertEqual((first.user_id, first.author_username), (self.account.id, "merge-account"))
+        self.assertIsNone(second.user_id)
+
+        self.assertEqual((result["reports_moved"], result["reports_detached"]), (1, 1))
+        clashing_report.refresh_from_db()
+        moved_report.refresh_from_db()
+        self.assertIsNone(clashing_report.reporter_id)
+        self.assertEqual(moved_report.reporter_id, self.account.id)
+        account_comment.refresh_from_db()
+        self.assertEqual(account_comment.reports_count, 2)
+        self.assertIn("total", result["timings_ms"])
+
+    def test_merge_query_count_does_not_grow_with_guest_history(self):
+        def merged_queries(guest, count):
+            for deposit in self._deposits(count, user=self.owner):
+                DiscoveredSong.objects.create(user=guest, deposit=deposit)
+                Reaction.objects.create(user=guest, deposit=deposit, emoji=emoji)
+            with CaptureQueriesContext(connection) as ctx:
+                merge_guest_into_user(guest, self.account)
+            return len(ctx.captured_queries)
+
+        emoji = self.make_emoji(char="💃")
+        small = merged_queries(self.guest, 2)
+        self.box = self.make_box(url="merge-box-2", name="Merge box 2")
+        large = merged_queries(self.make_user(username="guest_merge_2", is_guest=True), 20)
+
+        self.assertEqual(small, large)
+        self.assertEqual(DiscoveredSong.objects.filter(user=self.account).count(), 22)
+
+    def test_merge_rebuilds_user_box_stats_for_moved_deposits(self):
+        self._deposits(2, user=self.guest)
+
+        result = merge_guest_into_user(self.guest, self.account)
+
+        self.assertEqual(result["box_stats_rebuilt"], 1)
+        stats = UserBoxStats.objects.get(user=self.account, box=self.box)
+        self.assertEqual(stats.deposit_count, 2)
+
+    def test_merge_invalidates_comment_anti_abuse_counters_of_the_target(self):
+        client = self.make_client(name="Client merge", slug="client-merge")
+        deposit = self.make_deposit(user=self.owner, song=self.make_song(public_key="merge-anti-abus"), box=self.box)
+
+        def daily_count():
+            return get_daily_target_comment_count(
+                user_id=self.account.id, client_id=client.id, target_user_id=self.owner.id
+            )
+
+        self.assertEqual(daily_count(), 0)
+        self.assertFalse(is_comment_cooldown_active(self.account.id))
+        Comment.objects.create(
+            client=client, deposit=deposit, user=self.guest, text="Invité", deposit_owner_user_id=self.owner.id
+        )
+
+        merge_guest_into_user(self.guest, self.account)
+
+        self.assertEqual(daily_count(), 1)
+        self.assertTrue(is_comment_cooldown_active(self.account.id))
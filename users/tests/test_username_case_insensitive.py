@@ -1,6 +1,8 @@
+from django.db import connection
 from django.urls import reverse
 
 from box_management.tests.base import FlowboxAPITestCase
+from users.models import CustomUser, get_user_by_username, username_ci_match
 
 
 class UsernameCaseInsensitiveTests(FlowboxAPITestCase):
@@ -36,3 +38,15 @@ class UsernameCaseInsensitiveTests(FlowboxAPITestCase):
 
         response = self.client.post(reverse("change-username"), {"username": "sio"}, format="json")
         self.assert_api_error(response, 409, "USERNAME_ALREADY_TAKEN")
+
+    def test_lookup_helper_skips_guests_and_is_served_by_the_lower_index(self):
+        user = self.make_user(username="Sio")
+        self.make_user(username="guest_ABC", is_guest=True)
+
+        self.assertEqual(get_user_by_username("sIO"), user)
+        self.assertIsNone(get_user_by_username("GUEST_abc"))
+        self.assertIsNotNone(get_user_by_username("GUEST_abc", include_guests=True))
+
+        queryset = CustomUser.objects.filter(username_ci_match("SIO"))
+        if connection.vendor == "sqlite":
+            self.assertIn("users_customuser_username_ci_unique", queryset.explain())
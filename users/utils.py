@@ -1,21 +1,32 @@
-import json
+import logging
 import secrets
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 from django.conf import settings
-from django.db import IntegrityError, transaction
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Least
 from django.utils import timezone
 
 from la_boite_a_son.api_errors import api_error_payload
+from la_boite_a_son.cache import bump_namespace_version, delete_cached
+from la_boite_a_son.json_config import JsonConfigFile, require_int, require_list, thaw
+from la_boite_a_son.write_buffer import buffered_set
 from users.provider_connections import merge_provider_connections, serialize_provider_connections_for_user
 
-from .models import CustomUser, UserFollow
+from .models import CustomUser, UserFollow, username_ci_match
 
 GUEST_COOKIE_NAME = "mm_guest"
 GUEST_COOKIE_MAX_AGE = 60 * 60 * 24 * 365 * 5
 GUEST_USERNAME_PREFIX = "guest_"
 
+# Taille des lots pour les UPDATE/DELETE par ids lors des fusions (sous la limite de variables SQLite).
+MERGE_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
 
 USER_STATUSES_PATH = Path(__file__).resolve().parent / "data" / "user_statuses.json"
 
@@ -29,35 +40,22 @@ def _get_user_total_deposits(user: CustomUser | None) -> int:
     return Deposit.objects.filter(user=user).exclude(deposit_type="favorite").count()
 
 
-def _load_user_statuses() -> list[dict]:
-    try:
-        raw_statuses = json.loads(USER_STATUSES_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        return []
+def parse_user_statuses(raw) -> list[dict]:
+    statuses = []
+    for item in require_list(raw):
+        name = str(item.get("name") or "").strip() if isinstance(item, dict) else ""
+        if not name:
+            raise ValueError(f"statut sans nom : {item!r}")
+        statuses.append({"name": name, "min_deposits": require_int(item, "min_deposits", minimum=0)})
+    statuses.sort(key=lambda status: status["min_deposits"])
+    return statuses
 
-    valid_statuses = []
-    for item in raw_statuses if isinstance(raw_statuses, list) else []:
-        if not isinstance(item, dict):
-            continue
 
-        name = str(item.get("name") or "").strip()
-        try:
-            min_deposits = int(item.get("min_deposits"))
-        except (TypeError, ValueError):
-            continue
+USER_STATUSES_CONFIG = JsonConfigFile(USER_STATUSES_PATH, parse_user_statuses)
 
-        if not name or min_deposits < 0:
-            continue
-
-        valid_statuses.append(
-            {
-                "name": name,
-                "min_deposits": min_deposits,
-            }
-        )
 
-    valid_statuses.sort(key=lambda status: status["min_deposits"])
-    return valid_statuses
+def _load_user_statuses():
+    return USER_STATUSES_CONFIG.get()
 
 
 def get_user_status(user: CustomUser | None) -> dict | None:
@@ -70,7 +68,7 @@ def get_user_status(user: CustomUser | None) -> dict | None:
         else:
             break
 
-    return current_status
+    return thaw(current_status)
 
 
 def build_favorite_deposit_payload(profile_user: CustomUser | None, viewer: CustomUser | None = None):
@@ -108,7 +106,7 @@ def generate_guest_device_token() -> str:
 def generate_guest_username() -> str:
     while True:
         candidate = f"{GUEST_USERNAME_PREFIX}{secrets.token_hex(4)}"
-        if not CustomUser.objects.filter(username__iexact=candidate).exists():
+        if not CustomUser.objects.filter(username_ci_match(candidate)).exists():
             return candidate
 
 
@@ -137,10 +135,11 @@ def touch_last_seen(user: CustomUser | None) -> CustomUser | None:
 
     now = _now()
     user.last_seen_at = now
-    try:
-        user.save(update_fields=["last_seen_at"])
-    except Exception:
-        user.save()
+    if user.pk:
+        # Écriture non critique : passe par la file différée quand elle est activée.
+        buffered_set(CustomUser, user.pk, "last_seen_at", now)
+        return user
+    user.save()
     return user
 
 
@@ -290,6 +289,22 @@ def apply_points_delta(user: CustomUser, delta: int, *, lock_user: bool = True):
         return True, {"points_balance": working_user.points}, 200
 
 
+def _update_in_chunks(model, ids, **values):
+    updated = 0
+    for start in range(0, len(ids), MERGE_BATCH_SIZE):
+        updated += model.objects.filter(pk__in=ids[start : start + MERGE_BATCH_SIZE]).update(**values)
+    return updated
+
+
+@contextmanager
+def _merge_step_timer(timings, name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
 def _merge_user_into_user(source_user: CustomUser, target_user: CustomUser, *, require_source_guest: bool = False):
     if not source_user or not target_user:
         return {"merged": False, "reason": "missing_user"}
@@ -298,6 +313,11 @@ def _merge_user_into_user(source_user: CustomUser, target_user: CustomUser, *, r
     if require_source_guest and not getattr(source_user, "is_guest", False):
         return {"merged": False, "reason": "source_not_guest"}
 
+    from box_management.domain.constants import (
+        COMMENT_DAILY_TARGET_CACHE_NAMESPACE,
+        COMMENT_LAST_AT_CACHE_NAMESPACE,
+        COMMENT_RESTRICTION_CACHE_NAMESPACE,
+    )
     from box_management.models import (
         Article,
         Comment,
@@ -309,8 +329,15 @@ def _merge_user_into_user(source_user: CustomUser, target_user: CustomUser, *, r
         DiscoveredSong,
         EmojiRight,
         Reaction,
+        UserBoxStats,
     )
 
+    timings = {}
+
+    def timer(name):
+        return _merge_step_timer(timings, name)
+
+    merge_started = time.perf_counter()
     with transaction.atomic():
         source = CustomUser.objects.select_for_update().get(pk=source_user.pk)
         target = CustomUser.objects.select_for_update().get(pk=target_user.pk)
@@ -369,8 +396,17 @@ def _merge_user_into_user(source_user: CustomUser, target_user: CustomUser, *, r
         # -----------------------------
         # 2) Dépôts
         # -----------------------------
-        source_deposit_ids = list(Deposit.objects.filter(user=source).values_list("id", flat=True))
-        moved_deposits = Deposit.objects.filter(user=source).update(user=target)
+        with timer("deposits"):
+            source_deposits = list(Deposit.objects.filter(user=source).values_list("id", "box_id"))
+            source_deposit_ids = [deposit_id for deposit_id, _ in source_deposits]
+            moved_deposits = Deposit.objects.filter(user=source).update(user=target)
+
+            # Les stats user×boîte (séries, premier dépôt) du target sont recalculées sur les boîtes touchées ;
+            # celles du guest partent avec lui.
+            box_stats_rebuilt = 0
+            for box_id in sorted({box_id for _, box_id in source_deposits if box_id}):
+                UserBoxStats.rebuild(user_id=target.id, box_id=box_id)
+                box_stats_rebuilt += 1
 
         if not target.favorite_deposit_id and source.favorite_deposit_id:
             target.favorite_deposit_id = source.favorite_deposit_id
@@ -379,107 +415,71 @@ def _merge_user_into_user(source_user: CustomUser, target_user: CustomUser, *, r
         # -----------------------------
         # 3) Emoji rights
         # -----------------------------
-        emoji_rights_moved = 0
-        emoji_rights_deleted = 0
-
-        for right in list(EmojiRight.objects.filter(user=source).select_related("emoji")):
-            exists = EmojiRight.objects.filter(user=target, emoji_id=right.emoji_id).exists()
-            if exists:
-                right.delete()
-                emoji_rights_deleted += 1
-            else:
-                right.user = target
-                right.save(update_fields=["user"])
-                emoji_rights_moved += 1
+        with timer("emoji_rights"):
+            target_emoji_ids = set(EmojiRight.objects.filter(user=target).values_list("emoji_id", flat=True))
+            emoji_rights_deleted, _ = EmojiRight.objects.filter(user=source, emoji_id__in=target_emoji_ids).delete()
+            emoji_rights_moved = EmojiRight.objects.filter(user=source).update(user=target)
 
         # -----------------------------
         # 4) Discoveries
         # -----------------------------
-        discoveries_moved = 0
-        discoveries_merged = 0
-
-        source_discoveries = list(
-            DiscoveredSong.objects.filter(user=source).select_related("deposit").order_by("discovered_at", "id")
-        )
-        for discovery in source_discoveries:
-            existing = (
-                DiscoveredSong.objects.filter(user=target, deposit_id=discovery.deposit_id)
-                .order_by("discovered_at", "id")
-                .first()
+        # Une découverte par (user, dépôt) : en cas de collision, celle du target est gardée
+        # avec le type "main" prioritaire et la date la plus ancienne, celle du guest est supprimée.
+        with timer("discoveries"):
+            source_discovery = DiscoveredSong.objects.filter(user=source, deposit_id=OuterRef("deposit_id"))
+            # Les éventuels doublons du guest sont d'abord repliés sur sa découverte la plus ancienne
+            # (type "main" conservé) : déplacés tels quels, ils buteraient sur la contrainte d'unicité.
+            earlier_source_discovery = source_discovery.filter(
+                Q(discovered_at__lt=OuterRef("discovered_at"))
+                | Q(discovered_at=OuterRef("discovered_at"), id__lt=OuterRef("id"))
             )
-            if not existing:
-                discovery.user = target
-                discovery.save(update_fields=["user"])
-                discoveries_moved += 1
-                continue
-
-            update_fields = []
-            if discovery.discovered_type == "main" and existing.discovered_type != "main":
-                existing.discovered_type = "main"
-                update_fields.append("discovered_type")
-            if discovery.discovered_at and existing.discovered_at and discovery.discovered_at < existing.discovered_at:
-                existing.discovered_at = discovery.discovered_at
-                update_fields.append("discovered_at")
-            if update_fields:
-                existing.save(update_fields=update_fields)
-            discovery.delete()
-            discoveries_merged += 1
+            DiscoveredSong.objects.filter(
+                ~Exists(earlier_source_discovery),
+                Exists(source_discovery.filter(discovered_type="main")),
+                user=source,
+            ).exclude(discovered_type="main").update(discovered_type="main")
+            source_duplicates_deleted, _ = DiscoveredSong.objects.filter(
+                Exists(earlier_source_discovery), user=source
+            ).delete()
+
+            DiscoveredSong.objects.filter(
+                user=target,
+                deposit_id__in=DiscoveredSong.objects.filter(user=source).values("deposit_id"),
+            ).update(
+                discovered_at=Least(
+                    F("discovered_at"),
+                    Subquery(source_discovery.order_by("discovered_at").values("discovered_at")[:1]),
+                ),
+                discovered_type=Case(
+                    When(Exists(source_discovery.filter(discovered_type="main")), then=Value("main")),
+                    default=F("discovered_type"),
+                ),
+            )
+            discoveries_merged, _ = DiscoveredSong.objects.filter(
+                user=source,
+                deposit_id__in=DiscoveredSong.objects.filter(user=target).values("deposit_id"),
+            ).delete()
+            discoveries_merged += source_duplicates_deleted
+            discoveries_moved = DiscoveredSong.objects.filter(user=source).update(user=target)
 
         # -----------------------------
         # 5) Reactions
         # -----------------------------
-        reactions_moved = 0
-        reactions_deleted = 0
-        reactions_updated = 0
-
-        latest_source_reaction_by_deposit = {}
-        source_reactions = list(
-            Reaction.objects.filter(user=source)
-            .select_related("emoji", "deposit")
-            .order_by("-updated_at", "-created_at", "-id")
-        )
-        for reaction in source_reactions:
-            if reaction.deposit_id not in latest_source_reaction_by_deposit:
-                latest_source_reaction_by_deposit[reaction.deposit_id] = reaction
-            else:
-                reaction.delete()
-                reactions_deleted += 1
-
-        for deposit_id, source_reaction in latest_source_reaction_by_deposit.items():
-            target_reactions = list(
-                Reaction.objects.filter(user=target, deposit_id=deposit_id).order_by(
-                    "-updated_at", "-created_at", "-id"
-                )
-            )
-            target_reaction = target_reactions[0] if target_reactions else None
-
-            for duplicate in target_reactions[1:]:
-                duplicate.delete()
-                reactions_deleted += 1
-
-            if not target_reaction:
-                try:
-                    source_reaction.user = target
-                    source_reaction.save(update_fields=["user"])
-                    reactions_moved += 1
-                except IntegrityError:
-                    Reaction.objects.filter(pk=source_reaction.pk).delete()
-                    reactions_deleted += 1
-                continue
-
-            source_stamp = source_reaction.updated_at or source_reaction.created_at
-            target_stamp = target_reaction.updated_at or target_reaction.created_at
-
-            if source_stamp and target_stamp and source_stamp > target_stamp:
-                if target_reaction.emoji_id != source_reaction.emoji_id:
-                    target_reaction.emoji_id = source_reaction.emoji_id
-                    target_reaction.save(update_fields=["emoji", "updated_at"])
-                else:
-                    target_reaction.save(update_fields=["updated_at"])
-                reactions_updated += 1
-
-            source_reaction.delete()
-            reactions_deleted += 1
+        # Une réaction par (user, dépôt) : en cas de collision, la plus récente l'emporte
+        # (emoji recopié sur celle du target), celle du guest est supprimée.
+        with timer("reactions"):
+            # update() ne déclenche pas les signaux : la version des réactions des dépôts touchés est changée ici.
+            Deposit.objects.filter(reactions__user=source).mark_reactions_changed()
+            source_reaction = Reaction.objects.filter(user=source, deposit_id=OuterRef("deposit_id"))
+            reactions_updated = Reaction.objects.filter(
+                Exists(source_reaction.filter(updated_at__gt=OuterRef("updated_at"))),
+                user=target,
+            ).update(emoji_id=Subquery(source_reaction.values("emoji_id")[:1]), updated_at=_now())
+            reactions_deleted, _ = Reaction.objects.filter(
+                user=source,
+                deposit_id__in=Reaction.objects.filter(user=target).values("deposit_id"),
+            ).delete()
+            reactions_moved = Reaction.objects.filter(user=source).update(user=target)
 
         # -----------------------------
         # 6) Comments
@@ -488,63 +488,40 @@ def _merge_user_into_user(source_user: CustomUser, target_user: CustomUser, *, r
         # si le target a déjà un commentaire sur le même dépôt,
         # on détache le commentaire guest (user=None) au lieu de le supprimer,
         # pour éviter de perdre le texte et l’historique de modération.
-        comments_moved = 0
-        comments_detached = 0
-
-        source_comments = list(
-            Comment.objects.filter(user=source).select_related("deposit").order_by("created_at", "id")
-        )
-
-        for source_comment in source_comments:
-            target_comment = None
-            if source_comment.deposit_id is not None:
-                target_comment = (
-                    Comment.objects.filter(
-                        user=target,
-                        deposit_id=source_comment.deposit_id,
-                    )
-                    .exclude(pk=source_comment.pk)
-                    .order_by("created_at", "id")
-                    .first()
-                )
-
-            if target_comment:
-                source_comment.user = None
-                source_comment.save(update_fields=["user"])
-                comments_detached += 1
-                continue
-
-            update_fields = ["user"]
-            source_comment.user = target
-
-            new_author_username = target.username or source_comment.author_username or ""
-            new_author_display_name = (
-                getattr(target, "display_name", None)
-                or target.username
-                or source_comment.author_display_name
-                or source_comment.author_username
-                or ""
+        # Sans collision, seul le premier commentaire guest d'un dépôt est rattaché.
+        with timer("comments"):
+            commented_deposit_ids = set(
+                Comment.objects.filter(
+                    user=target,
+                    deposit_id__in=Comment.objects.filter(user=source).values("deposit_id"),
+                ).values_list("deposit_id", flat=True)
             )
-            new_author_email = target.email or source_comment.author_email or ""
-
-            if source_comment.author_username != new_author_username:
-                source_comment.author_username = new_author_username
-                update_fields.append("author_username")
-
-            if source_comment.author_display_name != new_author_display_name:
-                source_comment.author_display_name = new_author_display_name
-                update_fields.append("author_display_name")
-
-            if source_comment.author_email != new_author_email:
-                source_comment.author_email = new_author_email
-                update_fields.append("author_email")
-
-            if target_avatar_url and source_comment.author_avatar_url != target_avatar_url:
-                source_comment.author_avatar_url = target_avatar_url
-                update_fields.append("author_avatar_url")
-
-            source_comment.save(update_fields=update_fields)
-            comments_moved += 1
+            moved_ids, detached_ids = [], []
+            for comment_id, deposit_id in (
+                Comment.objects.filter(user=source).order_by("created_at", "id").values_list("id", "deposit_id")
+            ):
+                if deposit_id is not None and deposit_id in commented_deposit_ids:
+                    detached_ids.append(comment_id)
+                    continue
+                if deposit_id is not None:
+                    commented_deposit_ids.add(deposit_id)
+                moved_ids.append(comment_id)
+
+            _update_in_chunks(Comment, detached_ids, user=None)
+
+            # Instantané auteur : valeurs du target quand elles existent, sinon on garde celles du commentaire.
+            display_name = getattr(target, "display_name", None) or target.username
+            author_snapshot = {
+                "author_username": target.username or F("author_username"),
+                "author_display_name": display_name
+                or Case(When(author_display_name="", then=F("author_username")), default=F("author_display_name")),
+                "author_email": target.email or F("author_email"),
+            }
+            if target_avatar_url:
+                author_snapshot["author_avatar_url"] = target_avatar_url
+            _update_in_chunks(Comment, moved_ids, user=target, **author_snapshot)
+            comments_moved = len(moved_ids)
+            comments_detached = len(detached_ids)
 
         # -----------------------------
         # 7) Comment reports
@@ -552,55 +529,37 @@ def _merge_user_into_user(source_user: CustomUser, target_user: CustomUser, *, r
         # Même logique :
         # si le target a déjà report le même commentaire,
         # on détache le report guest (reporter=None) au lieu de le supprimer.
-        reports_moved = 0
-        reports_detached = 0
-        touched_report_comment_ids = set()
-
-        source_reports = list(
-            CommentReport.objects.filter(reporter=source).select_related("comment").order_by("created_at", "id")
-        )
-
-        for report in source_reports:
-            if report.comment_id:
-                touched_report_comment_ids.add(report.comment_id)
-
-            existing = None
-            if report.comment_id is not None:
-                existing = (
-                    CommentReport.objects.filter(
-                        comment_id=report.comment_id,
-                        reporter=target,
-                    )
-                    .exclude(pk=report.pk)
-                    .first()
-                )
-
-            if existing:
-                report.reporter = None
-                report.save(update_fields=["reporter"])
-                reports_detached += 1
-                continue
-
-            update_fields = ["reporter"]
-            report.reporter = target
-
-            new_reporter_username = target.username or report.reporter_username or ""
-            new_reporter_email = target.email or report.reporter_email or ""
-
-            if report.reporter_username != new_reporter_username:
-                report.reporter_username = new_reporter_username
-                update_fields.append("reporter_username")
-
-            if report.reporter_email != new_reporter_email:
-                report.reporter_email = new_reporter_email
-                update_fields.append("reporter_email")
-
-            report.save(update_fields=update_fields)
-            reports_moved += 1
-
-        for comment_id in touched_report_comment_ids:
-            reports_count = CommentReport.objects.filter(comment_id=comment_id).count()
-            Comment.objects.filter(pk=comment_id).update(reports_count=reports_count)
+        with timer("reports"):
+            source_reports = list(CommentReport.objects.filter(reporter=source).values_list("id", "comment_id"))
+            target_reported_ids = set(
+                CommentReport.objects.filter(
+                    reporter=target,
+                    comment_id__in=CommentReport.objects.filter(reporter=source).values("comment_id"),
+                ).values_list("comment_id", flat=True)
+            )
+            detached_ids = [report_id for report_id, comment_id in source_reports if comment_id in target_reported_ids]
+            moved_ids = [report_id for report_id, comment_id in source_reports if comment_id not in target_reported_ids]
+
+            _update_in_chunks(CommentReport, detached_ids, reporter=None)
+            _update_in_chunks(
+                CommentReport,
+                moved_ids,
+                reporter=target,
+                reporter_username=target.username or F("reporter_username"),
+                reporter_email=target.email or F("reporter_email"),
+            )
+            reports_moved = len(moved_ids)
+            reports_detached = len(detached_ids)
+
+            touched_report_comment_ids = list({comment_id for _, comment_id in source_reports if comment_id})
+            reports_count = (
+                CommentReport.objects.filter(comment_id=OuterRef("pk"))
+                .order_by()
+                .values("comment_id")
+                .annotate(n=Count("id"))
+                .values("n")
+            )
+            _update_in_chunks(Comment, touched_report_comment_ids, reports_count=Coalesce(Subquery(reports_count), 0))
 
         # -----------------------------
         # 8) Comment moderation decisions
@@ -611,6 +570,9 @@ def _merge_user_into_user(source_user: CustomUser, target_user: CustomUser, *, r
         # 9) Comment restrictions
         # -----------------------------
         restrictions_moved = CommentUserRestriction.objects.filter(user=source).update(user=target)
+        if restrictions_moved:
+            # update() ne déclenche pas les signaux : le cache des restrictions du compte cible serait périmé.
+            bump_namespace_version(COMMENT_RESTRICTION_CACHE_NAMESPACE)
 
         restrictions_created_by_moved = CommentUserRestriction.objects.filter(created_by=source).update(
             created_by=target
@@ -634,24 +596,44 @@ def _merge_user_into_user(source_user: CustomUser, target_user: CustomUser, *, r
         # -----------------------------
         # 13) Réécriture des snapshots historiques
         # -----------------------------
-        comment_owner_snapshots_updated = Comment.objects.filter(
-            Q(deposit_id__in=source_deposit_ids) | Q(deposit_owner_user_id=source.id)
-        ).update(
-            deposit_owner_user_id=target.id,
-            deposit_owner_username=target.username or "",
-        )
+        with timer("snapshots"):
+            comment_owner_snapshots_updated = Comment.objects.filter(
+                Q(deposit_id__in=source_deposit_ids) | Q(deposit_owner_user_id=source.id)
+            ).update(
+                deposit_owner_user_id=target.id,
+                deposit_owner_username=target.username or "",
+            )
 
-        attempt_owner_snapshots_updated = CommentAttemptLog.objects.filter(
-            Q(deposit_id__in=source_deposit_ids) | Q(target_owner_user_id=source.id)
-        ).update(
-            target_owner_user_id=target.id,
-            target_owner_username=target.username or "",
-        )
+            attempt_owner_snapshots_updated = CommentAttemptLog.objects.filter(
+                Q(deposit_id__in=source_deposit_ids) | Q(target_owner_user_id=source.id)
+            ).update(
+                target_owner_user_id=target.id,
+                target_owner_username=target.username or "",
+            )
+
+        # Commentaires déplacés par update() : les compteurs anti-abus (dernier commentaire du compte cible,
+        # compteurs quotidiens par auteur et par cible) seraient périmés jusqu'à leur expiration.
+        if comments_moved:
+            delete_cached(COMMENT_LAST_AT_CACHE_NAMESPACE, target.id)
+        if comments_moved or comment_owner_snapshots_updated:
+            bump_namespace_version(COMMENT_DAILY_TARGET_CACHE_NAMESPACE)
 
         # -----------------------------
         # 14) Suppression du guest
         # -----------------------------
-        source.delete()
+        with timer("delete_source"):
+            source.delete()
+
+    total_ms = round((time.perf_counter() - merge_started) * 1000, 2)
+    logger.info(
+        "User merge %s -> %s in %.1f ms (%s deposits, %s discoveries, %s reactions)",
+        source_user.pk,
+        target.pk,
+        total_ms,
+        moved_deposits,
+        discoveries_moved + discoveries_merged,
+        reactions_moved + reactions_updated + reactions_deleted,
+    )
 
     return {
         "merged": True,
@@ -676,6 +658,8 @@ def _merge_user_into_user(source_user: CustomUser, target_user: CustomUser, *, r
         "provider_connections_merged": True,
         "comment_owner_snapshots_updated": comment_owner_snapshots_updated,
         "attempt_owner_snapshots_updated": attempt_owner_snapshots_updated,
+        "box_stats_rebuilt": box_stats_rebuilt,
+        "timings_ms": {**timings, "total": total_ms},
     }
 
 
@@ -24,7 +24,7 @@ from la_boite_a_son.api_errors import api_error
 from spotify.util import apply_pending_spotify_auth_to_user
 
 from .forms import RegisterUserForm
-from .models import CustomUser, UserFollow
+from .models import CustomUser, UserFollow, get_user_by_username, username_ci_match
 from .utils import (
     build_current_user_payload,
     build_favorite_deposit_payload,
@@ -393,7 +393,7 @@ class GetUserInfo(APIView):
                 )
             return api_error(status.HTTP_400_BAD_REQUEST, "USERNAME_REQUIRED", "username query param is required")
 
-        user = CustomUser.objects.filter(is_guest=False, username__iexact=username).first()
+        user = get_user_by_username(username)
         if not user:
             return api_error(status.HTTP_404_NOT_FOUND, "USER_NOT_FOUND", "Utilisateur introuvable.")
 
@@ -530,7 +530,7 @@ class ChangeUsername(APIView):
                 field_errors={"username": ["Le nom d’utilisateur doit contenir entre 3 et 30 caractères."]},
             )
 
-        if CustomUser.objects.filter(username__iexact=new_username).exclude(pk=request.user.pk).exists():
+        if CustomUser.objects.filter(username_ci_match(new_username)).exclude(pk=request.user.pk).exists():
             return api_error(
                 status.HTTP_409_CONFLICT,
                 "USERNAME_ALREADY_TAKEN",
@@ -564,7 +564,7 @@ class ChangeUsername(APIView):
 
 
 def _get_public_profile_by_username(username):
-    return CustomUser.objects.filter(is_guest=False, username__iexact=(username or "").strip()).first()
+    return get_user_by_username((username or "").strip())
 
 
 def _require_full_user(request):